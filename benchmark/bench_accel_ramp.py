@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: CPU usage of the accel ramp, legacy spinning thread vs AccelRamp
+'''
+
+import sys, os
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Param
+from ums_xbox.ramp import AccelRamp
+from ums_xbox.profile import DEFAULT_PROFILE
+from ums_xbox.xbox import Xbox
+
+class FakeXbox:
+    def __init__(self):
+        self.accel_data = 0
+        self.pre_accel_data = 0
+        self.current_accel_data = Param.APS_INIT_VAL
+        self.gear_data = 'GEAR_D'
+        self.brake_data = 0
+        self.pushed_estop = 'ESTOP_OFF'
+        self.is_thread = True
+        self.profile = DEFAULT_PROFILE
+        self._state_lock = threading.Lock()
+
+    def _publish(self):
+        pass
+
+class LegacyRamp(threading.Thread):
+    """Copy of the former Xbox._control_accel_thread, with a stop flag."""
+    def __init__(self, xbox):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.xbox = xbox
+        self.running = True
+
+    def notify(self):
+        pass
+
+    def stop(self):
+        self.running = False
+
+    def run(self):
+        x = self.xbox
+        while self.running:
+            if x.pre_accel_data < x.accel_data:
+                while self.running and x.current_accel_data <= x.accel_data:
+                    if x.current_accel_data <= Param.THRESH_ACCEL_VAL:
+                        x.current_accel_data += Param.INCREASE_VAL
+                    else:
+                        x.current_accel_data += int(Param.INCREASE_VAL / 4)
+                    if x.current_accel_data > Param.MAX_ACCEL_VAL:
+                        x.current_accel_data = Param.MAX_ACCEL_VAL
+                    time.sleep(0.02)
+            elif x.pre_accel_data > x.accel_data:
+                while self.running and x.current_accel_data >= x.accel_data:
+                    x.current_accel_data -= Param.DECREASE_VAL
+                    if x.current_accel_data < 0:
+                        x.current_accel_data = x.accel_data + Param.APS_INIT_VAL
+                    time.sleep(0.02)
+            else:
+                if x.accel_data > x.current_accel_data:
+                    x.accel_data += 1
+                else:
+                    x.accel_data -= 1
+
+def measure(ramp_cls, active: bool, duration: float) -> float:
+    xbox = FakeXbox()
+    ramp = ramp_cls(xbox)
+    ramp.start()
+
+    # Mimic the 50 Hz sender: it clamped the data and updated pre_accel_data.
+    targets = [0, 20000, 35000, 5000]
+    start_wall = time.monotonic()
+    start_cpu = time.process_time()
+    tick = 0
+    while time.monotonic() - start_wall < duration:
+        if active and tick % 25 == 0:
+            xbox.accel_data = targets[(tick // 25) % len(targets)]
+            ramp.notify()
+        if xbox.accel_data < 0: xbox.accel_data = 0
+        if xbox.current_accel_data < Param.APS_INIT_VAL:
+            xbox.current_accel_data = Param.APS_INIT_VAL
+        xbox.pre_accel_data = xbox.accel_data
+        tick += 1
+        time.sleep(0.02)
+    cpu = time.process_time() - start_cpu
+    wall = time.monotonic() - start_wall
+
+    ramp.stop()
+    ramp.join(1.0)
+    return 100.0 * cpu / wall
+
+def held_publishes(hold: str, seconds: float) -> tuple:
+    """States the ramp publishes while the trigger is pulled in D and the accel is held at 0."""
+    xbox = Xbox()
+    xbox._ramp.start()
+    with xbox._state_lock:
+        xbox.gear_data = 'GEAR_D'
+        xbox.accel_data = 30000
+        if hold == 'brake':
+            xbox.brake_data = 20000
+        else:
+            xbox.pushed_estop = 'ESTOP_ON'
+        xbox._publish()
+    xbox._ramp.notify()
+    time.sleep(0.1)
+    seq = xbox.state.seq
+    time.sleep(seconds)
+    publishes = xbox.state.seq - seq
+    idle = not xbox._ramp.stamp_ns
+    xbox._ramp.stop()
+    return publishes, idle
+
+def main():
+    parser = argparse.ArgumentParser(description="accel ramp CPU benchmark")
+    parser.add_argument('--duration', '-d', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'case':<10}{'legacy %CPU':>14}{'AccelRamp %CPU':>18}")
+    for name, active in (('idle', False), ('active', True)):
+        legacy = measure(LegacyRamp, active, args.duration)
+        engine = measure(AccelRamp, active, args.duration)
+        print(f"{name:<10}{legacy:>14.1f}{engine:>18.1f}")
+
+    ok = True
+    for hold in ('brake', 'ESTOP'):
+        publishes, idle = held_publishes(hold, 1.0)
+        print(f"{hold} held with the trigger pulled: {publishes} publishes in 1 s, ramp idle: {idle}")
+        ok = ok and publishes == 0 and idle
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: asyncio engine vs threads: input to frame and input to wire latency over a pty
+'''
+
+import sys, os
+import multiprocessing
+import random
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Joy
+from ums_xbox.xbox import JS_EVENT
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from xbox_control import XboxControl
+from xbox_async_control import AsyncXboxControl
+from bench_suite import synthetic_log, STEER
+from bench_split import WireTap, churn, percentiles
+
+ENGINES = {'threads': XboxControl, 'asyncio': AsyncXboxControl}
+
+def jittered(records: list, seed=9) -> list:
+    """The log with each event moved randomly inside its slot.
+
+    Events on an exact grid keep one phase against the 50 Hz tick, and
+    that phase alone would decide the latency of a drive.
+    """
+    rnd = random.Random(seed)
+    slot = records[1][0] - records[0][0]
+    return [(offset + rnd.randrange(slot), raw) for offset, raw in records]
+
+def drive(engine: str, records: list, seconds: float, load: bool) -> dict:
+    master, slave = os.openpty()
+    sent = []
+    def on_event(raw):
+        _, value, type_, number = JS_EVENT.unpack(raw)
+        if type_ == Joy.JS_EVENT_AXIS and number == STEER:
+            sent.append((value, time.perf_counter()))
+    player = EventPlayer(records, realtime=True, on_event=on_event)
+    xc = ENGINES[engine](os.ttyname(slave), 115200, 0.1, False, 0.05, xbox=ReplayXbox(player))
+    tap = WireTap(master)
+    tap.start()
+    if load:
+        # A large live heap makes every full collection long, the cycles trigger them.
+        heap = [[idx] for idx in range(300000)]
+        threading.Thread(target=churn, args=(heap,), daemon=True).start()
+    threading.Thread(target=xc.exec, daemon=True).start()
+    player.start()
+    time.sleep(seconds)
+
+    # a value sent twice could be matched with the wrong send
+    stamps = {}
+    for value, stamp in list(sent):
+        stamps.setdefault(value, []).append(stamp)
+    wire = [tap.first_seen[v] - t[0] for v, t in stamps.items()
+            if len(t) == 1 and v in tap.first_seen and tap.first_seen[v] >= t[0]]
+    return {'event_to_frame': xc.metrics.event_to_frame.summary(), 'wire': wire,
+            'jitter': xc.scheduler.jitter.summary()}
+
+def run(result, *args):
+    with open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        try:
+            result.put(drive(*args))
+        finally:
+            sys.stdout = sys.__stdout__
+
+def measure(*args) -> dict:
+    # A fresh process per drive, the engine threads and the load must not outlive it.
+    context = multiprocessing.get_context('forkserver')
+    result = context.Queue()
+    child = context.Process(target=run, args=(result,) + args)
+    child.start()
+    stats = result.get(timeout=120)
+    child.join()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio engine latency benchmark")
+    parser.add_argument('--seconds', type=float, default=10.0, help='length of each drive')
+    args = parser.parse_args()
+    records = jittered(synthetic_log(args.seconds + 2))
+
+    ok = True
+    results = {}
+    for load in (False, True):
+        for engine in ENGINES:
+            results[load, engine] = measure(engine, records, args.seconds, load)
+    for (load, engine), result in results.items():
+        name = f"{engine}{', input load' if load else ''}"
+        frame = result['event_to_frame']
+        print(f"{name:<21}: event -> frame p50 {frame['p50_us'] / 1e3:6.2f} ms, "
+              f"p99 {frame['p99_us'] / 1e3:6.2f} ms ({frame['count']} states)")
+        print(f"{'':<21}  input -> wire  {percentiles(result['wire'])}, "
+              f"tick jitter p99 {result['jitter']['p99_ms']:5.2f} ms")
+        ok = ok and frame['count'] > 0 and bool(result['wire'])
+    for load in (False, True):
+        threads = results[load, 'threads']['event_to_frame']
+        loop = results[load, 'asyncio']['event_to_frame']
+        print(f"asyncio vs threads{', input load' if load else ''}: event -> frame "
+              f"p50 {loop['p50_us'] / threads['p50_us']:.2f}x, p99 {loop['p99_us'] / threads['p99_us']:.2f}x "
+              f"({'lower' if loop['p99_us'] < threads['p99_us'] else 'not lower'} at p99)")
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Delta suppression: bytes on the wire, input latency and staleness, full frames vs --delta
+'''
+
+import sys, os
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Joy
+from ums_xbox.xbox import JS_EVENT
+from ums_xbox.protocol import Packet, DeltaGate, FrameParser
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from ums_serial.ums_serial import BITS_PER_BYTE
+from xbox_control import XboxControl
+from bench_suite import synthetic_log, STEER
+
+BAUDRATE = 9600
+
+def parked_log(seconds: float, active=0.4, cycle=2.0) -> list:
+    """synthetic_log with the pad left alone for most of every cycle."""
+    return [(offset, event) for offset, event in synthetic_log(seconds)
+            if offset == 0 or (offset / 1e9) % cycle < active]
+
+class WireTap(threading.Thread):
+    """Parse what reaches the pty master and time every frame and heartbeat."""
+    def __init__(self, fd: int):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.fd = fd
+        self.parser = FrameParser()
+        self.bytes = 0
+        self.first_seen = {}
+        self.full_at = []
+        self.any_at = []
+
+    def run(self):
+        parser = self.parser
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError:
+                return
+            now = time.perf_counter()
+            self.bytes += len(data)
+            before = parser.frames + parser.heartbeats
+            for frame in parser.feed(data):
+                self.full_at.append(now)
+                self.first_seen.setdefault(frame[6], now)
+            self.any_at += [now] * (parser.frames + parser.heartbeats - before)
+
+def max_gap(stamps: list) -> float:
+    return max((b - a for a, b in zip(stamps, stamps[1:])), default=0.0)
+
+def drive(records: list, delta: bool, keepalive: float, heartbeat: float) -> dict:
+    master, slave = os.openpty()
+    name = os.ttyname(slave)
+    sent = {}
+    def on_event(raw):
+        _, value, type_, number = JS_EVENT.unpack(raw)
+        if type_ == Joy.JS_EVENT_AXIS and number == STEER:
+            sent.setdefault(value, time.perf_counter())
+
+    player = EventPlayer(records, realtime=True, on_event=on_event)
+    xc = XboxControl(name, BAUDRATE, 0.1, False, 0.05, xbox=ReplayXbox(player),
+                     delta=delta, keepalive=keepalive, heartbeat=heartbeat)
+    tap = WireTap(master)
+    tap.start()
+    threading.Thread(target=xc.exec, daemon=True).start()
+    # let the port open so the wall clock only covers the drive
+    while not tap.bytes:
+        time.sleep(0.01)
+    wall = time.perf_counter()
+    player.start()
+    player.join()
+    time.sleep(0.2)
+    wall = time.perf_counter() - wall
+    latencies = sorted(tap.first_seen[v] - t for v, t in sent.items()
+                       if v in tap.first_seen and tap.first_seen[v] >= t)
+    return {
+        'bytes_per_s': tap.bytes / wall,
+        'frames': tap.parser.frames,
+        'heartbeats': tap.parser.heartbeats,
+        'alive_gaps': tap.parser.alive_gaps,
+        'checksum_errors': tap.parser.checksum_errors,
+        'latency': latencies,
+        'full_gap': max_gap(tap.full_at),
+        'any_gap': max_gap(tap.any_at),
+    }
+
+def offline(ticks: int, keepalive: float, heartbeat: float, period=0.02) -> int:
+    """Drive DeltaGate on a fake clock, returns the ticks that broke a bound."""
+    packet = Packet()
+    gate = DeltaGate(packet, keepalive, heartbeat)
+    period_ns = int(period * 1e9)
+    bad = 0
+    last_payload = None
+    last_full = last_any = 0
+    for tick in range(ticks):
+        now = tick * period_ns
+        # the stick moves every 37 ticks
+        steer = (tick // 37) * 100
+        packet.alive = (packet.alive + 1) & 0xFF
+        frame = gate.gate(packet.encode('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL', 0, 0, steer, steer), now)
+        payload = bytes(packet.packet[Packet.PAYLOAD])
+        if frame is not None and len(frame) == Packet.SIZE:
+            last_full = last_any = now
+            last_payload = payload
+        elif frame is not None:
+            last_any = now
+        if payload != last_payload:
+            bad += 1
+        if now - last_full > gate.keepalive_ns or now - last_any > gate.heartbeat_ns + period_ns:
+            bad += 1
+    return bad
+
+def main():
+    parser = argparse.ArgumentParser(description="delta suppression benchmark")
+    parser.add_argument('--seconds', type=float, default=6.0, help='length of the replayed drive')
+    parser.add_argument('--keepalive', type=float, default=0.5, help='longest time between full frames')
+    parser.add_argument('--heartbeat', type=float, default=0.1, help='longest silence on the line')
+    args = parser.parse_args()
+
+    bad = offline(50 * 60, args.keepalive, args.heartbeat)
+    print(f"offline bounds   : {bad} violations in 3000 ticks")
+
+    records = parked_log(args.seconds)
+    results = {}
+    with open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        for delta in (False, True):
+            results[delta] = drive(records, delta, args.keepalive, args.heartbeat)
+        sys.stdout = sys.__stdout__
+
+    ok = not bad
+    for delta, result in results.items():
+        latency = result['latency']
+        load = result['bytes_per_s'] * BITS_PER_BYTE / BAUDRATE * 100
+        print(f"{'delta' if delta else 'full ':5s} bytes/s    : {result['bytes_per_s']:7.1f} "
+              f"({load:.1f}% of {BAUDRATE} baud), {result['frames']} frames, {result['heartbeats']} heartbeats")
+        print(f"      latency    : p50 {latency[len(latency) // 2] * 1e3:.1f} ms, "
+              f"p99 {latency[int(len(latency) * 0.99)] * 1e3:.1f} ms ({len(latency)} steer values)")
+        print(f"      staleness  : full frame gap {result['full_gap'] * 1e3:.0f} ms, "
+              f"silence {result['any_gap'] * 1e3:.0f} ms, alive gaps {result['alive_gaps']}, "
+              f"bad {result['checksum_errors']}")
+        ok = ok and not result['alive_gaps'] and not result['checksum_errors'] and latency
+    slack = 0.05
+    ok = (ok and results[True]['full_gap'] <= args.keepalive + slack
+          and results[True]['any_gap'] <= args.heartbeat + slack
+          and results[True]['bytes_per_s'] < results[False]['bytes_per_s'])
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Events/sec of the table driven dispatch vs the former if-chains
+'''
+
+import sys, os
+import random
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import *
+from ums_xbox.xbox import Xbox, JS_EVENT
+
+AXIS_MAP = ['unknown(0x00)', 'unknown(0x01)', 'z', 'rx', 'ry', 'rz', 'hat0x', 'hat0y']
+BUTTON_MAP = ['a', 'b', 'unknown(0x132)', 'x', 'y', 'unknown(0x135)', 'tl', 'tr',
+              'unknown(0x138)', 'unknown(0x139)', 'select', 'start', 'mode']
+
+class LegacyXbox(Xbox):
+    """Xbox with the former string compare dispatch."""
+    def _process_event(self, type_, number, value):
+        if type_ == Joy.JS_EVENT_BUTTON and value:
+            button = Button.button_redefine.get(self.buttons[number], None)
+            if button == 'WHEEL_REAR':  self.pushed_wheel = button
+            if button == 'WHEEL_ALL':   self.pushed_wheel = button
+            if button == 'WHEEL_FRONT': self.pushed_wheel = button
+            if button == 'ESTOP_OFF':   self.pushed_estop = button
+            if button == 'ESTOP_ON':    self.pushed_estop = button
+            if button == 'CRUISE_DOWN': self.pushed_cruise = button
+            if button == 'CRUISE_UP':   self.pushed_cruise = button
+            self._set_cruise_accel_data()
+        if type_ == Joy.JS_EVENT_AXIS:
+            axis = Axis.axis_redefine.get(self.axis[number], None)
+            if axis == 'ACCEL':     self.pushed_accel = axis
+            if axis == 'STEER':     self.pushed_steer = axis
+            if axis == 'BRAKE':     self.pushed_brake = axis
+            if axis == 'GEAR_N':    self.pushed_gear = axis
+            if axis == 'GEAR_D_R':  self.pushed_gear = axis
+            if number == 2 and self.pushed_accel:
+                self.accel_data = value + 32767
+                self._ramp.notify()
+            if number == 5 and self.pushed_brake:
+                self.brake_data = value + 32767
+                self._ramp.notify()
+            if number == 3 and self.pushed_steer:
+                self.steer_raw_data = value
+                self.steer_modified_data = self._dz_steer_data((value // 10) * 10)
+            if number == 6: self.gear_data = 'GEAR_N'
+            if number == 7:
+                if value == 32767: self.gear_data = 'GEAR_R'
+                if value == -32767: self.gear_data = 'GEAR_D'
+            if number == 6 or number == 7:
+                self._ramp.notify()
+        self._change_cruise_mode()
+
+    def _dz_steer_data(self, data: int) -> int:
+        unscaled_deadzone = int(32767 * self.deadzone)
+        if data > unscaled_deadzone:
+            data -= unscaled_deadzone
+        elif data < -unscaled_deadzone:
+            data += unscaled_deadzone
+        else:
+            data = 0
+        return data
+
+def make_events(count: int) -> list:
+    """Synthetic drive: mostly stick and trigger noise, a few buttons."""
+    rnd = random.Random(2021)
+    events = []
+    for _ in range(count):
+        r = rnd.random()
+        if r < 0.45:
+            events.append((Joy.JS_EVENT_AXIS, 3, rnd.randint(-32767, 32767)))
+        elif r < 0.7:
+            events.append((Joy.JS_EVENT_AXIS, 2, rnd.randint(-32767, 32767)))
+        elif r < 0.9:
+            events.append((Joy.JS_EVENT_AXIS, rnd.choice((0, 1, 4, 5)), rnd.randint(-32767, 32767)))
+        elif r < 0.95:
+            events.append((Joy.JS_EVENT_AXIS, 7, rnd.choice((-32767, 0, 32767))))
+        else:
+            events.append((Joy.JS_EVENT_BUTTON, rnd.randrange(len(BUTTON_MAP)), rnd.randint(0, 1)))
+    return events
+
+def measure(xbox_cls, events: list) -> float:
+    xbox = xbox_cls()
+    xbox.axis = AXIS_MAP
+    xbox.buttons = BUTTON_MAP
+    xbox._axis_table = xbox._build_axis_table(AXIS_MAP)
+    xbox._button_table = xbox._build_button_table(BUTTON_MAP)
+    process = xbox._process_event
+    start = time.perf_counter()
+    for type_, number, value in events:
+        process(type_, number, value)
+    return len(events) / (time.perf_counter() - start)
+
+# a D tap, an R tap and an N press each around the pedals, ESTOP pressed and released
+BATCHES = {
+    'D tap': [(Joy.JS_EVENT_AXIS, 7, -32767), (Joy.JS_EVENT_AXIS, 7, 0)],
+    'R tap, accel': [(Joy.JS_EVENT_AXIS, 2, 0), (Joy.JS_EVENT_AXIS, 7, 32767), (Joy.JS_EVENT_AXIS, 7, 0),
+                     (Joy.JS_EVENT_AXIS, 2, 32767)],
+    'D tap, N, D tap': [(Joy.JS_EVENT_AXIS, 7, -32767), (Joy.JS_EVENT_AXIS, 7, 0), (Joy.JS_EVENT_AXIS, 6, 32767),
+                        (Joy.JS_EVENT_AXIS, 6, 0), (Joy.JS_EVENT_AXIS, 7, -32767), (Joy.JS_EVENT_AXIS, 7, 0)],
+    'ESTOP tap, brake': [(Joy.JS_EVENT_AXIS, 5, 32767), (Joy.JS_EVENT_BUTTON, 6, 1), (Joy.JS_EVENT_BUTTON, 6, 0),
+                         (Joy.JS_EVENT_AXIS, 5, -32767), (Joy.JS_EVENT_BUTTON, 7, 1),
+                         (Joy.JS_EVENT_BUTTON, 7, 0)],
+}
+
+def apply_batches(batches: list) -> tuple:
+    """Write each batch into a pipe and drain it in one read, like a queued device."""
+    xbox = Xbox()
+    xbox.axis = AXIS_MAP
+    xbox.buttons = BUTTON_MAP
+    xbox._axis_table = xbox._build_axis_table(AXIS_MAP)
+    xbox._button_table = xbox._build_button_table(BUTTON_MAP)
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    xbox._dev_fd = read_fd
+    try:
+        for batch in batches:
+            os.write(write_fd, b''.join(JS_EVENT.pack(0, value, type_, number) for type_, number, value in batch))
+            xbox._drain_events()
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    return xbox.gear_data, xbox.pushed_estop, xbox.accel_data, xbox.brake_data
+
+def batch_order() -> bool:
+    """A batch read at once must end where the same events read one by one end."""
+    ok = True
+    for name, events in BATCHES.items():
+        together = apply_batches([events])
+        one_by_one = apply_batches([[event] for event in events])
+        same = together == one_by_one
+        print(f"{name:<17}: one batch {together}, one by one {one_by_one}{'' if same else '  MISMATCH'}")
+        ok = ok and same
+    return ok and apply_batches([BATCHES['D tap']])[0] == 'GEAR_D'
+
+def main():
+    parser = argparse.ArgumentParser(description="event dispatch benchmark")
+    parser.add_argument('--events', '-n', type=int, default=500000)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    legacy = measure(LegacyXbox, events)
+    table = measure(Xbox, events)
+    print(f"legacy if-chains : {legacy:12.0f} events/s")
+    print(f"dispatch table   : {table:12.0f} events/s  ({table / legacy:.2f}x)")
+    if not batch_order():
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
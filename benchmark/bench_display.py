@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Test mode timing with a slow console, print per frame vs FrameDisplay
+'''
+
+import sys, os
+import fcntl
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.display import FrameDisplay
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from xbox_control import XboxControl
+from bench_suite import synthetic_log
+
+F_SETPIPE_SZ = 1031
+
+class PrintingControl(XboxControl):
+    """The old test mode: print every frame on the transmit thread."""
+    def _write(self, send_packet):
+        print(f"{list(send_packet)}", file=self.console, flush=True)
+
+class SlowConsole(threading.Thread):
+    """Read a pipe at bytes_per_s, like a slow SSH session or serial console."""
+    def __init__(self, fd: int, bytes_per_s: int):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.fd = fd
+        self.bytes_per_s = bytes_per_s
+
+    def run(self):
+        while True:
+            try:
+                data = os.read(self.fd, 256)
+            except OSError:
+                return
+            if not data:
+                return
+            time.sleep(len(data) / self.bytes_per_s)
+
+def run(cls, records: list, seconds: float, bytes_per_s: int) -> dict:
+    read_fd, write_fd = os.pipe()
+    # A tty buffers a few kB, not the 64 kB of a default pipe.
+    fcntl.fcntl(write_fd, F_SETPIPE_SZ, 4096)
+    console = os.fdopen(write_fd, 'w')
+    SlowConsole(read_fd, bytes_per_s).start()
+
+    player = EventPlayer(records, realtime=True)
+    xc = cls('/dev/null', 115200, 0.1, True, 0.05, xbox=ReplayXbox(player))
+    xc.console = console
+    if xc.display is not None:
+        xc.display = FrameDisplay(10.0, out=console)
+    threading.Thread(target=xc.exec, daemon=True).start()
+    player.start()
+    time.sleep(seconds)
+    return dict(xc.scheduler.jitter.summary(), missed=xc.scheduler.missed,
+                dropped=xc.display.dropped if xc.display is not None else 0)
+
+def main():
+    parser = argparse.ArgumentParser(description="test mode display benchmark")
+    parser.add_argument('--seconds', type=float, default=4.0)
+    parser.add_argument('--console-bps', type=int, default=1200,
+                        help='bytes per second the console drains')
+    args = parser.parse_args()
+
+    records = synthetic_log(args.seconds + 1)
+    for name, cls in (('print per frame', PrintingControl), ('FrameDisplay', XboxControl)):
+        result = run(cls, records, args.seconds, args.console_bps)
+        print("{:<16}: ticks {count:4d} missed {missed:4d} jitter p99 {p99_ms:7.2f} ms "
+              "max {max_ms:7.2f} ms dropped {dropped}".format(name, **result))
+
+if __name__ == '__main__':
+    main()
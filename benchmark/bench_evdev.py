@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: evdev backend against the js backend: same states, whole frames, speed
+'''
+
+import sys, os
+import tempfile
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Joy
+from ums_xbox.xbox import JS_EVENT
+from ums_xbox.evdev import EvdevXbox, INPUT_EVENT, EV_SYN, EV_KEY, EV_ABS, SYN_REPORT, SYN_DROPPED, KEY_CNT
+from ums_xbox.replay import EventPlayer, ReplayXbox, XBOX_AXIS_MAP, XBOX_BUTTON_MAP
+from ums_xbox.names import Axis, Button
+from bench_suite import synthetic_log
+
+AXIS_CODES = {idx: code for code, name in Axis.axis_names.items()
+              for idx, axis in enumerate(XBOX_AXIS_MAP) if axis == name}
+BUTTON_CODES = {idx: code for code, name in Button.button_names.items()
+                for idx, button in enumerate(XBOX_BUTTON_MAP) if button == name}
+HATS = (0x10, 0x11)
+
+class FifoEvdev(EvdevXbox):
+    """EvdevXbox on a FIFO, with the absinfo an xpad pad would report."""
+    def __init__(self, path: str):
+        EvdevXbox.__init__(self, device=path)
+        self.current = {}
+        self.pressed = set()
+
+    def _open_device(self) -> int:
+        # A FIFO opened for writing as well would never see the end.
+        return os.open(self.device, os.O_RDONLY | os.O_NONBLOCK)
+
+    def _is_xbox(self) -> bool:
+        return True
+
+    def _abs_codes(self) -> list:
+        return sorted(set(AXIS_CODES.values()))
+
+    def _get_absinfo(self, code: int):
+        # -32767..32767 keeps the js values exact, the hats are -1..1
+        limit = 1 if code in HATS else 32767
+        return (self.current.get(code, 0), -limit, limit, 0, 0, 0)
+
+    def _get_keys(self) -> bytearray:
+        keys = bytearray(KEY_CNT // 8)
+        for code in self.pressed:
+            keys[code // 8] |= 1 << (code % 8)
+        return keys
+
+    def _setup(self):
+        EvdevXbox._setup(self)
+        # The FIFO has no clock to switch, the writer stamps CLOCK_MONOTONIC.
+        self._kernel_clock = True
+
+def to_evdev(records: list) -> list:
+    """One input_event report per js_event."""
+    events = []
+    for _, raw in records:
+        _, value, type_, number = JS_EVENT.unpack(raw)
+        if type_ == Joy.JS_EVENT_AXIS and number in AXIS_CODES:
+            code = AXIS_CODES[number]
+            events.append((EV_ABS, code, value // 32767 if code in HATS else value))
+        elif type_ == Joy.JS_EVENT_BUTTON and number in BUTTON_CODES:
+            events.append((EV_KEY, BUTTON_CODES[number], value))
+        else:
+            continue
+        events.append((EV_SYN, SYN_REPORT, 0))
+    return events
+
+def pack(events: list, stamp_ns=None) -> bytes:
+    now = time.monotonic_ns() if stamp_ns is None else stamp_ns
+    sec, usec = divmod(now // 1000, 1000000)
+    return b''.join(INPUT_EVENT.pack(sec, usec, type_, code, value) for type_, code, value in events)
+
+def fields(state) -> tuple:
+    return (state.estop, state.gear, state.wheel, state.accel, state.brake,
+            state.steer_raw, state.steer_modified)
+
+def open_fifo(tmp: str) -> tuple:
+    path = os.path.join(tmp, 'event0')
+    if not os.path.exists(path):
+        os.mkfifo(path)
+    xbox = FifoEvdev(path)
+    xbox._try_open()
+    writer = os.open(path, os.O_WRONLY)
+    xbox._setup()
+    return xbox, writer
+
+def drain(xbox) -> float:
+    start = time.perf_counter()
+    while xbox._read_events():
+        pass
+    return time.perf_counter() - start
+
+def run_js(records: list) -> tuple:
+    player = EventPlayer(records, realtime=False)
+    xbox = ReplayXbox(player)
+    xbox._try_open()
+    xbox._setup()
+    player.start()
+    return xbox, drain(xbox)
+
+def run_evdev(tmp: str, events: list) -> tuple:
+    xbox, writer = open_fifo(tmp)
+    data = pack(events)
+    def feed():
+        os.write(writer, data)
+        os.close(writer)
+    threading.Thread(target=feed, daemon=True).start()
+    return xbox, drain(xbox)
+
+def check_frames(tmp: str) -> list:
+    xbox, writer = open_fifo(tmp)
+    results = []
+    seq = xbox.state.seq
+    # steer and accel in one report publish once and together
+    os.write(writer, pack([(EV_ABS, 0x03, 12000), (EV_ABS, 0x02, 5000), (EV_ABS, 0x03, 13000)]))
+    xbox._drain_events()
+    results.append(('no state before SYN_REPORT', xbox.state.seq == seq))
+    stamp = time.monotonic_ns() - 1500000
+    os.write(writer, pack([(EV_SYN, SYN_REPORT, 0)], stamp))
+    xbox._drain_events()
+    state = xbox.state
+    results.append(('one state per report', state.seq == seq + 1 and state.steer_raw == 13000))
+    results.append(('kernel timestamp kept', state.stamp // 1000 == stamp // 1000))
+    results.append(('coalesced counted', xbox.metrics.counters['events_coalesced'] == 1))
+
+    # after an overflow the pending report is thrown away and the axes read back
+    xbox.current = {0x03: -7000}
+    os.write(writer, pack([(EV_ABS, 0x03, 31000), (EV_SYN, SYN_DROPPED, 0),
+                           (EV_ABS, 0x03, 30000), (EV_SYN, SYN_REPORT, 0)]))
+    xbox._drain_events()
+    results.append(('SYN_DROPPED resyncs', xbox.state.steer_raw == -7000
+                    and xbox.metrics.counters['events_dropped'] == 1))
+
+    # the ESTOP_ON press was lost in the overflow: read back with the axes, one state
+    seq = xbox.state.seq
+    xbox.pressed = {0x137}
+    xbox.current = {0x03: -6000}
+    os.write(writer, pack([(EV_SYN, SYN_DROPPED, 0), (EV_SYN, SYN_REPORT, 0)]))
+    xbox._drain_events()
+    state = xbox.state
+    results.append(('SYN_DROPPED resyncs keys', state.estop == 'ESTOP_ON' and state.steer_raw == -6000
+                    and state.seq == seq + 1))
+    os.close(writer)
+    xbox._close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="evdev backend benchmark")
+    parser.add_argument('--seconds', type=float, default=20.0, help='length of the synthetic drive')
+    args = parser.parse_args()
+
+    records = synthetic_log(args.seconds)
+    events = to_evdev(records)
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        js, js_time = run_js(records)
+        evdev, evdev_time = run_evdev(tmp, events)
+        checks = check_frames(tmp)
+        sys.stdout = sys.__stdout__
+
+    same = fields(js.state) == fields(evdev.state)
+    print(f"js    : {len(records) / js_time:10.0f} reports/s ({len(records)} js_event)")
+    print(f"evdev : {len(records) / evdev_time:10.0f} reports/s ({len(events)} input_event)")
+    print(f"same final state          : {same}")
+    for name, ok in checks:
+        print(f"{name:<26}: {ok}")
+    if not same or not all(ok for _, ok in checks):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Vehicle feedback: parse throughput and the alive round trip over a pty
+'''
+
+import sys, os
+import tempfile
+import threading
+import time
+import argparse
+from serial.serialutil import SerialException
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.protocol import FrameParser, FeedbackParser
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from ums_serial.ums_serial import UmsSerial
+from ums_serial.receiver import FeedbackReceiver
+from xbox_control import XboxControl
+from bench_suite import synthetic_log
+
+class BytewiseParser:
+    """A per byte state machine fed by read(1), how serial loops usually parse frames."""
+    def __init__(self):
+        self.frame = bytearray()
+        self.frames = 0
+        self.state = None
+
+    def read_all(self, fd: int):
+        size = FeedbackParser.SIZE
+        frame = self.frame
+        while True:
+            data = os.read(fd, 1)
+            if not data:
+                return
+            byte = data[0]
+            if len(frame) < 3 and byte != b'STX'[len(frame)]:
+                frame.clear()
+                continue
+            frame.append(byte)
+            if len(frame) == size:
+                if frame[-2:] == b'\r\n' and frame[17] == sum(frame[3:16]) & 0xFF:
+                    self.state = FeedbackParser.FRAME.unpack(frame)
+                    self.frames += 1
+                frame.clear()
+
+def stream(frames: int) -> bytes:
+    out = bytearray()
+    for idx in range(frames):
+        out += FeedbackParser.encode(1, 0, 0, idx & 0xFFFF, (idx % 2000) - 1000, 0, 0, idx, idx & 0xFF)
+        if idx % 97 == 0:
+            out += b'\x00noise'
+    return bytes(out)
+
+def parse_speed(data: bytes) -> tuple:
+    """Read data from a file through the receiver ring and through read(1)."""
+    with tempfile.TemporaryFile() as capture:
+        capture.write(data)
+        capture.flush()
+        fd = capture.fileno()
+        receiver = FeedbackReceiver(None)
+        os.lseek(fd, 0, os.SEEK_SET)
+        start = time.perf_counter()
+        try:
+            while True:
+                receiver.read(fd)
+        except SerialException:
+            # end of the capture, like a hung up port
+            pass
+        ring = time.perf_counter() - start
+        bytewise = BytewiseParser()
+        os.lseek(fd, 0, os.SEEK_SET)
+        start = time.perf_counter()
+        bytewise.read_all(fd)
+        return receiver.parser.frames, ring, bytewise.frames, time.perf_counter() - start
+
+class Vehicle(threading.Thread):
+    """Answer every frame on the pty master with feedback echoing its alive."""
+    def __init__(self, fd: int, delay: float):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.fd = fd
+        self.delay = delay
+        self.parser = FrameParser()
+
+    def run(self):
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError:
+                return
+            for frame in self.parser.feed(data):
+                time.sleep(self.delay)
+                desc = FrameParser.describe(frame)
+                os.write(self.fd, FeedbackParser.encode(
+                    1, frame[1], frame[2], desc['accel'] // 100, desc['steer_raw'], desc['brake'] >> 8,
+                    0, self.parser.frames, desc['alive']))
+
+def round_trip(seconds: float, delay: float) -> dict:
+    master, slave = os.openpty()
+    name = os.ttyname(slave)
+    player = EventPlayer(synthetic_log(seconds + 1), realtime=True)
+    xc = XboxControl(name, 115200, 0.1, False, 0.05, xbox=ReplayXbox(player), feedback=True)
+    Vehicle(master, delay).start()
+    threading.Thread(target=xc.exec, daemon=True).start()
+    player.start()
+    time.sleep(seconds)
+    stats = xc.stats()
+    # read() used to be a property and could not be called
+    probe_master, probe_slave = os.openpty()
+    probe = UmsSerial(os.ttyname(probe_slave), 115200, 0.1)
+    probe.try_open()
+    os.write(probe_master, b'ping')
+    stats['read'] = probe.read(4)
+    return stats
+
+class HungUpPort:
+    """What the receiver sees of a port whose other end is gone: readable, 0 bytes."""
+    def __init__(self):
+        self.read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+
+    def isOpen(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self.read_fd
+
+def hangup_reads(seconds: float) -> int:
+    """read() calls of a receiver on a hung up port, it has to back off instead of spinning."""
+    receiver = FeedbackReceiver(HungUpPort())
+    calls = [0]
+    read = receiver.read
+    def counted(fd):
+        calls[0] += 1
+        return read(fd)
+    receiver.read = counted
+    receiver.start()
+    time.sleep(seconds)
+    receiver.stop()
+    return calls[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="vehicle feedback benchmark")
+    parser.add_argument('--frames', type=int, default=100000, help='frames in the parse test')
+    parser.add_argument('--seconds', type=float, default=3.0, help='length of the round trip test')
+    parser.add_argument('--delay', type=float, default=0.002, help='vehicle reply delay in seconds')
+    args = parser.parse_args()
+
+    ring_frames, ring, byte_frames, bytewise = parse_speed(stream(args.frames))
+    print(f"readv ring + scan: {ring_frames / ring:10.0f} frames/s ({ring_frames} frames)")
+    print(f"read(1) per byte : {byte_frames / bytewise:10.0f} frames/s ({bytewise / ring:.1f}x slower)")
+
+    with open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        stats = round_trip(args.seconds, args.delay)
+        sys.stdout = sys.__stdout__
+    vehicle = stats['vehicle']
+    rtt = stats['round_trip']
+    print(f"feedback frames  : {stats['counters']['feedback_frames']} of {stats['counters']['frames_sent']} sent, "
+          f"{stats['counters']['feedback_errors']} errors")
+    # The first echoes queue up while the receiver waits for the port to open.
+    print(f"alive round trip : p50 {rtt['p50_us'] / 1e3:.2f} ms, p99 {rtt['p99_us'] / 1e3:.2f} ms "
+          f"(vehicle delay {args.delay * 1e3:.1f} ms)")
+    print(f"vehicle          : echo {vehicle['echo']}, speed {vehicle['speed']}, steer {vehicle['steer']}")
+    print(f"UmsSerial.read(4): {stats['read']!r}")
+    reads = hangup_reads(1.0)
+    # one read per POLL_MS back off, and a few for scheduling slack
+    bound = 1000 // FeedbackReceiver.POLL_MS + 5
+    print(f"hung up port, 1 s : {reads} reads (bound {bound})")
+    ok = (ring_frames == byte_frames == args.frames and vehicle['echo'] and rtt['count'] > 0
+          and stats['read'] == b'ping' and reads <= bound)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Decode speed of serial captures and a check of the drop accounting
+'''
+
+import sys, os
+import random
+import tempfile
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.protocol import Packet, FrameParser
+from ums_xbox.capture import decode_file, summary
+
+def make_capture(path: str, frames: int, seed=12) -> dict:
+    """Write a capture with dropped frames, corrupted frames and line noise."""
+    rnd = random.Random(seed)
+    packet = Packet()
+    expected = {'frames': 0, 'checksum_errors': 0, 'alive_missing': 0}
+    with open(path, 'wb') as f:
+        for i in range(frames):
+            packet.alive = i & 0xFF
+            frame = bytearray(packet.encode('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL',
+                                            rnd.randrange(0x10000) & 0xFF00, rnd.randrange(0x10000),
+                                            rnd.randint(-2000, 2000), rnd.randint(-2000, 2000)))
+            r = rnd.random()
+            if r < 0.001:
+                # Never reached the wire.
+                expected['alive_missing'] += 1
+                continue
+            if r < 0.002:
+                frame[12] ^= 0x40
+                expected['checksum_errors'] += 1
+                expected['alive_missing'] += 1
+            else:
+                expected['frames'] += 1
+            f.write(frame)
+            if r > 0.999:
+                f.write(bytes(rnd.randrange(256) for _ in range(rnd.randint(1, 8))).replace(b'S', b'?'))
+    return expected
+
+def stream(path: str, chunk: int) -> FrameParser:
+    parser = FrameParser()
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            parser.feed(data)
+    return parser
+
+def main():
+    parser = argparse.ArgumentParser(description="frame decode benchmark")
+    parser.add_argument('--frames', '-n', type=int, default=500000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'capture.bin')
+        expected = make_capture(path, args.frames)
+        print(f"capture size      : {os.path.getsize(path) / 1e6:.1f} MB")
+
+        results = {}
+        for name, columns in (('summary only', False), ('with columns', True)):
+            start = time.perf_counter()
+            decoded, _ = decode_file(path, columns=columns)
+            elapsed = time.perf_counter() - start
+            results[name] = summary(decoded)
+            print(f"{name:<18}: {decoded.frames / elapsed:10.0f} frames/s")
+
+        start = time.perf_counter()
+        streamed = stream(path, 4096)
+        print(f"{'feed, 4 kB reads':<18}: {streamed.frames / (time.perf_counter() - start):10.0f} frames/s")
+
+    result = results['summary only']
+    print(result)
+    ok = (all(result[key] == value for key, value in expected.items())
+          and results['with columns'] == result
+          and summary(streamed)['frames'] == result['frames'])
+    if not ok:
+        print(f"expected {expected}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: ControllerGroup arbitration check and cost per extra controller
+'''
+
+import sys, os
+import tempfile
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Joy
+from ums_xbox.xbox import JS_EVENT
+from ums_xbox.group import ControllerGroup
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from bench_hotplug import FakeJoystick
+from bench_suite import synthetic_log
+
+STEER, GEAR_D_R = 3, 7
+ESTOP_OFF, ESTOP_ON = 4, 5
+
+class FifoPad(FakeJoystick):
+    def __init__(self, path: str, index: int):
+        FakeJoystick.__init__(self, path)
+        self.index = index
+
+def axis(number: int, value: int) -> bytes:
+    return JS_EVENT.pack(0, value, Joy.JS_EVENT_AXIS, number)
+
+def button(number: int) -> bytes:
+    return JS_EVENT.pack(0, 1, Joy.JS_EVENT_BUTTON, number)
+
+def settle(group: ControllerGroup, check, timeout=1.0) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if check(group.state):
+            return True
+        time.sleep(0.005)
+    return False
+
+def check_arbitration(tmp: str) -> bool:
+    paths = [os.path.join(tmp, f'js{idx}') for idx in range(2)]
+    for path in paths:
+        os.mkfifo(path)
+    pads = [FifoPad(path, idx) for idx, path in enumerate(paths)]
+    group = ControllerGroup(pads)
+    group.start()
+    writers = [os.open(path, os.O_WRONLY) for path in paths]
+    group.wait_connect(1.0)
+    settle(group, lambda s: all(pad.is_connect for pad in pads))
+
+    steps = []
+    def step(name, raw, check):
+        os.write(writers[raw[0]], raw[1])
+        time.sleep(0.05)  # give a wrong merge the time to show up
+        steps.append((name, settle(group, check)))
+
+    step('primary steers', (0, axis(STEER, 12000)), lambda s: s.steer_raw == 12000)
+    step('observer cannot steer', (1, axis(STEER, -9000)), lambda s: s.steer_raw == 12000)
+    step('primary in gear D', (0, axis(GEAR_D_R, -32767)), lambda s: s.gear == 'GEAR_D')
+    step('observer ESTOP', (1, button(ESTOP_ON)), lambda s: s.estop == 'ESTOP_ON')
+    step('observer ESTOP off', (1, button(ESTOP_OFF)), lambda s: s.estop == 'ESTOP_OFF')
+    step('observer in gear D', (1, axis(GEAR_D_R, -32767)), lambda s: s.steer_raw == 12000)
+
+    os.close(writers[0])
+    steps.append(('handover held in N', settle(group, lambda s: s.steer_raw == -9000 and s.gear == 'GEAR_N')))
+    step('still held in N', (1, axis(STEER, -8000)), lambda s: s.steer_raw == -8000 and s.gear == 'GEAR_N')
+    step('released by N', (1, axis(6, 0)), lambda s: s.gear == 'GEAR_N' and not group.arbiter.holding)
+    step('new driver in D', (1, axis(GEAR_D_R, -32767)), lambda s: s.gear == 'GEAR_D')
+
+    # The FIFO stays in place like a js node after EIO: no inotify event, only the retry.
+    poll_interval = group._watchers[tmp].poll_interval
+    steps.append(('retry after an error', settle(group, lambda s: pads[0].is_connect, poll_interval + 1.0)))
+    for name, ok in steps:
+        print(f"  {name:<22}: {'ok' if ok else 'FAILED'}", file=sys.__stdout__)
+    return all(ok for _, ok in steps)
+
+def cpu_per_second(pads: int, grouped: bool, seconds: float) -> tuple:
+    """CPU for pads each streaming a 250 events/s drive in real time."""
+    players = [EventPlayer(synthetic_log(seconds + 1, seed=idx), realtime=True) for idx in range(pads)]
+    xboxes = [ReplayXbox(player) for player in players]
+    for idx, xbox in enumerate(xboxes):
+        xbox.index = idx
+    threads = threading.active_count()
+    if grouped:
+        group = ControllerGroup(xboxes)
+        group.start()
+        group.wait_connect(1.0)
+    else:
+        for xbox in xboxes:
+            xbox.start()
+    time.sleep(0.2)
+    threads = threading.active_count() - threads
+    for player in players:
+        player.start()
+    cpu = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu
+    # The players run in this process too, their share is the same both ways.
+    merge = 0.0
+    if grouped:
+        start = time.perf_counter()
+        for _ in range(10000):
+            group.state
+        merge = (time.perf_counter() - start) / 10000
+    return cpu / seconds, threads, merge
+
+def main():
+    parser = argparse.ArgumentParser(description="controller group benchmark")
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--max-pads', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        print("arbitration:", file=sys.__stdout__)
+        ok = check_arbitration(tmp)
+        print(f"{'pads':>4} {'threads':>8} {'CPU thread/pad':>15} {'CPU group':>10} {'merge':>9}",
+              file=sys.__stdout__)
+        pads = 1
+        while pads <= args.max_pads:
+            single, single_threads, _ = cpu_per_second(pads, False, args.seconds)
+            group, group_threads, merge = cpu_per_second(pads, True, args.seconds)
+            print(f"{pads:4d} {single_threads:3d} / {group_threads:<3d} {single * 100:14.2f}% "
+                  f"{group * 100:9.2f}% {merge * 1e6:7.2f} us", file=sys.__stdout__)
+            pads *= 2
+        sys.stdout = sys.__stdout__
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Time to reconnect with inotify vs the former polling
+'''
+
+import sys, os
+import random
+import tempfile
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.xbox import Xbox
+from ums_xbox.replay import XBOX_AXIS_MAP, XBOX_BUTTON_MAP
+from ums_serial.ums_serial import UmsSerial
+import serial.tools.list_ports
+
+class FakeJoystick(Xbox):
+    """Xbox on a FIFO in a temporary directory instead of /dev/input/js0."""
+    def __init__(self, path: str):
+        Xbox.__init__(self)
+        self.path = path
+        self.accept = True
+
+    @property
+    def _get_dev_file(self) -> str:
+        return self.path
+
+    def _try_open(self) -> bool:
+        try:
+            return self._open_fd(os.open(self.path, os.O_RDONLY | os.O_NONBLOCK))
+        except FileNotFoundError:
+            self._set_connect(False)
+            return False
+
+    def _is_xbox(self) -> bool:
+        return self.accept
+
+    def _get_axis(self) -> list:
+        return list(XBOX_AXIS_MAP)
+
+    def _get_buttons(self) -> list:
+        return list(XBOX_BUTTON_MAP)
+
+class PollingJoystick(FakeJoystick):
+    """The former _open: try, then sleep 2 s."""
+    def _open(self) -> bool:
+        if self._try_open():
+            return True
+        time.sleep(2)
+
+class PollingSerial(UmsSerial):
+    """The former connect: enumerate the ports once a second."""
+    def connect(self, test_mode) -> bool:
+        while not self._serial.isOpen():
+            serial.tools.list_ports.comports()
+            if not self.try_open():
+                time.sleep(1)
+        return True
+
+def reconnect_times(connect, plug, unplug, count: int) -> tuple:
+    """Plug after a random delay and time until connect() returns."""
+    rnd = random.Random(3)
+    times = []
+    cpu_idle = 0.0
+    for _ in range(count):
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (connect(), done.set()), daemon=True)
+        thread.start()
+        delay = rnd.uniform(0.2, 2.0)
+        cpu = time.process_time()
+        time.sleep(delay)
+        cpu_idle += (time.process_time() - cpu) / delay
+        start = time.perf_counter()
+        plug()
+        done.wait()
+        times.append(time.perf_counter() - start)
+        unplug()
+    return times, cpu_idle / count
+
+def report(name: str, times: list, cpu_idle: float):
+    times = sorted(times)
+    print(f"{name:<20}: median {times[len(times) // 2] * 1e3:8.2f} ms  max {times[-1] * 1e3:8.2f} ms  "
+          f"CPU while unplugged {cpu_idle * 100:.2f}%", file=sys.__stdout__)
+
+def bench_xbox(tmp: str, count: int) -> list:
+    path = os.path.join(tmp, 'js0')
+    results = []
+    for name, cls in (('js polling', PollingJoystick), ('js inotify', FakeJoystick)):
+        xbox = cls(path)
+        times, cpu = reconnect_times(xbox._connect, lambda: os.mkfifo(path),
+                                     lambda: (xbox._close(), os.unlink(path)), count)
+        report(name, times, cpu)
+        results.append(times)
+    return results
+
+def bench_other_joystick(tmp: str) -> bool:
+    """A non-Xbox node must not spin the CPU or leak descriptors."""
+    path = os.path.join(tmp, 'js0')
+    xbox = FakeJoystick(path)
+    xbox.accept = False
+    os.mkfifo(path)
+    fds = len(os.listdir('/proc/self/fd'))
+    thread = threading.Thread(target=xbox._connect, daemon=True)
+    thread.start()
+    cpu = time.process_time()
+    time.sleep(1.0)
+    cpu = time.process_time() - cpu
+    leaked = len(os.listdir('/proc/self/fd')) - fds - 1  # the inotify fd
+    xbox.accept = True
+    os.utime(path)
+    ok = xbox.wait_connect(1.0)
+    print(f"{'other joystick':<20}: CPU {cpu * 100:.2f}%  leaked fds {leaked}  connects after replug {ok}", file=sys.__stdout__)
+    xbox._close()
+    os.unlink(path)
+    return ok and leaked <= 0 and cpu < 0.05
+
+def bench_serial(tmp: str, count: int) -> list:
+    master, slave = os.openpty()
+    target = os.ttyname(slave)
+    path = os.path.join(tmp, 'ttyUSB0')
+    results = []
+    for name, cls in (('serial polling', PollingSerial), ('serial inotify', UmsSerial)):
+        ser = cls(path, 115200, 0.1)
+        times, cpu = reconnect_times(lambda: ser.connect(False), lambda: os.symlink(target, path),
+                                     lambda: (ser._serial.close(), os.unlink(path)), count)
+        report(name, times, cpu)
+        results.append(times)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="hotplug reconnect benchmark")
+    parser.add_argument('--count', '-n', type=int, default=5)
+    args = parser.parse_args()
+
+    # The open attempts print, the table goes to sys.__stdout__.
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        results = bench_xbox(tmp, args.count) + bench_serial(tmp, args.count)
+        ok = bench_other_joystick(tmp)
+        sys.stdout = sys.__stdout__
+    if not ok or max(results[1]) > 0.1 or max(results[3]) > 0.1:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
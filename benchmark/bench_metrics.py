@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Cost of the metrics on the transmit path, and a stats endpoint check
+'''
+
+import sys, os
+import json
+import socket
+import tempfile
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_runtime.metrics import StatsServer
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from xbox_control import XboxControl
+from bench_suite import synthetic_log
+
+def make_control() -> XboxControl:
+    xc = XboxControl('/dev/null', 115200, 0.1, False, 0.05)
+    # Time the bookkeeping, not the UART.
+    xc.ums_ser.write = lambda data, replace=None: None
+    return xc
+
+def frame_baseline(xc: XboxControl):
+    # _make_xbox_packet and _write without any metrics
+    xc.packet.alive = xc._active_count(xc.packet.alive)
+    state = xc.xbox.state
+    xc.ums_ser.write(xc.packet.encode(state.estop, state.gear, state.wheel, state.accel,
+                                      state.brake, state.steer_raw, state.steer_modified))
+
+def frame_metrics(xc: XboxControl):
+    xc._write(xc._make_xbox_packet())
+
+def per_frame_ns(xc: XboxControl, frame, frames: int) -> float:
+    best = None
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for _ in range(frames):
+            frame(xc)
+        elapsed = (time.perf_counter_ns() - start) / frames
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def events_read(records: list) -> dict:
+    player = EventPlayer(records, realtime=False)
+    xbox = ReplayXbox(player)
+    xbox._try_open()
+    xbox._setup()
+    player.start()
+    while xbox._read_events():
+        pass
+    return xbox.metrics.counters
+
+def main():
+    parser = argparse.ArgumentParser(description="metrics overhead benchmark")
+    parser.add_argument('--frames', '-n', type=int, default=100000)
+    parser.add_argument('--budget-us', type=float, default=5.0,
+                        help='allowed metrics cost per 50 Hz frame')
+    args = parser.parse_args()
+
+    xc = make_control()
+    baseline = per_frame_ns(xc, frame_baseline, args.frames)
+    with_metrics = per_frame_ns(xc, frame_metrics, args.frames)
+    overhead = with_metrics - baseline
+    print(f"frame without metrics : {baseline / 1e3:.2f} us")
+    print(f"frame with metrics    : {with_metrics / 1e3:.2f} us")
+    print(f"overhead              : {overhead / 1e3:.2f} us per frame, "
+          f"{overhead / xc._period_ns * 100:.4f}% of the {xc._period_ns / 1e6:.0f} ms period")
+
+    records = synthetic_log(2.0)
+    counters = events_read(records)
+    print(f"events read / coalesced / dropped: {counters['events_read']} / "
+          f"{counters['events_coalesced']} / {counters['events_dropped']}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = StatsServer(xc.stats, os.path.join(tmp, 'stats.sock'))
+        server.start()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(server.path)
+            stats = json.loads(sock.makefile().readline())
+        server.close()
+    print(f"stats endpoint        : {sorted(stats)}")
+    print(xc.metrics.log_line())
+
+    if overhead / 1e3 > args.budget_us or counters['events_read'] != len(records):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
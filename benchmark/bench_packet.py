@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Packet encoder and DeltaGate speed and per frame allocations (tracemalloc)
+'''
+
+import sys, os
+import time
+import tracemalloc
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.protocol import Packet, DeltaGate
+
+def legacy_frame(packet, alive, estop, gear, wheel, accel, brake, steer_raw, steer_modified) -> list:
+    """The former _convert_bytes + makepacket + serial.to_bytes path."""
+    accel_val = accel.to_bytes(2, byteorder="little", signed=False)
+    brake_val = brake.to_bytes(2, byteorder="little", signed=False)
+    raw_val = steer_raw.to_bytes(2, byteorder="little", signed=True)
+    modified_val = steer_modified.to_bytes(2, byteorder="little", signed=True)
+    frame = [0x53, 0x54, 0x58,
+             Packet.ESTOP.get(estop), Packet.GEAR.get(gear), Packet.WHEEL.get(wheel),
+             0x00, accel_val[1], brake_val[0], brake_val[1],
+             raw_val[0], raw_val[1], modified_val[0], modified_val[1],
+             alive, 0x00, 0x0D, 0x0A]
+    frame[15] = Packet.calc_checksum(frame[3:14])
+    return bytes(frame)
+
+def inputs(count: int) -> list:
+    return [('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL',
+             (i * 37) % 40000, (i * 91) % 65535,
+             (i * 53) % 65401 - 32700, (i * 29) % 63001 - 31500) for i in range(count)]
+
+def check_equal(frames: list) -> None:
+    packet = Packet()
+    for alive, args in enumerate(frames):
+        packet.alive = alive & 0xFF
+        assert bytes(packet.encode(*args)) == legacy_frame(None, alive & 0xFF, *args), args
+
+def check_allocations(frames: list) -> int:
+    """Return the number of blocks still allocated after encoding the frames."""
+    packet = Packet()
+    encode = packet.encode
+    encode(*frames[0])
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for args in frames:
+        encode(*args)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    filters = [tracemalloc.Filter(True, Packet.encode.__code__.co_filename)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    return sum(stat.count_diff for stat in stats)
+
+def traced_peak(packet: Packet, frames: list) -> int:
+    encode = packet.encode
+    frames_iter = iter(frames)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for args in frames_iter:
+        encode(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base
+
+def check_peak(frames: list) -> int:
+    """Return the extra peak bytes of encoding all frames instead of one.
+
+    The loop and tracemalloc have a small fixed cost, anything above it
+    would be an allocation made per frame.
+    """
+    packet = Packet()
+    packet.encode(*frames[0])
+    return traced_peak(packet, frames) - traced_peak(packet, frames[:1])
+
+def gate_peak(gate, frame, ticks: int) -> int:
+    # now stays a small int, so the arithmetic on it allocates nothing either
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for now in range(1, ticks):
+        gate(frame, now)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base
+
+def check_gate_peak(frames: list, ticks=200) -> int:
+    """Return the peak bytes DeltaGate allocates gating an unchanged frame, less the loop's own."""
+    packet = Packet()
+    delta = DeltaGate(packet, keepalive=1, heartbeat=0)
+    frame = packet.encode(*frames[0])
+    delta.gate(frame, 0)
+    return gate_peak(delta.gate, frame, ticks) - gate_peak(lambda frame, now: None, frame, ticks)
+
+def main():
+    parser = argparse.ArgumentParser(description="packet encoder benchmark")
+    parser.add_argument('--frames', '-n', type=int, default=200000)
+    args = parser.parse_args()
+
+    frames = inputs(args.frames)
+    check_equal(frames[:20000])
+    leaked = check_allocations(frames)
+    peak = check_peak(frames)
+    gate_bytes = check_gate_peak(frames)
+    print(f"blocks retained by encode over {len(frames)} frames: {leaked}")
+    print(f"peak bytes allocated per frame: {peak}")
+    print(f"peak bytes allocated by DeltaGate.gate: {gate_bytes}")
+    if leaked or peak or gate_bytes > 0:
+        sys.exit(1)
+
+    start = time.perf_counter()
+    for alive, args_ in enumerate(frames):
+        legacy_frame(None, alive & 0xFF, *args_)
+    legacy = len(frames) / (time.perf_counter() - start)
+
+    packet = Packet()
+    encode = packet.encode
+    start = time.perf_counter()
+    for args_ in frames:
+        encode(*args_)
+    table = len(frames) / (time.perf_counter() - start)
+    print(f"legacy   : {legacy:10.0f} frames/s")
+    print(f"encode   : {table:10.0f} frames/s  ({table / legacy:.2f}x)")
+
+    delta = DeltaGate(packet, keepalive=1, heartbeat=0)
+    gate = delta.gate
+    frame = encode(*frames[0])
+    start = time.perf_counter()
+    for now in range(len(frames)):
+        gate(frame, now)
+    print(f"gate     : {len(frames) / (time.perf_counter() - start):10.0f} ticks/s")
+
+if __name__ == '__main__':
+    main()
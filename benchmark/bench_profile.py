@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Vehicle profiles: validation, SIGHUP reload under a 50 Hz loop, hot path cost
+'''
+
+import sys, os
+import signal
+import tempfile
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Param
+from ums_xbox.protocol import Packet
+from ums_xbox.ramp import ramp_step
+from ums_xbox.profile import Profile, DEFAULT_PROFILE, load_profiles, ProfileReloader
+from ums_xbox.xbox import Xbox
+from ums_runtime.scheduler import FixedRateScheduler
+
+RUN = "[DEFAULT]\n{base}\n[run]\n{extra}\n"
+
+def legacy_ramp_step(current: int, target: int, gear: str, profile=None) -> int:
+    """ramp_step on the Param constants, before profiles."""
+    if gear == 'GEAR_N':
+        return 0
+    if target < Param.APS_INIT_VAL: target = Param.APS_INIT_VAL
+    if target > Param.MAX_ACCEL_VAL: target = Param.MAX_ACCEL_VAL
+    if current < target:
+        if gear == 'GEAR_D':
+            if current <= Param.THRESH_ACCEL_VAL:
+                current += Param.INCREASE_VAL
+            else:
+                current += (int)(Param.INCREASE_VAL / 4)
+        else:
+            current += Param.INCREASE_VAL * 2
+        return target if current > target else current
+    if current > target:
+        if gear == 'GEAR_D':
+            current -= Param.DECREASE_VAL
+        else:
+            current -= Param.DECREASE_VAL * 3
+        return target if current < target else current
+    return current
+
+def check_validation(example: str) -> list:
+    results = []
+    profiles = load_profiles(example)
+    results.append(('example default == Param', profiles['default'].values() == DEFAULT_PROFILE.values()))
+    results.append(('example slow is slower', profiles['slow'].max_accel < DEFAULT_PROFILE.max_accel))
+    for name, values in (('unknown key rejected', {'max_acel': '1'}),
+                         ('max < thresh rejected', {'max_accel': '1000'}),
+                         ('non integer rejected', {'increase': 'fast'}),
+                         ('16 bit accel enforced', {'max_accel': '70000'})):
+        try:
+            Profile('bad', **values)
+            results.append((name, False))
+        except ValueError:
+            results.append((name, True))
+    try:
+        DEFAULT_PROFILE.max_accel = 1
+        results.append(('profile immutable', False))
+    except AttributeError:
+        results.append(('profile immutable', True))
+    return results
+
+def run_loop(xbox: Xbox, seconds: float) -> FixedRateScheduler:
+    """The transmit side of XboxControl: read the state, encode a frame."""
+    scheduler = FixedRateScheduler(50.0)
+    packet = Packet()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        state = xbox.state
+        packet.encode(state.estop, state.gear, state.wheel, state.accel,
+                      state.brake, state.steer_raw, state.steer_modified)
+        scheduler.wait()
+    return scheduler
+
+def live_reload(tmp: str, example: str, seconds: float, reloads: bool) -> tuple:
+    base = open(example).read().split('[default]')[0].replace('[DEFAULT]', '')
+    path = os.path.join(tmp, 'run.ini')
+    variants = ["", "max_accel = 25000\nthresh_accel = 15000\nsteer_expo = 0.3",
+                "max_accel = 30000\nsteer_rate = 4000"]
+    with open(path, 'w') as f:
+        f.write(RUN.format(base=base, extra=variants[0]))
+
+    xbox = Xbox()
+    reloader = ProfileReloader(path, 'run', xbox.set_profile, xbox.profile)
+    reloader.install()
+    result = {}
+    loop = threading.Thread(target=lambda: result.setdefault('scheduler', run_loop(xbox, seconds)))
+    loop.start()
+    sent = 0
+    bad_kept = None
+    while reloads:
+        time.sleep(0.1)
+        if not loop.is_alive():
+            break
+        sent += 1
+        if sent == 5:
+            # a broken file keeps the running profile
+            before = xbox.profile
+            with open(path, 'w') as f:
+                f.write(RUN.format(base=base, extra="max_accel = oops"))
+            os.kill(os.getpid(), signal.SIGHUP)
+            time.sleep(0.05)
+            bad_kept = xbox.profile is before
+            continue
+        with open(path, 'w') as f:
+            f.write(RUN.format(base=base, extra=variants[sent % len(variants)]))
+        os.kill(os.getpid(), signal.SIGHUP)
+    loop.join()
+    signal.signal(signal.SIGHUP, signal.SIG_DFL)
+    return result['scheduler'], reloader.reloads, bad_kept, xbox
+
+def check_applied(xbox: Xbox, max_accel: int) -> bool:
+    with xbox._state_lock:
+        xbox.aps_accel_data = 60000
+        xbox._publish()
+        clamped = xbox.aps_accel_data == max_accel
+    current = 0
+    for _ in range(5000):
+        current = ramp_step(current, 60000, 'GEAR_D', xbox.profile)
+    return clamped and current == max_accel
+
+def per_call(fn, calls: int, *extra) -> float:
+    start = time.perf_counter()
+    for idx in range(calls):
+        fn(idx & 0x7fff, 30000, 'GEAR_D', *extra)
+    return (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser(description="vehicle profile benchmark")
+    parser.add_argument('--seconds', type=float, default=3.0, help='length of each 50 Hz run')
+    parser.add_argument('--calls', type=int, default=500000)
+    args = parser.parse_args()
+
+    example = os.path.join(dir_path, 'script', 'profiles.ini')
+    checks = check_validation(example)
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        steady, _, _, _ = live_reload(tmp, example, args.seconds, False)
+        reloaded, reloads, bad_kept, xbox = live_reload(tmp, example, args.seconds, True)
+        sys.stdout = sys.__stdout__
+    checks.append(('bad reload keeps profile', bad_kept))
+    checks.append(('limits follow reload', check_applied(xbox, xbox.profile.max_accel)))
+
+    for name, ok in checks:
+        print(f"{name:<26}: {ok}")
+    for name, scheduler in (('50 Hz loop, no reload', steady), (f'50 Hz loop, {reloads} reloads', reloaded)):
+        jitter = scheduler.jitter.summary()
+        print(f"{name:<26}: jitter p99 {jitter['p99_ms']:.2f} ms, max {jitter['max_ms']:.2f} ms, "
+              f"missed {scheduler.missed}")
+    legacy = per_call(legacy_ramp_step, args.calls, None)
+    current = per_call(ramp_step, args.calls, DEFAULT_PROFILE)
+    print(f"{'ramp_step, Param':<26}: {legacy * 1e9:.0f} ns")
+    print(f"{'ramp_step, Profile':<26}: {current * 1e9:.0f} ns")
+    if not all(ok for _, ok in checks):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Transmit tick jitter under CPU load with and without the real-time options
+'''
+
+import sys, os
+import multiprocessing
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from ums_runtime.realtime import Realtime
+from xbox_control import XboxControl
+from bench_suite import synthetic_log
+
+def burn():
+    """Desktop and logging load: CPU plus garbage, at normal priority."""
+    while True:
+        garbage = [[idx] for idx in range(1000)]
+        garbage.append(garbage)
+
+def drain(fd: int):
+    while True:
+        try:
+            os.read(fd, 4096)
+        except OSError:
+            return
+
+def run(options: dict, seconds: float, result):
+    master, slave = os.openpty()
+    # started before apply(), so it keeps SCHED_OTHER like the load
+    threading.Thread(target=drain, args=(master,), daemon=True).start()
+    player = EventPlayer(synthetic_log(seconds + 1), realtime=True)
+    xc = XboxControl(os.ttyname(slave), 115200, 0.1, False, 0.05, xbox=ReplayXbox(player))
+    with open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        report = Realtime(**options).apply()
+        threading.Thread(target=xc.exec, daemon=True).start()
+        player.start()
+        time.sleep(seconds)
+        sys.stdout = sys.__stdout__
+    result.put({'report': report, 'jitter': xc.scheduler.jitter.summary(),
+                'missed': xc.scheduler.missed})
+
+def measure(options: dict, seconds: float) -> dict:
+    # A fresh process per run, the scheduler and gc state must not leak.
+    result = multiprocessing.Queue()
+    child = multiprocessing.Process(target=run, args=(options, seconds, result))
+    child.start()
+    stats = result.get(timeout=seconds + 30)
+    child.join()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="real-time options benchmark")
+    parser.add_argument('--seconds', type=float, default=5.0, help='length of each run')
+    parser.add_argument('--load', type=int, default=max(2, os.cpu_count() or 1),
+                        help='busy processes competing for the CPU')
+    parser.add_argument('--priority', type=int, default=50, help='SCHED_FIFO priority')
+    parser.add_argument('--cpu', type=int, default=(os.cpu_count() or 1) - 1, help='core to pin to')
+    args = parser.parse_args()
+
+    configs = [
+        ('default', {}),
+        ('gc freeze', {'gc_mode': 'freeze'}),
+        ('SCHED_FIFO', {'priority': args.priority}),
+        ('all options', {'priority': args.priority, 'cpus': [args.cpu], 'lock_memory': True,
+                         'gc_mode': 'freeze'}),
+    ]
+    loaders = [multiprocessing.Process(target=burn, daemon=True) for _ in range(args.load)]
+    for loader in loaders:
+        loader.start()
+    print(f"load: {args.load} busy processes on {os.cpu_count()} cpus")
+    ok = True
+    try:
+        for name, options in configs:
+            stats = measure(options, args.seconds)
+            jitter = stats['jitter']
+            print(f"{name:<12}: tick jitter p50 {jitter['p50_ms']:6.2f} ms, p99 {jitter['p99_ms']:6.2f} ms, "
+                  f"max {jitter['max_ms']:6.2f} ms, missed {stats['missed']} ({jitter['count']} ticks)")
+            print("              " + Realtime.describe(stats['report']).replace('\n', '\n              '))
+            ok = ok and jitter['count'] > 0
+    finally:
+        for loader in loaders:
+            loader.terminate()
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: FixedRateScheduler on a fake clock: missed tick totals and catch-up bursts per policy
+'''
+
+import sys, os
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_runtime.scheduler import FixedRateScheduler
+
+PERIOD = 0.02
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float):
+        self.now += delay
+
+def run(policy: str, stalls: dict, ticks: int) -> tuple:
+    """Missed total and the number of back to back ticks, with stalls[idx] periods of work before tick idx."""
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(1.0 / PERIOD, policy, clock=clock, sleep=clock.sleep)
+    stamps = []
+    for idx in range(ticks):
+        clock.now += stalls.get(idx, 0.0) * PERIOD
+        scheduler.wait()
+        stamps.append(clock.now)
+    burst = sum(b - a < PERIOD / 2 for a, b in zip(stamps, stamps[1:]))
+    return scheduler.missed, burst
+
+# name -> (policy, stalls, missed ticks)
+# A stall of 3.5 periods after tick 9 runs tick 10 2.5 periods late, 11 and 12 are missed.
+CASES = {
+    'skip, one 3.5 period stall'         : (FixedRateScheduler.SKIP, {10: 3.5}, 2),
+    'catch-up, one 3.5 period stall'     : (FixedRateScheduler.CATCH_UP, {10: 3.5}, 2),
+    # the second stall comes while 11 and 12 are caught up, 13..15 are new
+    'catch-up, stall during the catch-up': (FixedRateScheduler.CATCH_UP, {10: 3.5, 12: 2.5}, 5),
+    # more than max_catchup: skipped instead, still counted once
+    'catch-up, 8.5 period stall'         : (FixedRateScheduler.CATCH_UP, {10: 8.5}, 7),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="fixed rate scheduler benchmark")
+    parser.add_argument('--ticks', type=int, default=50, help='ticks per case')
+    args = parser.parse_args()
+
+    ok = True
+    print(f"fake clock, {PERIOD * 1e3:.0f} ms period, {args.ticks} ticks:")
+    for name, (policy, stalls, expected) in CASES.items():
+        missed, burst = run(policy, stalls, args.ticks)
+        print(f"  {name:<35}: missed {missed} (expected {expected}), {burst} back to back ticks")
+        ok = ok and missed == expected
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
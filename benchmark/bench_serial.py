@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: UmsSerial throughput and latency over a pty loopback
+'''
+
+import sys, os
+import asyncio
+import fcntl
+import io
+import struct
+import termios
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.protocol import Packet, FrameParser
+from ums_serial.ums_serial import UmsSerial, BITS_PER_BYTE
+from xbox_async_control import AsyncXboxControl
+from bench_watchdog import FakePad
+
+PERIOD = 0.02
+
+class LoopbackReader(threading.Thread):
+    """Read frames from the pty master and stamp their arrival time."""
+    def __init__(self, fd: int):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.fd = fd
+        self.arrivals = []
+        self.received = 0
+
+    def run(self):
+        pending = b''
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError:
+                return
+            now = time.perf_counter()
+            pending += data
+            while len(pending) >= Packet.SIZE:
+                start = pending.find(b'STX')
+                if start < 0:
+                    pending = b''
+                    break
+                if len(pending) - start < Packet.SIZE:
+                    pending = pending[start:]
+                    break
+                self.arrivals.append((pending[start + 14], now))
+                self.received += 1
+                pending = pending[start + Packet.SIZE:]
+
+def open_loopback(policy: str):
+    master, slave = os.openpty()
+    name = os.ttyname(slave)
+    ser = UmsSerial(name, 115200, 0.1, policy)
+    ser._serial.port = name
+    ser._serial.open()
+    return master, slave, ser
+
+def throughput(frames: int, policy: str) -> tuple:
+    master, slave, ser = open_loopback(policy)
+    reader = LoopbackReader(master)
+    reader.start()
+    packet = Packet()
+    start = time.perf_counter()
+    for i in range(frames):
+        packet.alive = i & 0xFF
+        ser.write(packet.encode('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL', 20000, 0, 100, 0))
+    elapsed = time.perf_counter() - start
+    time.sleep(0.2)
+    ser.disconnect()
+    os.close(master)
+    return frames / elapsed, ser.frames_replaced, reader.received
+
+def latency(frames: int) -> list:
+    master, slave, ser = open_loopback(UmsSerial.STALE_REPLACE)
+    reader = LoopbackReader(master)
+    reader.start()
+    packet = Packet()
+    sent = []
+    for i in range(frames):
+        packet.alive = i & 0xFF
+        sent.append(time.perf_counter())
+        ser.write(packet.encode('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL', 20000, 0, 100, 0))
+        time.sleep(0.002)
+    time.sleep(0.2)
+    ser.disconnect()
+    os.close(master)
+    return sorted(arrived - sent[i] for i, (_, arrived) in enumerate(reader.arrivals[:frames]))
+
+class SlowUart:
+    """The kernel TX queue of a UART at baudrate: a pipe the wire drains a byte at a time.
+
+    A pty hands bytes over at once and never has out_waiting, this one
+    does, and reset_output_buffer() throws away what was not shifted out.
+    """
+    def __init__(self, baudrate: int, queue_size=None):
+        self.read_fd, self.write_fd = os.pipe()
+        if queue_size is not None:
+            # a full queue makes writes partial, like O_NONBLOCK on the tty
+            fcntl.fcntl(self.write_fd, fcntl.F_SETPIPE_SZ, queue_size)
+            os.set_blocking(self.write_fd, False)
+        self.byte_time = BITS_PER_BYTE / baudrate
+        self.parser = FrameParser()
+        self.wire = bytearray()
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        threading.Thread(target=self._shift, daemon=True).start()
+
+    def isOpen(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self.write_fd
+
+    @property
+    def out_waiting(self) -> int:
+        return struct.unpack('i', fcntl.ioctl(self.read_fd, termios.FIONREAD, b'\0' * 4))[0]
+
+    def reset_output_buffer(self):
+        with self.lock:
+            waiting = self.out_waiting
+            if waiting:
+                os.read(self.read_fd, waiting)
+
+    def write(self, data):
+        os.write(self.write_fd, data)
+
+    def _shift(self):
+        start = time.perf_counter()
+        shifted = 0
+        while not self.done.is_set():
+            due = int((time.perf_counter() - start) / self.byte_time) - shifted
+            if due > 0:
+                with self.lock:
+                    waiting = self.out_waiting
+                    data = os.read(self.read_fd, min(due, waiting)) if waiting else b''
+                self.parser.feed(data)
+                self.wire += data
+                # an idle line does not bank time
+                shifted += due
+            time.sleep(self.byte_time / 2)
+
+def slow_line(seconds: float, baudrate=9600) -> dict:
+    """Replace policy at 50 Hz with some late ticks, on a line busy 94% of the time.
+
+    The queue is nearly always busy, a flush at the wrong moment would
+    cut the frame on the wire in two.
+    """
+    ser = UmsSerial('/dev/null', baudrate, 0.1, UmsSerial.STALE_REPLACE)
+    uart = ser._serial = SlowUart(baudrate)
+    packet = Packet()
+    deadline = time.perf_counter()
+    for i in range(int(seconds / PERIOD)):
+        packet.alive = i & 0xFF
+        ser.write(packet.encode('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL', 20000, 0, 100, 0))
+        deadline += PERIOD
+        # every fifth tick 3 ms late, the frame before is then still on the wire
+        time.sleep(max(deadline + (0.003 if i % 5 == 3 else 0) - time.perf_counter(), 0))
+    time.sleep(0.1)
+    uart.done.set()
+    parser = uart.parser
+    return {'replaced': ser.frames_replaced, 'frames': parser.frames,
+            'cut': parser.skipped_bytes + parser.checksum_errors}
+
+def async_backlog(seconds: float, baudrate=38400, rate=500.0) -> dict:
+    """AsyncXboxControl ticking faster than the line drains.
+
+    The queue fills, frames go out in parts from the writer callback and
+    the next one waits behind them. Every frame has to be counted and
+    teed the same way, whichever path wrote it.
+    """
+    xc = AsyncXboxControl('/dev/null', baudrate, 0.1, False, 0.05, rate=rate,
+                          stale_policy=UmsSerial.STALE_QUEUE, xbox=FakePad())
+    ser = xc.ums_ser
+    uart = ser._serial = SlowUart(baudrate, queue_size=4096)
+    tee = ser.tee = io.BytesIO()
+
+    async def drive():
+        xc._loop = asyncio.get_running_loop()
+        xc._transmit()
+        await asyncio.sleep(seconds)
+        xc._tx_handle.cancel()
+        while xc._tx_pending is not None:
+            await asyncio.sleep(0.01)
+    asyncio.run(drive())
+    while uart.out_waiting:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    uart.done.set()
+    return {'sent': xc.metrics.counters['frames_sent'], 'written': ser.frames_written,
+            'replaced': ser.frames_replaced, 'wire': uart.parser.frames,
+            'tee_matches': tee.getvalue() == bytes(uart.wire)}
+
+def main():
+    parser = argparse.ArgumentParser(description="serial link benchmark")
+    parser.add_argument('--frames', '-n', type=int, default=2000)
+    args = parser.parse_args()
+
+    print("wire time per frame (a pty does not emulate the baudrate):")
+    for baudrate in (9600, 19200, 38400, 57600, 115200):
+        ser = UmsSerial('/dev/null', baudrate, 0.1)
+        print("  " + ser.link_budget(Packet.SIZE, PERIOD))
+
+    for policy in (UmsSerial.STALE_QUEUE, UmsSerial.STALE_REPLACE):
+        rate, replaced, received = throughput(args.frames, policy)
+        print(f"write throughput ({policy:>7}): {rate:10.0f} frames/s, "
+              f"{replaced} replaced, {received} received")
+
+    lat = latency(min(args.frames, 500))
+    if lat:
+        p50 = lat[len(lat) // 2] * 1e6
+        p99 = lat[int(len(lat) * 0.99)] * 1e6
+        print(f"write -> read latency: p50 {p50:.0f} us, p99 {p99:.0f} us, max {lat[-1] * 1e6:.0f} us")
+
+    slow = slow_line(4.0)
+    print(f"9600 baud, replace   : {slow['frames']} whole frames, {slow['replaced']} replaced, "
+          f"{slow['cut']} bytes of cut frames")
+    backlog = async_backlog(2.0)
+    print(f"asyncio, full queue  : {backlog['sent']} sent, {backlog['replaced']} replaced while queued, "
+          f"{backlog['written']} written, {backlog['wire']} on the wire, tee matches: {backlog['tee_matches']}")
+    backlog_ok = (backlog['replaced'] and backlog['tee_matches'] and backlog['written'] == backlog['wire']
+                  and backlog['sent'] == backlog['written'] + backlog['replaced'])
+    if slow['cut'] or not slow['frames'] or not backlog_ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
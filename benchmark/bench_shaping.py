@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Axis shaping tables: exact match with the former math, and speed
+'''
+
+import sys, os
+import random
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Param
+from ums_xbox.shaping import AxisShape, Shaping, OFFSET, DOMAIN, _numpy, _compile
+from ums_xbox.xbox import Xbox
+
+class LegacySteer:
+    """The per event math of _on_steer, limit_steer_data and _on_accel before the tables."""
+    def __init__(self, deadzone: float):
+        self.deadzone = deadzone
+
+    def steer(self, value: int) -> tuple:
+        roun_down_steer_data = (value // 10) * 10
+        modified = self._dz_steer_data(roun_down_steer_data)
+        raw = value
+        if raw > Param.LIMIT_STEER_VAL: raw = Param.LIMIT_STEER_VAL
+        if raw < -Param.LIMIT_STEER_VAL: raw = -Param.LIMIT_STEER_VAL
+        return raw, modified
+
+    def _dz_steer_data(self, data: int) -> int:
+        unscaled_deadzone = int(32767 * self.deadzone)
+        if data > unscaled_deadzone:
+            data -= unscaled_deadzone
+        elif data < -unscaled_deadzone:
+            data += unscaled_deadzone
+        else:
+            data = 0
+        return data
+
+def check_exact(deadzones) -> int:
+    mismatches = 0
+    for deadzone in deadzones:
+        legacy = LegacySteer(deadzone)
+        shaping = Shaping.default(deadzone)
+        for value in DOMAIN:
+            raw, modified = legacy.steer(value)
+            if (shaping.steer_raw[value + OFFSET] != raw or shaping.steer[value + OFFSET] != modified
+                    or shaping.accel[value + OFFSET] != value + 32767
+                    or shaping.brake[value + OFFSET] != value + 32767):
+                mismatches += 1
+    return mismatches
+
+def check_curves() -> int:
+    """Compiled tables against AxisShape.shape for the stages the old code lacked."""
+    shapes = [
+        AxisShape(step=10, deadzone=0.1, expo=0.4, limit=(-30000, 30000)),
+        AxisShape(offset=32767, expo=0.7),
+        AxisShape(offset=32767, deadzone=0.02, limit=(0, 40000)),
+    ]
+    mismatches = 0
+    for shape in shapes:
+        table = shape.compile()
+        mismatches += sum(table[value + OFFSET] != shape.shape(value) for value in DOMAIN)
+        if table[0 + OFFSET] != shape.shape(0) or table[-1] != shape.shape(32767):
+            mismatches += 1
+    return mismatches
+
+def per_event(handler, values: list) -> float:
+    start = time.perf_counter()
+    for value in values:
+        handler(value)
+    return (time.perf_counter() - start) / len(values)
+
+def legacy_handler(xbox: Xbox):
+    legacy = LegacySteer(xbox.deadzone)
+    def on_steer(value):
+        xbox.pushed_steer = 'STEER'
+        xbox.steer_raw_data = value
+        roun_down_steer_data = (xbox.steer_raw_data // 10) * 10
+        xbox.steer_modified_data = legacy._dz_steer_data(roun_down_steer_data)
+    return on_steer
+
+def main():
+    parser = argparse.ArgumentParser(description="axis shaping benchmark")
+    parser.add_argument('--events', '-n', type=int, default=500000)
+    args = parser.parse_args()
+
+    mismatches = check_exact((0.0, 0.05, 0.1, 0.25))
+    print(f"default tables vs former math : {mismatches} mismatches over 4 x 65536 values")
+    curve_mismatches = check_curves()
+    print(f"expo/limit tables vs shape()  : {curve_mismatches} mismatches")
+
+    _compile.cache_clear()
+    start = time.perf_counter()
+    Shaping.default(0.07).compile()
+    print(f"compile 4 tables              : {(time.perf_counter() - start) * 1e3:.1f} ms "
+          f"({'numpy' if _numpy() is not None else 'pure Python, numpy not installed'})")
+
+    xbox = Xbox()
+    before = xbox.shaping.steer[20000 + OFFSET]
+    xbox.deadzone = 0.2
+    print(f"deadzone 0.05 -> 0.2          : steer(20000) {before} -> {xbox.shaping.steer[20000 + OFFSET]}")
+    xbox.deadzone = 0.05
+
+    rnd = random.Random(5)
+    values = [rnd.randint(-32767, 32767) for _ in range(args.events)]
+    legacy = per_event(legacy_handler(xbox), values)
+    table = per_event(xbox._on_steer, values)
+    print(f"steer event, former math      : {legacy * 1e9:.0f} ns")
+    print(f"steer event, tables           : {table * 1e9:.0f} ns ({legacy / table:.2f}x)")
+
+    if mismatches or curve_mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Offline accel/cruise simulator: batch vs Xbox logic, and ticks per second
+'''
+
+import sys, os
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.profile import Profile, DEFAULT_PROFILE
+from ums_xbox.ramp import RAMP_PERIOD
+from ums_xbox.simulate import (TRACES, INPUTS, np, inputs_from_records, synthetic_inputs,
+                               simulate, simulate_batch)
+from bench_suite import synthetic_log
+
+PROFILES = [
+    DEFAULT_PROFILE,
+    Profile('slow', max_accel=25000, thresh_accel=15000, increase=50, cruise=2500, steer_expo=0.3),
+    Profile('limited', deadzone=0.1, steer_rate=3000, decrease=400),
+]
+
+def stack(scenarios: list) -> dict:
+    return {channel: np.array([inputs[channel] for inputs in scenarios]) for channel in INPUTS}
+
+def mismatches(scenarios: list, profiles: list) -> int:
+    """Ticks where any trace of the batch differs from SimXbox, the real handlers."""
+    batch = simulate_batch(stack(scenarios), profiles)
+    bad = 0
+    for idx, (inputs, profile) in enumerate(zip(scenarios, profiles)):
+        reference = simulate(inputs, profile)
+        differs = np.zeros(len(inputs['button']), dtype=bool)
+        for name in TRACES:
+            differs |= np.array(reference[name]) != batch[name][idx]
+        bad += int(differs.sum())
+    return bad
+
+def main():
+    parser = argparse.ArgumentParser(description="accel simulator benchmark")
+    parser.add_argument('--seconds', type=float, default=60.0, help='length of each drive')
+    parser.add_argument('--scenarios', type=int, default=2048, help='drives in the batch run')
+    parser.add_argument('--check', type=int, default=24, help='drives checked against SimXbox')
+    args = parser.parse_args()
+    if np is None:
+        print("numpy is not installed, only simulate() is available")
+        sys.exit(1)
+
+    ticks = int(args.seconds / RAMP_PERIOD)
+    scenarios = [synthetic_inputs(ticks, seed) for seed in range(args.check)]
+    profiles = [PROFILES[idx % len(PROFILES)] for idx in range(args.check)]
+    bad = mismatches(scenarios, profiles)
+    print(f"synthetic drives vs SimXbox : {bad} mismatching ticks over {args.check} x {ticks}")
+    logged = inputs_from_records(synthetic_log(args.seconds))
+    bad_log = mismatches([logged] * len(PROFILES), PROFILES)
+    print(f"recorded log vs SimXbox     : {bad_log} mismatching ticks over {len(PROFILES)} profiles")
+
+    start = time.perf_counter()
+    simulate(scenarios[0])
+    scalar = ticks / (time.perf_counter() - start)
+    print(f"SimXbox, one drive          : {scalar:12.0f} ticks/s ({scalar * RAMP_PERIOD:.0f}x real time)")
+
+    many = stack([scenarios[idx % len(scenarios)] for idx in range(args.scenarios)])
+    sweep = [Profile(f'max{max_accel}', max_accel=max_accel)
+             for max_accel in range(30000, 50000, 20000 // args.scenarios or 1)][:args.scenarios]
+    sweep += [DEFAULT_PROFILE] * (args.scenarios - len(sweep))
+    start = time.perf_counter()
+    simulate_batch(many, sweep, traces=('accel',))
+    batch = args.scenarios * ticks / (time.perf_counter() - start)
+    print(f"batch, {args.scenarios} drives, sweep  : {batch:12.0f} ticks/s ({batch * RAMP_PERIOD:.0f}x real time)")
+
+    if bad or bad_log:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: One process vs --split: tail latency with a busy input side, and ESTOP after the input process dies
+'''
+
+import sys, os
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Joy
+from ums_xbox.protocol import Packet, FrameParser
+from ums_xbox.xbox import JS_EVENT
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from xbox_control import XboxControl
+from xbox_split_control import SplitXboxControl
+from bench_suite import synthetic_log, STEER
+
+class LoadedReplay(ReplayXbox):
+    """ReplayXbox that starts its player, next to a thread making GC pauses and slow prints."""
+    def __init__(self, records: list, sent, load: bool):
+        def on_event(raw):
+            _, value, type_, number = JS_EVENT.unpack(raw)
+            if type_ == Joy.JS_EVENT_AXIS and number == STEER:
+                sent.put((value, time.perf_counter()))
+        ReplayXbox.__init__(self, EventPlayer(records, realtime=True, on_event=on_event))
+        self.load = load
+
+    def start(self):
+        ReplayXbox.start(self)
+        if self.load:
+            # A large live heap makes every full collection long, the cycles trigger them.
+            heap = [[idx] for idx in range(300000)]
+            threading.Thread(target=churn, args=(heap,), daemon=True).start()
+        self.player.start()
+
+def churn(heap: list):
+    with open(os.devnull, 'w') as log:
+        while True:
+            garbage = [[idx] for idx in range(2000)]
+            garbage.append(garbage)
+            print(repr(heap[:200]), file=log)
+
+def replay_pad(records: list, sent, load: bool):
+    return LoadedReplay(records, sent, load)
+
+class WireTap(threading.Thread):
+    def __init__(self, fd: int):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.fd = fd
+        self.parser = FrameParser()
+        self.first_seen = {}
+        self.frames = []
+
+    def run(self):
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError:
+                return
+            now = time.perf_counter()
+            for frame in self.parser.feed(data):
+                self.frames.append((now, frame))
+                self.first_seen.setdefault(frame[6], now)
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    if not samples:
+        return "no samples"
+    return (f"p50 {samples[len(samples) // 2] * 1e3:6.2f} ms, p99 {samples[int(len(samples) * 0.99)] * 1e3:6.2f} ms, "
+            f"max {samples[-1] * 1e3:6.2f} ms")
+
+def is_failsafe(frame) -> bool:
+    return (frame[1] == Packet.ESTOP['ESTOP_ON'] and frame[2] == Packet.GEAR['GEAR_N']
+            and frame[4] == 0 and frame[6] == 0)
+
+def drive(split: bool, records: list, seconds: float, load: bool, kill=False) -> dict:
+    master, slave = os.openpty()
+    name = os.ttyname(slave)
+    sent = multiprocessing.get_context('forkserver').Queue()
+    if split:
+        xc = SplitXboxControl(name, 115200, 0.1, False, 0.05, input_factory=replay_pad,
+                              input_args=(records, sent, load))
+    else:
+        xc = XboxControl(name, 115200, 0.1, False, 0.05, xbox=replay_pad(records, sent, load))
+    tap = WireTap(master)
+    tap.start()
+    threading.Thread(target=xc.exec, daemon=True).start()
+    time.sleep(seconds)
+    result = {'jitter': xc.scheduler.jitter.summary()}
+
+    if kill:
+        killed = time.perf_counter()
+        os.kill(xc.xbox.process.pid, signal.SIGKILL)
+        time.sleep(xc.xbox.restart_delay + 1.0)
+        after = [(stamp, frame) for stamp, frame in tap.frames if stamp > killed]
+        estop = next((stamp for stamp, frame in after if is_failsafe(frame)), None)
+        result['estop_after'] = None if estop is None else estop - killed
+        result['driving_again'] = any(not is_failsafe(frame) for stamp, frame in after
+                                      if estop is not None and stamp > estop)
+    if split:
+        xc.xbox.stop()
+
+    first = {}
+    while True:
+        try:
+            value, stamp = sent.get_nowait()
+        except queue.Empty:
+            break
+        first.setdefault(value, stamp)
+    result['latency'] = [tap.first_seen[v] - t for v, t in first.items()
+                         if v in tap.first_seen and tap.first_seen[v] >= t]
+    # from the first frame with the pad connected, failsafe frames go at 2 Hz
+    driving = next((idx for idx, (stamp, frame) in enumerate(tap.frames) if not is_failsafe(frame)), 0)
+    stamps = [stamp for stamp, frame in tap.frames[driving:]]
+    result['gap'] = max((b - a for a, b in zip(stamps, stamps[1:])), default=0.0)
+    result['failsafe'] = sum(is_failsafe(frame) for stamp, frame in tap.frames[driving:])
+    return result
+
+def run(result, *args, **kwargs):
+    with open(os.devnull, 'w') as quiet:
+        sys.stdout = quiet
+        try:
+            result.put(drive(*args, **kwargs))
+        finally:
+            sys.stdout = sys.__stdout__
+
+def measure(*args, **kwargs) -> dict:
+    # A fresh process per drive, threads and load must not outlive it.
+    context = multiprocessing.get_context('forkserver')
+    result = context.Queue()
+    child = context.Process(target=run, args=(result,) + args, kwargs=kwargs)
+    child.start()
+    stats = result.get(timeout=120)
+    child.join()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="split process benchmark")
+    parser.add_argument('--seconds', type=float, default=5.0, help='length of each drive')
+    args = parser.parse_args()
+    records = synthetic_log(args.seconds + 2)
+
+    ok = True
+    results = {}
+    for load in (False, True):
+        for split in (False, True):
+            results[load, split] = measure(split, records, args.seconds, load)
+    crash = measure(True, records, 2.0, False, kill=True)
+
+    for (load, split), result in results.items():
+        name = f"{'split' if split else 'single'}{', input load' if load else ''}"
+        jitter = result['jitter']
+        print(f"{name:<19}: input -> wire {percentiles(result['latency'])}")
+        print(f"{'':<19}  tick jitter p99 {jitter['p99_ms']:6.2f} ms, max {jitter['max_ms']:6.2f} ms, "
+              f"longest wire gap {result['gap'] * 1e3:6.1f} ms, {result['failsafe']} failsafe frames")
+        ok = ok and bool(result['latency'])
+
+    estop = crash['estop_after']
+    bound = 0.1 + 0.02
+    print(f"input process killed: ESTOP frame after "
+          f"{'never' if estop is None else f'{estop * 1e3:.1f} ms'} (bound {bound * 1e3:.0f} ms), "
+          f"driving again after restart: {crash['driving_again']}")
+    ok = ok and estop is not None and estop <= bound + 0.05 and crash['driving_again']
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
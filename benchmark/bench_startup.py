@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Startup import time of joystick_control with a regression budget
+'''
+
+import sys, os
+import subprocess
+import tempfile
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+SCRIPT = os.path.join(dir_path, 'script', 'joystick_control')
+
+def parse_import_times(stderr: str) -> list:
+    """(cumulative_us, module) of each -X importtime line."""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times.append((int(cumulative), name.rstrip()[1:]))
+    return times
+
+def import_times(args: list) -> list:
+    """Run the script under -X importtime and return (cumulative_us, module)."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', SCRIPT] + args,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          universal_newlines=True)
+    return parse_import_times(proc.stderr)
+
+def control_loop_startup(timeout=30.0) -> tuple:
+    """Start the script in test mode, stop it once the control loop prints its link budget.
+
+    Returns the seconds that took and the import times up to there.
+    """
+    with tempfile.TemporaryFile('w+') as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-u', '-X', 'importtime', SCRIPT, '--test'],
+                                stdout=subprocess.PIPE, stderr=stderr, universal_newlines=True)
+        elapsed = None
+        try:
+            for line in proc.stdout:
+                # the reader thread prints too, its text can land in front on the same line
+                if 'link budget:' in line:
+                    elapsed = time.perf_counter() - start
+                    break
+                if time.perf_counter() - start > timeout:
+                    break
+        finally:
+            proc.kill()
+            proc.wait()
+        stderr.seek(0)
+        return elapsed, parse_import_times(stderr.read())
+
+def report(name: str, times: list, top: int) -> float:
+    top_level = [(us, module) for us, module in times if not module.startswith(' ')]
+    total_ms = sum(us for us, _ in top_level) / 1e3
+    print(f"{name}: top level imports {total_ms:.1f} ms")
+    for us, module in sorted(top_level, reverse=True)[:top]:
+        print(f"{us / 1e3:8.1f} ms  {module}")
+    return total_ms
+
+def main():
+    parser = argparse.ArgumentParser(description="joystick_control startup benchmark")
+    parser.add_argument('--budget-ms', type=float, default=300.0,
+                        help='fail when the top level imports take longer')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"budget {args.budget_ms:.1f} ms of top level imports per path")
+    ok = report('--version', import_times(['--version']), args.top) <= args.budget_ms
+
+    elapsed, times = control_loop_startup()
+    ok = report('start up to the control loop', times, args.top) <= args.budget_ms and ok
+    if elapsed is None:
+        print("the control loop never started")
+        ok = False
+    else:
+        print(f"start up to the control loop: {elapsed * 1e3:.1f} ms wall")
+    # Only --version may ask git, and only without src/_joystick_version.py.
+    if 'git' in (name.strip() for _, name in times):
+        print("git was looked up on the way to the control loop")
+        ok = False
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Stress the Xbox -> XboxControl hand over and count torn frames
+'''
+
+import sys, os
+import random
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import *
+from ums_xbox.xbox import Xbox
+from ums_xbox.shaping import OFFSET
+
+AXIS_MAP = ['unknown(0x00)', 'unknown(0x01)', 'z', 'rx', 'ry', 'rz', 'hat0x', 'hat0y']
+
+def make_xbox() -> Xbox:
+    xbox = Xbox()
+    xbox.axis = AXIS_MAP
+    xbox.buttons = []
+    xbox._axis_table = xbox._build_axis_table(AXIS_MAP)
+    xbox._button_table = []
+    return xbox
+
+def writer(xbox: Xbox, stop: threading.Event):
+    """Batches that change steer, ESTOP, gear and accel together.
+
+    Odd batches stop the car: ESTOP on in neutral, _publish holds the
+    accel at 0. Even batches drive: ESTOP off in D with an accel above 0.
+    """
+    rnd = random.Random(7)
+    generation = 0
+    while not stop.is_set():
+        generation += 1
+        with xbox._state_lock:
+            xbox._process_event(Joy.JS_EVENT_AXIS, 3, rnd.randint(-32000, 32000))
+            if generation & 1:
+                xbox.pushed_estop = 'ESTOP_ON'
+                xbox.gear_data = 'GEAR_N'
+            else:
+                xbox.pushed_estop = 'ESTOP_OFF'
+                xbox.gear_data = 'GEAR_D'
+                xbox.current_accel_data = xbox.profile.aps_init + generation % 1000 * 10
+            xbox._publish()
+
+def consistent(xbox: Xbox, estop: str, gear: str, accel: int, raw: int, modified: int) -> bool:
+    return ((estop == 'ESTOP_ON') == (gear == 'GEAR_N') == (accel == 0)
+            and modified == xbox.shaping.steer[raw + OFFSET])
+
+def read_attributes(xbox: Xbox) -> tuple:
+    # What _send_xbox_data used to do: one attribute at a time, in its order.
+    accel = xbox.current_accel_data
+    raw = xbox.steer_raw_data
+    modified = xbox.steer_modified_data
+    return xbox.pushed_estop, xbox.gear_data, accel, raw, modified
+
+def read_snapshot(xbox: Xbox) -> tuple:
+    state = xbox.state
+    return state.estop, state.gear, state.accel, state.steer_raw, state.steer_modified
+
+def run(reader, duration: float) -> tuple:
+    xbox = make_xbox()
+    stop = threading.Event()
+    thread = threading.Thread(target=writer, args=(xbox, stop), daemon=True)
+    thread.start()
+    frames = torn = 0
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        frames += 1
+        if not consistent(xbox, *reader(xbox)):
+            torn += 1
+    stop.set()
+    thread.join()
+    return frames, torn
+
+def main():
+    parser = argparse.ArgumentParser(description="torn frame stress test")
+    parser.add_argument('--duration', '-d', type=float, default=3.0)
+    args = parser.parse_args()
+
+    # Switch threads as often as possible to provoke interleaving.
+    sys.setswitchinterval(1e-6)
+    for name, reader in (('attributes', read_attributes), ('snapshot', read_snapshot)):
+        frames, torn = run(reader, args.duration)
+        print(f"{name:<12}{frames:10d} frames {torn:8d} torn")
+        # the attribute path must show the problem, or the test proves nothing
+        if (reader is read_snapshot) == bool(torn):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Deterministic replay benchmark suite for the control loop
+'''
+
+import sys, os
+import random
+import threading
+import time
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.names import Joy
+from ums_xbox.protocol import Packet
+from ums_xbox.xbox import JS_EVENT
+from ums_xbox.replay import EventPlayer, ReplayXbox, read_log, XBOX_BUTTON_MAP
+from xbox_control import XboxControl
+
+STEER = 3
+
+def synthetic_log(seconds: float, rate=250, seed=2021) -> list:
+    """A drive: gear D, trigger ramps, steering sweeps and a few buttons."""
+    rnd = random.Random(seed)
+    records = [(0, JS_EVENT.pack(0, -32767, Joy.JS_EVENT_AXIS, 7))]
+    for i in range(1, int(seconds * rate)):
+        offset = int(i * 1e9 / rate)
+        r = rnd.random()
+        if r < 0.6:
+            event = JS_EVENT.pack(i, rnd.randint(-32000, 32000), Joy.JS_EVENT_AXIS, STEER)
+        elif r < 0.95:
+            event = JS_EVENT.pack(i, rnd.randint(-32767, 32767), Joy.JS_EVENT_AXIS, 2)
+        else:
+            event = JS_EVENT.pack(i, rnd.randint(0, 1), Joy.JS_EVENT_BUTTON,
+                                  rnd.randrange(len(XBOX_BUTTON_MAP)))
+        records.append((offset, event))
+    return records
+
+def events_per_second(records: list) -> float:
+    """Decode and apply the whole log through the real reader, max speed."""
+    player = EventPlayer(records, realtime=False)
+    xbox = ReplayXbox(player)
+    xbox._try_open()
+    xbox._setup()
+    player.start()
+    start = time.perf_counter()
+    while xbox._read_events():
+        pass
+    return len(records) / (time.perf_counter() - start)
+
+class WireReader(threading.Thread):
+    """Read frames from the pty master and note when each steer value shows up."""
+    def __init__(self, fd: int):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.fd = fd
+        self.frames = 0
+        self.first_seen = {}
+
+    def run(self):
+        pending = b''
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError:
+                return
+            now = time.perf_counter()
+            pending += data
+            while True:
+                start = pending.find(b'STX')
+                if start < 0 or len(pending) - start < Packet.SIZE:
+                    break
+                frame = pending[start:start + Packet.SIZE]
+                pending = pending[start + Packet.SIZE:]
+                self.frames += 1
+                steer = int.from_bytes(frame[10:12], 'little', signed=True)
+                self.first_seen.setdefault(steer, now)
+
+def control_loop(records: list, rate: float) -> dict:
+    """Replay in real time through XboxControl into a pty loopback."""
+    master, slave = os.openpty()
+    name = os.ttyname(slave)
+
+    sent = {}
+    def on_event(raw):
+        _, value, type_, number = JS_EVENT.unpack(raw)
+        if type_ == Joy.JS_EVENT_AXIS and number == STEER:
+            sent.setdefault(value, time.perf_counter())
+
+    player = EventPlayer(records, realtime=True, on_event=on_event)
+    xc = XboxControl(name, 115200, 0.1, False, 0.05, rate=rate, xbox=ReplayXbox(player))
+    xc.ums_ser._serial.port = name
+    reader = WireReader(master)
+    reader.start()
+
+    thread = threading.Thread(target=xc.exec, daemon=True)
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    thread.start()
+    player.start()
+    player.join()
+    time.sleep(0.1)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    # Coalescing and the tick mean not every value reaches the wire.
+    latencies = sorted(reader.first_seen[v] - t for v, t in sent.items()
+                       if v in reader.first_seen and reader.first_seen[v] >= t)
+    return {
+        'frames_per_s': reader.frames / wall,
+        'cpu_per_frame_us': cpu / max(reader.frames, 1) * 1e6,
+        'latency': latencies,
+        'jitter': xc.scheduler.jitter.summary(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="replay benchmark suite")
+    parser.add_argument('--log', help='event log recorded with joystick_control --record')
+    parser.add_argument('--seconds', type=float, default=5.0, help='length of the synthetic log')
+    parser.add_argument('--rate', type=float, default=50.0, help='transmit rate in Hz')
+    args = parser.parse_args()
+
+    records = read_log(args.log) if args.log else synthetic_log(args.seconds)
+    print(f"events in log        : {len(records)}")
+    print(f"events/s (max speed) : {events_per_second(records):.0f}")
+
+    result = control_loop(records, args.rate)
+    latency = result['latency']
+    print(f"frames/s on the wire : {result['frames_per_s']:.1f}")
+    print(f"CPU per frame        : {result['cpu_per_frame_us']:.0f} us")
+    if latency:
+        print("input -> wire latency: p50 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms ({} samples)".format(
+            latency[len(latency) // 2] * 1e3, latency[int(len(latency) * 0.99)] * 1e3,
+            latency[-1] * 1e3, len(latency)))
+    jitter = result['jitter']
+    print("tick jitter          : p50 {p50_ms:.2f} ms, p99 {p99_ms:.2f} ms, max {max_ms:.2f} ms".format(**jitter))
+
+if __name__ == '__main__':
+    main()
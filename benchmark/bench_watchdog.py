@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Watchdog: worst case fault to ESTOP on a fake clock, injected hangs, and the cost per tick
+'''
+
+import sys, os
+import fcntl
+import multiprocessing
+import struct
+import termios
+import threading
+import time
+import timeit
+import types
+import argparse
+
+dir_path = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.join(dir_path, 'src'))
+from ums_xbox.protocol import Packet
+from ums_xbox.state import ControlState
+from ums_xbox.xbox import Xbox
+from ums_xbox import ramp
+from ums_xbox.ramp import RAMP_PERIOD
+from ums_xbox.replay import EventPlayer, ReplayXbox
+from ums_serial.ums_serial import UmsSerial
+from xbox_control import XboxControl
+from xbox_split_control import SplitXboxControl
+from bench_suite import synthetic_log
+from bench_split import WireTap, is_failsafe
+
+DEADLINES = {'input': 0.5, 'ramp': 0.2, 'write': 0.2}
+MS = 1000000
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+class FakePad:
+    """What XboxControl reads from a pad, with stamps the sweep sets by hand."""
+    def __init__(self):
+        self.input_ns = 0
+        self.ramp_ns = 0
+        self.is_connect = True
+        self.metrics = None
+        self.state = ControlState('ESTOP_OFF', 'GEAR_D', 'WHEEL_ALL', 100 << 8, 0, 50, 50, 1)
+
+def fake_control(clock, **kwargs) -> XboxControl:
+    xc = XboxControl('/dev/null', 115200, 0.1, True, 0.05, xbox=FakePad(), deadlines=DEADLINES, **kwargs)
+    xc.watchdog._clock = clock
+    return xc
+
+def sweep(source: str, period_ns: int, stamp_ns: int, steps: int) -> tuple:
+    """Worst and best fault to ESTOP over fault phases spread across one tick.
+
+    The source stamps every stamp_ns until the fault, the others keep
+    stamping every tick. A tick only sees stamps made before it.
+    """
+    deadline_ns = int(DEADLINES[source] * 1e9)
+    worst, best = 0, None
+    for step in range(steps):
+        clock = FakeClock()
+        xc = fake_control(clock)
+        pad = xc.xbox
+        fault = 10 * deadline_ns + step * period_ns // steps
+        tick = 0
+        while True:
+            clock.now = tick
+            # every source is alive up to the tick, the faulty one only up to the fault
+            last = min(tick, fault) // stamp_ns * stamp_ns
+            stamps = {'input': tick, 'ramp': tick, 'write': tick - period_ns if tick else 0}
+            stamps[source] = last if source != 'write' else min(tick - period_ns, last)
+            pad.input_ns, pad.ramp_ns, xc._written_ns = (stamps['input'] or 1, stamps['ramp'] or 1,
+                                                         stamps['write'] or 1)
+            before = xc.metrics.counters['watchdog_frames']
+            frame = xc._make_xbox_packet()
+            if xc.metrics.counters['watchdog_frames'] != before:
+                if tick < fault:
+                    return None, None
+                if frame[Packet.FIELDS_OFFSET] != Packet.ESTOP['ESTOP_ON'] or xc.watchdog.tripped != source:
+                    return None, None
+                delay = tick - fault
+                worst = max(worst, delay)
+                best = delay if best is None else min(best, delay)
+                break
+            tick += period_ns
+    return worst, best
+
+def healthy(seconds: float, period_ns: int) -> int:
+    """Trips with every source stamping at its slowest healthy rate and jittered ticks."""
+    clock = FakeClock()
+    xc = fake_control(clock)
+    pad = xc.xbox
+    poll_ns = int(Xbox.INPUT_POLL * 1e9)
+    ramp_ns = int(RAMP_PERIOD * 1e9)
+    tick = 0
+    for idx in range(int(seconds * 1e9 / period_ns)):
+        # a tick late by up to half a period, the next one on time again
+        clock.now = tick + (period_ns // 2 if idx % 7 == 3 else 0)
+        pad.input_ns = max(clock.now // poll_ns * poll_ns, 1)
+        pad.ramp_ns = max(clock.now // ramp_ns * ramp_ns, 1)
+        xc._make_xbox_packet()
+        xc._written_ns = clock.now
+        tick += period_ns
+    return xc.watchdog.trips
+
+def delta_quiet(seconds: float, period: float, heartbeat: float) -> tuple:
+    """Trips on an unchanged state with --delta, the line silent for longer than the write deadline."""
+    xc = fake_control(time.monotonic_ns, delta=True, keepalive=max(1.0, heartbeat), heartbeat=heartbeat)
+    pad = xc.xbox
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pad.input_ns = pad.ramp_ns = time.monotonic_ns()
+        # what _write stamps, only for a frame that went out
+        if xc._make_xbox_packet() is not None:
+            xc._written_ns = time.monotonic_ns()
+        time.sleep(period)
+    return xc.watchdog.trips, xc.metrics.counters['frames_suppressed']
+
+class StalledPort:
+    """The pyserial port of a UmsSerial with a full TX queue that does not drain for hang seconds.
+
+    Like a UART held by flow control: writes go to a full pipe, a flush
+    empties it, and nothing reaches the line until the stall ends and the
+    real port is back.
+    """
+    def __init__(self, ser: UmsSerial, hang: float):
+        self.ser = ser
+        self.port = ser._serial
+        self.until = time.perf_counter() + hang
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.write_fd, False)
+        try:
+            while True:
+                os.write(self.write_fd, bytes(4096))
+        except BlockingIOError:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self.port, name)
+
+    def fileno(self) -> int:
+        if time.perf_counter() >= self.until:
+            self.ser._serial = self.port
+            return self.port.fileno()
+        return self.write_fd
+
+    def write(self, data):
+        # pyserial's blocking write waits for the queue to drain
+        time.sleep(max(self.until - time.perf_counter(), 0))
+        return self.port.write(data)
+
+    @property
+    def out_waiting(self) -> int:
+        return struct.unpack('i', fcntl.ioctl(self.read_fd, termios.FIONREAD, b'\0' * 4))[0]
+
+    def reset_output_buffer(self):
+        waiting = self.out_waiting
+        if waiting:
+            os.read(self.read_fd, waiting)
+
+class Injected:
+    """Hang the reader or the ramp, or stall the serial port, at a given moment."""
+    def __init__(self, kind: str, hang: float, xbox, ser=None):
+        self.kind = kind
+        self.hang = hang
+        self.armed = threading.Event()
+        self.fault = None
+        # when the port took the first whole ESTOP frame after the fault
+        self.accepted = None
+        if kind == 'input':
+            xbox._drain_events = self._wrap(xbox._drain_events)
+        elif kind == 'ramp':
+            # between two steps, outside the state lock, while the ramp moves
+            ramp.time = types.SimpleNamespace(monotonic=time.monotonic, monotonic_ns=time.monotonic_ns,
+                                              sleep=self._wrap(time.sleep, xbox._ramp))
+        else:
+            ser.write = self._stall(ser)
+
+    def _wrap(self, call, thread=None):
+        def wrapped(*args, **kwargs):
+            if (self.armed.is_set() and self.fault is None
+                    and (thread is None or threading.current_thread() is thread)):
+                self.fault = time.perf_counter()
+                time.sleep(self.hang)
+            return call(*args, **kwargs)
+        return wrapped
+
+    def _stall(self, ser: UmsSerial):
+        write = ser.write
+        def wrapped(data, *args):
+            if self.armed.is_set() and self.fault is None:
+                self.fault = time.perf_counter()
+                ser._serial = StalledPort(ser, self.hang)
+            cut = ser.frames_cut
+            write(data, *args)
+            if (self.fault is not None and self.accepted is None and ser.frames_cut == cut
+                    and data[Packet.FIELDS_OFFSET] == Packet.ESTOP['ESTOP_ON']):
+                self.accepted = time.perf_counter()
+        return wrapped
+
+def inject(kind: str, settle: float, hang: float) -> dict:
+    master, slave = os.openpty()
+    player = EventPlayer(synthetic_log(settle + hang + 2), realtime=True)
+    # queued frames, so a full queue holds the write instead of being flushed
+    xc = XboxControl(os.ttyname(slave), 115200, 0.1, False, 0.05, xbox=ReplayXbox(player),
+                     deadlines=DEADLINES, stale_policy=UmsSerial.STALE_QUEUE)
+    injected = Injected(kind, hang, xc.xbox, xc.ums_ser)
+    tap = WireTap(master)
+    tap.start()
+    threading.Thread(target=xc.exec, daemon=True).start()
+    player.start()
+    time.sleep(settle)
+    trips = xc.watchdog.trips
+    injected.armed.set()
+    time.sleep(hang + 1.0)
+    ramp.time = time
+
+    fault = injected.fault
+    after = [(stamp, frame) for stamp, frame in tap.frames if fault is not None and stamp > fault]
+    estop = next((stamp for stamp, frame in after if is_failsafe(frame)), None)
+    if kind == 'write':
+        # nothing reaches the line during the stall, the ESTOP has to be first in the queue
+        estop = injected.accepted
+    return {
+        'false_trips': trips,
+        'tripped': fault is not None and estop is not None,
+        'estop_after': None if estop is None else estop - fault,
+        'driving_again': any(not is_failsafe(frame) for stamp, frame in after
+                             if estop is not None and stamp > fault + hang),
+        'watchdog_frames': xc.metrics.counters['watchdog_frames'],
+    }
+
+class HangingReplay(ReplayXbox):
+    """ReplayXbox for the input process of --split: hangs its reader or ramp after settle seconds."""
+    def __init__(self, records: list, kind: str, settle: float, hang: float, faults):
+        ReplayXbox.__init__(self, EventPlayer(records, realtime=True))
+        self.injected = Injected(kind, hang, self)
+        self.settle = settle
+        self.faults = faults
+
+    def start(self):
+        ReplayXbox.start(self)
+        self.player.start()
+        threading.Thread(target=self._arm, daemon=True).start()
+
+    def _arm(self):
+        time.sleep(self.settle)
+        self.injected.armed.set()
+        while self.injected.fault is None:
+            time.sleep(0.001)
+        # perf_counter is CLOCK_MONOTONIC, the same clock in both processes
+        self.faults.put(self.injected.fault)
+
+def hanging_pad(records: list, kind: str, settle: float, hang: float, faults):
+    sys.stdout = open(os.devnull, 'w')
+    return HangingReplay(records, kind, settle, hang, faults)
+
+def inject_split(result, kind: str, settle: float, hang: float):
+    """inject() with --split, the hang inside the input process. Runs in a fresh process."""
+    master, slave = os.openpty()
+    faults = multiprocessing.get_context('forkserver').Queue()
+    xc = SplitXboxControl(os.ttyname(slave), 115200, 0.1, False, 0.05, input_factory=hanging_pad,
+                          input_args=(synthetic_log(settle + hang + 2), kind, settle, hang, faults),
+                          deadlines=DEADLINES)
+    tap = WireTap(master)
+    tap.start()
+    sys.stdout = open(os.devnull, 'w')
+    threading.Thread(target=xc.exec, daemon=True).start()
+    try:
+        fault = faults.get(timeout=settle + hang + 10)
+    except Exception:
+        fault = None
+    time.sleep(hang + 1.0)
+    xc.xbox.stop()
+
+    frames = list(tap.frames)
+    driving = next((stamp for stamp, frame in frames if not is_failsafe(frame)), None)
+    after = [(stamp, frame) for stamp, frame in frames if fault is not None and stamp > fault]
+    estop = next((stamp for stamp, frame in after if is_failsafe(frame)), None)
+    result.put({
+        'false_trips': sum(is_failsafe(frame) for stamp, frame in frames
+                           if driving is not None and fault is not None and driving < stamp < fault),
+        'tripped': fault is not None and estop is not None,
+        'estop_after': None if estop is None else estop - fault,
+        'driving_again': any(not is_failsafe(frame) for stamp, frame in after
+                             if estop is not None and stamp > fault + hang),
+        'watchdog_frames': xc.metrics.counters['watchdog_frames'],
+    })
+
+def measure_split(kind: str, settle: float, hang: float) -> dict:
+    context = multiprocessing.get_context('forkserver')
+    result = context.Queue()
+    child = context.Process(target=inject_split, args=(result, kind, settle, hang))
+    child.start()
+    stats = result.get(timeout=settle + hang + 60)
+    child.join(1.0)
+    return stats
+
+def check_cost(number: int) -> tuple:
+    xc = fake_control(time.monotonic_ns)
+    now = time.monotonic_ns()
+    xc.xbox.input_ns = xc.xbox.ramp_ns = xc._written_ns = now
+    check = timeit.timeit(xc.watchdog.check, number=number) / number
+    with_dog = timeit.timeit(xc._make_xbox_packet, number=number) / number
+    xc.watchdog = None
+    without = timeit.timeit(xc._make_xbox_packet, number=number) / number
+    return check, with_dog, without
+
+def main():
+    parser = argparse.ArgumentParser(description="watchdog benchmark")
+    parser.add_argument('--steps', type=int, default=50, help='fault phases per tick in the sweep')
+    parser.add_argument('--hang', type=float, default=1.0, help='length of each injected hang')
+    parser.add_argument('--number', type=int, default=200000, help='calls timed for the cost')
+    args = parser.parse_args()
+    ok = True
+
+    period_ns = 20 * MS
+    stamp_periods = {'input': int(Xbox.INPUT_POLL * 1e9), 'ramp': int(RAMP_PERIOD * 1e9), 'write': period_ns}
+    print(f"fake clock, {period_ns // MS} ms ticks, fault phase swept over {args.steps} points of a tick:")
+    for source, stamp_ns in stamp_periods.items():
+        worst, best = sweep(source, period_ns, stamp_ns, args.steps)
+        bound = int(DEADLINES[source] * 1e9) + period_ns
+        if worst is None:
+            print(f"  {source:<5}: tripped before the fault or on the wrong source")
+            ok = False
+            continue
+        print(f"  {source:<5}: fault -> ESTOP {best / MS:6.1f} .. {worst / MS:6.1f} ms "
+              f"(bound deadline + tick {bound / MS:.0f} ms)")
+        ok = ok and worst <= bound
+    trips = healthy(60.0, period_ns)
+    print(f"  healthy, 60 s with late ticks: {trips} trips")
+    ok = ok and trips == 0
+    heartbeat = 2 * DEADLINES['write']
+    trips, suppressed = delta_quiet(3 * heartbeat, period_ns / 1e9, heartbeat)
+    print(f"  --delta, heartbeat {heartbeat:.1f} s > write deadline: {trips} trips, "
+          f"{suppressed} ticks held back")
+    ok = ok and trips == 0 and suppressed > 0
+
+    print(f"injected into a live drive, {args.hang:.1f} s hangs:")
+    with open(os.devnull, 'w') as quiet:
+        results = {}
+        for kind in DEADLINES:
+            sys.stdout = quiet
+            try:
+                results[kind] = inject(kind, 1.0, args.hang)
+            finally:
+                sys.stdout = sys.__stdout__
+    for kind in ('input', 'ramp'):
+        results['split ' + kind] = measure_split(kind, 1.0, args.hang)
+    for name, result in results.items():
+        kind = name.split()[-1]
+        estop = result['estop_after']
+        # one tick plus scheduling slack on a loaded machine
+        bound = DEADLINES[kind] + 0.02 + 0.05
+        print(f"  {name:<11}: ESTOP {'queued ' if kind == 'write' else ''}after {'never' if estop is None else f'{estop * 1e3:.1f} ms'} "
+              f"(bound {bound * 1e3:.0f} ms), {result['watchdog_frames']} watchdog frames, "
+              f"driving again: {result['driving_again']}, false trips before: {result['false_trips']}")
+        ok = ok and result['tripped'] and estop <= bound and result['driving_again'] \
+            and result['false_trips'] == 0
+
+    check, with_dog, without = check_cost(args.number)
+    print(f"check(): {check * 1e9:.0f} ns, tick packet {without * 1e9:.0f} ns -> {with_dog * 1e9:.0f} ns "
+          f"with the watchdog")
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ import sys
 from shutil import rmtree
 
 from setuptools import find_packages, setup, Command
+from setuptools.command.build_py import build_py
 
 # Package meta-data.
 NAME = 'joystick-serial'
@@ -55,6 +56,24 @@ else:
     about['__version__'] = VERSION
 
 
+def write_version_module():
+    """Resolve the git tag once at build time into src/_joystick_version.py."""
+    sys.path.insert(0, os.path.join(here, 'src'))
+    from version import git_tag_version
+    version = git_tag_version(here) or about['__version__']
+    with io.open(os.path.join(here, 'src', '_joystick_version.py'), 'w', encoding='utf-8') as f:
+        f.write('# Generated by setup.py, do not edit.\n')
+        f.write('VERSION = {0!r}\n'.format(version))
+
+
+class BuildPyCommand(build_py):
+    """Generate src/_joystick_version.py before building."""
+
+    def run(self):
+        write_version_module()
+        build_py.run(self)
+
+
 class UploadCommand(Command):
     """Support setup.py upload."""
 
@@ -126,6 +145,7 @@ setup(
     ],
     # $ setup.py publish support.
     cmdclass={
+        'build_py': BuildPyCommand,
         'upload': UploadCommand,
     },
 )
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Wait for device nodes with inotify instead of polling
+'''
+
+import ctypes, ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_ATTRIB   = 0x00000004
+IN_MOVED_TO = 0x00000080
+IN_CREATE   = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC  = 0o2000000
+
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name
+INOTIFY_EVENT = struct.Struct("iIII")
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+_libc = _load_libc()
+
+class DeviceWatcher:
+    """Sleep until a node in directory is created or changes.
+
+    udev creates a node and then fixes its permissions, so IN_ATTRIB counts
+    as well. Without inotify (or without the directory) it falls back to
+    sleeping poll_interval.
+    """
+    EVENTS = IN_CREATE | IN_ATTRIB | IN_MOVED_TO
+
+    def __init__(self, directory: str, poll_interval=2.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._fd = None
+        if _libc is None:
+            return
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        if _libc.inotify_add_watch(fd, os.fsencode(directory), self.EVENTS) < 0:
+            print(f"inotify on {directory}: {os.strerror(ctypes.get_errno())}, polling instead")
+            os.close(fd)
+            return
+        self._fd = fd
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    @property
+    def available(self) -> bool:
+        return self._fd is not None
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> set:
+        """Names that had an event since the last read, without waiting."""
+        names = set()
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return names
+            pos = 0
+            while pos < len(data):
+                _, _, _, size = INOTIFY_EVENT.unpack_from(data, pos)
+                pos += INOTIFY_EVENT.size
+                names.add(os.fsdecode(data[pos:pos + size].rstrip(b'\x00')))
+                pos += size
+
+    def retry_after(self, name: str):
+        """How long to wait for name: forever while it does not exist.
+
+        A node that exists but could not be opened (busy, wrong device) may
+        never get an event, so that is retried after poll_interval.
+        """
+        if os.path.exists(os.path.join(self.directory, name)):
+            return self.poll_interval
+        return None
+
+    def wait(self, name: str, timeout=None) -> bool:
+        """Wait for an event on name, True if there was one."""
+        if self._fd is None:
+            time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                ready = poller.poll(None if remaining is None else remaining * 1e3)
+            except InterruptedError:
+                continue
+            if not ready:
+                return False
+            if name in self.read():
+                return True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Counters, sample rings and a local stats endpoint for the control loop
+'''
+
+import array
+import json
+import os
+import socket
+import threading
+import time
+
+class SampleRing:
+    """The last size samples and their monotonic ns stamps.
+
+    Both arrays are allocated once, add() only stores two ints.
+    """
+    def __init__(self, size=1024):
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f"ring size must be a power of two, got {size}")
+        self.size = size
+        self.values = array.array('q', bytes(8 * size))
+        self.stamps = array.array('q', bytes(8 * size))
+        self.count = 0
+        self._mask = size - 1
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def add(self, value: int, stamp: int):
+        idx = self.count & self._mask
+        self.values[idx] = value
+        self.stamps[idx] = stamp
+        self.count += 1
+
+    def window(self) -> list:
+        """Samples still in the ring, oldest first."""
+        count = self.count
+        if count <= self.size:
+            return self.values[:count].tolist()
+        idx = count & self._mask
+        return self.values[idx:].tolist() + self.values[:idx].tolist()
+
+    def summary(self) -> dict:
+        samples = sorted(self.window())
+        if not samples:
+            return {'count': self.count, 'p50_us': 0.0, 'p99_us': 0.0, 'max_us': 0.0}
+        return {
+            'count': self.count,
+            'p50_us': samples[len(samples) // 2] / 1e3,
+            'p99_us': samples[int(len(samples) * 0.99)] / 1e3,
+            'max_us': samples[-1] / 1e3,
+        }
+
+class Metrics:
+    """Hot path telemetry shared by Xbox and XboxControl.
+
+    Counters are plain ints in a dict, timings go into SampleRings in ns.
+    A link ('xbox' or 'serial') counts as down until link_up() is called,
+    other links (one per pad of a ControllerGroup) are added when first seen.
+    """
+    COUNTERS = ('events_read', 'events_coalesced', 'events_dropped',
+                'frames_sent', 'failsafe_frames', 'write_errors',
+                'heartbeats_sent', 'frames_suppressed', 'watchdog_frames',
+                'xbox_reconnects', 'serial_reconnects',
+                'feedback_frames', 'feedback_errors')
+    RINGS = ('event_to_frame', 'tick_jitter', 'write_time', 'round_trip')
+    LINKS = ('xbox', 'serial')
+
+    def __init__(self, size=1024, clock=time.monotonic_ns):
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.rings = {name: SampleRing(size) for name in self.RINGS}
+        self.event_to_frame = self.rings['event_to_frame']
+        self.tick_jitter = self.rings['tick_jitter']
+        self.write_time = self.rings['write_time']
+        self.round_trip = self.rings['round_trip']
+        self._clock = clock
+        now = clock()
+        self._down_since = dict.fromkeys(self.LINKS, now)
+        self._down_ns = dict.fromkeys(self.LINKS, 0)
+        self._seen_up = set()
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def count(self, name: str, num=1):
+        self.counters[name] += num
+
+    def link_up(self, link: str):
+        since = self._down_since.pop(link, None)
+        self._down_ns.setdefault(link, 0)
+        if since is None:
+            self._seen_up.add(link)
+            return
+        self._down_ns[link] += self._clock() - since
+        if link in self._seen_up:
+            key = link + '_reconnects'
+            self.counters[key] = self.counters.get(key, 0) + 1
+        self._seen_up.add(link)
+
+    def link_down(self, link: str):
+        self._down_ns.setdefault(link, 0)
+        self._down_since.setdefault(link, self._clock())
+
+    def disconnected(self, link: str) -> float:
+        """Seconds link has spent down so far, including right now."""
+        total = self._down_ns[link]
+        since = self._down_since.get(link)
+        if since is not None:
+            total += self._clock() - since
+        return total / 1e9
+
+    def snapshot(self) -> dict:
+        # The copies are taken in one step, another thread may add a link or a counter meanwhile.
+        return {
+            'counters': dict(self.counters),
+            'disconnected_s': {link: self.disconnected(link) for link in list(self._down_ns)},
+            **{name: ring.summary() for name, ring in self.rings.items()},
+        }
+
+    def log_line(self) -> str:
+        c = self.counters
+        latency = self.event_to_frame.summary()
+        jitter = self.tick_jitter.summary()
+        write = self.write_time.summary()
+        return (f"ev {c['events_read']} coal {c['events_coalesced']} drop {c['events_dropped']} | "
+                f"tx {c['frames_sent']} fs {c['failsafe_frames']} err {c['write_errors']} | "
+                f"lat p50 {latency['p50_us']:.0f} p99 {latency['p99_us']:.0f} us | "
+                f"jit p99 {jitter['p99_us']:.0f} us | wr p99 {write['p99_us']:.0f} us | "
+                f"xbox down {self.disconnected('xbox'):.1f}s/{c['xbox_reconnects']}r "
+                f"serial down {self.disconnected('serial'):.1f}s/{c['serial_reconnects']}r")
+
+class StatsServer(threading.Thread):
+    """Answer every connection on a Unix socket with one JSON snapshot.
+
+    e.g. socat - UNIX-CONNECT:/tmp/joystick.sock
+    """
+    def __init__(self, snapshot, path: str):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.snapshot = snapshot
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(path)
+        self._sock.listen(4)
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def run(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.sendall(json.dumps(self.snapshot()).encode() + b'\n')
+                except OSError as e:
+                    print(e)
+
+    def close(self):
+        self._sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+class StatsLogger(threading.Thread):
+    """Print metrics.log_line() every interval seconds."""
+    def __init__(self, metrics: Metrics, interval: float):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.metrics = metrics
+        self.interval = interval
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            print(self.metrics.log_line())
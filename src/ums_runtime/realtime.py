@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Real-time priority, CPU pinning, memory locking and gc control for the control process
+'''
+
+import ctypes
+import ctypes.util
+import gc
+import os
+
+MCL_CURRENT = 1
+MCL_FUTURE  = 2
+
+POLICY_NAMES = {getattr(os, name): name for name in
+                ('SCHED_OTHER', 'SCHED_BATCH', 'SCHED_IDLE', 'SCHED_FIFO', 'SCHED_RR')
+                if hasattr(os, name)}
+
+class Realtime:
+    """Ask the kernel for real-time treatment and report what it granted.
+
+    Linux sets the policy and the affinity per thread and a new thread
+    inherits them from the thread that starts it. apply() on the main
+    thread right before XboxControl.exec therefore covers the reader, ramp
+    and transmit threads, while threads started earlier (stats, reloader)
+    stay SCHED_OTHER. The control threads all block or sleep, none of them
+    may spin under SCHED_FIFO.
+
+    gc_mode 'freeze' moves everything allocated during startup out of the
+    collector's reach, 'off' also stops collection for the rest of the run.
+    """
+    GC_MODES = ('on', 'freeze', 'off')
+
+    def __init__(self, priority=None, cpus=None, lock_memory=False, gc_mode='on'):
+        if priority is not None and not 1 <= priority <= 99:
+            raise ValueError(f"SCHED_FIFO priority must be in 1..99, got {priority}")
+        if gc_mode not in self.GC_MODES:
+            raise ValueError(f"unknown gc mode: {gc_mode}")
+        self.priority = priority
+        self.cpus = set(cpus) if cpus else None
+        self.lock_memory = lock_memory
+        self.gc_mode = gc_mode
+        self.errors = {}
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def apply(self) -> dict:
+        """Request every option, failures only end up in errors and the report."""
+        self.errors = {}
+        if self.cpus is not None:
+            try:
+                os.sched_setaffinity(0, self.cpus)
+            except (OSError, ValueError) as e:
+                self.errors['affinity'] = str(e)
+        if self.priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+            except (OSError, AttributeError) as e:
+                self.errors['scheduler'] = str(e)
+        if self.lock_memory:
+            error = mlockall(MCL_CURRENT | MCL_FUTURE)
+            if error:
+                self.errors['mlockall'] = error
+        if self.gc_mode != 'on':
+            gc.collect()
+            gc.freeze()
+            if self.gc_mode == 'off':
+                gc.disable()
+        return self.report()
+
+    def report(self) -> dict:
+        """What the calling thread actually runs with, read back from the kernel."""
+        report = {}
+        try:
+            policy = os.sched_getscheduler(0)
+            report['scheduler'] = POLICY_NAMES.get(policy, str(policy))
+            report['priority'] = os.sched_getparam(0).sched_priority
+        except (OSError, AttributeError):
+            report['scheduler'] = 'unknown'
+            report['priority'] = 0
+        try:
+            report['cpus'] = sorted(os.sched_getaffinity(0))
+        except (OSError, AttributeError):
+            report['cpus'] = []
+        report['locked_kb'] = locked_kb()
+        report['gc'] = 'off' if not gc.isenabled() else 'on'
+        report['gc_frozen'] = gc.get_freeze_count()
+        report['errors'] = dict(self.errors)
+        return report
+
+    @staticmethod
+    def describe(report: dict) -> str:
+        line = (f"realtime: {report['scheduler']} {report['priority']}, cpus {report['cpus']}, "
+                f"locked {report['locked_kb']} kB, gc {report['gc']} ({report['gc_frozen']} frozen)")
+        for option, error in report['errors'].items():
+            line += f"\n  {option} not granted: {error}"
+        return line
+
+def mlockall(flags: int):
+    """mlockall(2) through libc, returns None or the error text."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        call = libc.mlockall
+    except (OSError, AttributeError) as e:
+        return f"mlockall is not available: {e}"
+    call.argtypes = [ctypes.c_int]
+    if call(flags) != 0:
+        return os.strerror(ctypes.get_errno())
+    return None
+
+def locked_kb() -> int:
+    """VmLck of this process, 0 where /proc is not there."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmLck:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Fixed rate scheduler on absolute monotonic deadlines
+'''
+
+import time
+
+class JitterStats:
+    """Histogram of |interval - period| in BIN_US wide bins."""
+    BIN_US = 50
+    NUM_BINS = 1000
+
+    def __init__(self, period: float):
+        self.period = period
+        self.bins = [0] * (self.NUM_BINS + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def add(self, interval: float):
+        jitter = abs(interval - self.period)
+        idx = int(jitter * 1e6) // self.BIN_US
+        if idx > self.NUM_BINS: idx = self.NUM_BINS
+        self.bins[idx] += 1
+        self.count += 1
+        if jitter > self.max: self.max = jitter
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bin holding the p-th percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        total = 0
+        for idx, num in enumerate(self.bins):
+            total += num
+            if total >= rank:
+                return min((idx + 1) * self.BIN_US * 1e-6, self.max)
+        return self.max
+
+    def reset(self):
+        self.bins = [0] * (self.NUM_BINS + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'p50_ms': self.percentile(50) * 1e3,
+            'p99_ms': self.percentile(99) * 1e3,
+            'max_ms': self.max * 1e3,
+        }
+
+class FixedRateScheduler:
+    """Plan ticks against absolute deadlines instead of sleeping a period.
+
+    SKIP drops the ticks that were missed and realigns on the deadline grid,
+    CATCH_UP runs them back to back (at most max_catchup of them). missed
+    counts each late tick once, when the backlog holding it is first seen.
+    """
+    SKIP = 'skip'
+    CATCH_UP = 'catchup'
+
+    def __init__(self, rate=50.0, policy=SKIP, max_catchup=5,
+                 clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if policy not in (self.SKIP, self.CATCH_UP):
+            raise ValueError(f"unknown missed tick policy: {policy}")
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.policy = policy
+        self.max_catchup = max_catchup
+        self.missed = 0
+        self.jitter = JitterStats(self.period)
+        self._clock = clock
+        self._sleep = sleep
+        self.reset()
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def reset(self):
+        self._last = None
+        self._deadline = self._clock() + self.period
+        # late ticks already counted in missed that CATCH_UP still has to run
+        self._behind = 0
+
+    @property
+    def deadline(self) -> float:
+        return self._deadline
+
+    def wait(self) -> int:
+        """Sleep until the next deadline and return the number of newly missed ticks."""
+        delay = self._deadline - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+        return self.tick(self._clock())
+
+    def tick(self, now: float) -> int:
+        """Record a tick that ran at now and plan the next deadline.
+
+        Event loops that sleep on their own use this instead of wait().
+        """
+        if self._last is not None:
+            self.jitter.add(now - self._last)
+        self._last = now
+
+        if self._behind:
+            # this tick is one of the backlog
+            self._behind -= 1
+        missed = int((now - self._deadline) / self.period)
+        if missed <= 0:
+            self._behind = 0
+            self._deadline += self.period
+            return 0
+
+        new = max(missed - self._behind, 0)
+        self.missed += new
+        if self.policy == self.CATCH_UP and missed <= self.max_catchup:
+            self._deadline += self.period
+            self._behind = missed
+        else:
+            self._deadline += (missed + 1) * self.period
+            self._behind = 0
+        return new
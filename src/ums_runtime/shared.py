@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: ControlState in a shared memory block behind a seqlock, for the split process mode
+'''
+
+import sys, os
+import struct
+import time
+from multiprocessing import shared_memory
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.protocol import Packet
+from ums_xbox.state import ControlState
+
+ESTOP_NAMES = {code: name for name, code in Packet.ESTOP.items()}
+GEAR_NAMES  = {code: name for name, code in Packet.GEAR.items()}
+WHEEL_NAMES = {code: name for name, code in Packet.WHEEL.items()}
+
+class SharedControl:
+    """One writer process publishes ControlState, one reader process loads it.
+
+    The seqlock counter is odd while the writer is in the middle of the
+    body; a reader that saw it odd, or changed by the time it finished,
+    reads again. The two beats are the watchdogs: each side stores the
+    monotonic ns of its last loop in its own 8 byte slot, and
+    CLOCK_MONOTONIC is the same clock in every process.
+
+    CPython has no memory fences, on a weakly ordered CPU a reader can in
+    theory accept a body that mixes two consecutive states. Both halves are
+    valid states and the next tick reads again.
+    """
+    # seqlock | seq stamp | estop gear wheel connected | accel brake | steer raw, modified
+    LOCK    = struct.Struct("<Q")
+    BODY    = struct.Struct("<QqBBBBHHhh")
+    BODY_OFFSET = 8
+    # input beat | output beat | reader stamp | ramp stamp, on their own cache line
+    BEAT    = struct.Struct("<q")
+    BEATS_OFFSET = 64
+    INPUT   = 0
+    OUTPUT  = 1
+    # input_ns and ramp_ns of the pads in the input process, 0 while idle
+    READER  = 2
+    RAMP    = 3
+    SIZE    = 128
+    # a writer that died half way leaves the lock odd for good
+    MAX_RETRIES = 100
+
+    def __init__(self, name=None):
+        """Create a new block, or attach to the block called name."""
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.SIZE)
+            self._shm.buf[:self.SIZE] = bytes(self.SIZE)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self.buf = self._shm.buf
+        self.retries = 0
+        # even, past whatever a previous writer left behind
+        self._lock = (self.LOCK.unpack_from(self.buf, 0)[0] + 1) & ~1
+        self._read_lock = None
+        self._read = (None, False)
+
+    def __repr__(self) -> str:
+        return "<{cls} {name}>".format(cls=self.__class__.__name__, name=self.name)
+
+    def write(self, state: ControlState, connected: bool):
+        buf = self.buf
+        lock = self._lock + 1
+        self.LOCK.pack_into(buf, 0, lock)
+        self.BODY.pack_into(buf, self.BODY_OFFSET, state.seq, state.stamp,
+                            Packet.ESTOP[state.estop], Packet.GEAR[state.gear], Packet.WHEEL[state.wheel],
+                            connected, state.accel, state.brake, state.steer_raw, state.steer_modified)
+        self._lock = lock + 1
+        self.LOCK.pack_into(buf, 0, self._lock)
+
+    def read(self) -> tuple:
+        """(ControlState or None before the first write, connected).
+
+        Never blocks: after MAX_RETRIES the last consistent read is returned.
+        """
+        buf = self.buf
+        unpack_lock = self.LOCK.unpack_from
+        for _ in range(self.MAX_RETRIES):
+            lock = unpack_lock(buf, 0)[0]
+            if lock == self._read_lock:
+                # nothing new, hand back the same instance
+                return self._read
+            if not lock & 1:
+                body = self.BODY.unpack_from(buf, self.BODY_OFFSET)
+                if unpack_lock(buf, 0)[0] == lock:
+                    break
+            self.retries += 1
+        else:
+            return self._read
+        seq, stamp, estop, gear, wheel, connected, accel, brake, steer_raw, steer_modified = body
+        state = None
+        if lock:
+            state = ControlState(ESTOP_NAMES[estop], GEAR_NAMES[gear], WHEEL_NAMES[wheel],
+                                 accel, brake, steer_raw, steer_modified, seq, stamp)
+        self._read_lock = lock
+        self._read = (state, bool(connected))
+        return self._read
+
+    def beat(self, side: int, now=None):
+        self.BEAT.pack_into(self.buf, self.BEATS_OFFSET + 8 * side,
+                            time.monotonic_ns() if now is None else now)
+
+    def stamp(self, side: int) -> int:
+        """The monotonic ns side last stored, 0 if it never did."""
+        return self.BEAT.unpack_from(self.buf, self.BEATS_OFFSET + 8 * side)[0]
+
+    def age(self, side: int, now=None) -> float:
+        """Seconds since side last beat, inf if it never did."""
+        beat = self.BEAT.unpack_from(self.buf, self.BEATS_OFFSET + 8 * side)[0]
+        if not beat:
+            return float('inf')
+        if now is None:
+            now = time.monotonic_ns()
+        return (now - beat) / 1e9
+
+    def close(self):
+        self.buf = None
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Deadlines on the last sign of life of the reader, the ramp and the serial writes
+'''
+
+import time
+
+class Watchdog:
+    """Trip when a watched stamp gets older than its deadline.
+
+    A source is a callable returning the monotonic ns of its last sign of
+    life, or 0 while it has nothing to do: an idle ramp cannot be late.
+    check() runs on every transmit tick, it costs one call and one compare
+    per source and allocates nothing. A source that stopped between two
+    ticks is therefore seen at most deadline plus one tick period after
+    its last stamp.
+    """
+    SOURCES = ('input', 'ramp', 'write')
+
+    def __init__(self, clock=time.monotonic_ns):
+        self._clock = clock
+        self._sources = []
+        self.deadlines = {}
+        self.tripped = None
+        self.trips = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def watch(self, name: str, stamp, deadline: float):
+        if name not in self.SOURCES:
+            raise ValueError(f"unknown watchdog source: {name}")
+        if deadline <= 0:
+            raise ValueError(f"watchdog deadline must be positive, got {deadline}")
+        self._sources.append((name, stamp, int(deadline * 1e9)))
+        self.deadlines[name] = deadline
+
+    def check(self, now=None):
+        """Name of the first source past its deadline, None while all are in time."""
+        if now is None:
+            now = self._clock()
+        for name, stamp, deadline in self._sources:
+            last = stamp()
+            if last and now - last > deadline:
+                if self.tripped is None:
+                    self.trips += 1
+                self.tripped = name
+                return name
+        self.tripped = None
+        return None
+
+    def ages(self, now=None) -> dict:
+        """Seconds since each source's last stamp, None for an idle one."""
+        if now is None:
+            now = self._clock()
+        ages = {}
+        for name, stamp, deadline in self._sources:
+            last = stamp()
+            ages[name] = (now - last) / 1e9 if last else None
+        return ages
+
+    def describe(self) -> dict:
+        return {'tripped': self.tripped, 'trips': self.trips,
+                'deadlines': dict(self.deadlines), 'ages_s': self.ages()}
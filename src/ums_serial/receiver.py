@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Background receive pipeline for vehicle feedback frames
+'''
+
+import sys, os
+import array
+import select
+import threading
+import time
+from serial.serialutil import SerialException
+
+dir_path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(dir_path))
+from ums_xbox.protocol import FeedbackParser
+from ums_xbox.state import VehicleState
+from ums_runtime.metrics import Metrics
+
+RX_RING_SIZE = 4096
+
+class AliveEcho:
+    """When each alive value went out, matched against the echo coming back.
+
+    alive wraps at 256, which is 5 s at 50 Hz: an echo is matched to the
+    last frame sent with that value and counted once.
+    """
+    def __init__(self, timeout=0.5, clock=time.monotonic_ns):
+        self.sent_ns = array.array('q', bytes(8 * 256))
+        self.timeout_ns = int(timeout * 1e9)
+        self.last_echo_ns = None
+        self.echoes = 0
+        self._clock = clock
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def sent(self, alive: int, stamp: int):
+        self.sent_ns[alive] = stamp
+
+    def echoed(self, alive: int, stamp: int):
+        """Round trip in ns of the frame alive echoes, None if it was not sent or already seen."""
+        sent = self.sent_ns[alive]
+        if not sent:
+            return None
+        self.sent_ns[alive] = 0
+        self.last_echo_ns = stamp
+        self.echoes += 1
+        return stamp - sent
+
+    def is_alive(self, now=None) -> bool:
+        """True while the vehicle echoed one of our frames within the timeout."""
+        if self.last_echo_ns is None:
+            return False
+        if now is None:
+            now = self._clock()
+        return now - self.last_echo_ns <= self.timeout_ns
+
+class FeedbackReceiver(threading.Thread):
+    """Read the serial port in bulk and keep the latest VehicleState.
+
+    Bytes go straight from the fd into a preallocated ring and are parsed
+    in place by FeedbackParser.scan, so no bytes object is built per read.
+    Only the unfinished tail of a frame is ever moved back to the front.
+    Readers load self.state, which is swapped whole like Xbox.state; it is
+    built once per read from the newest frame, older ones are only counted.
+    """
+    POLL_MS = 100
+
+    def __init__(self, ums_ser, metrics=None, ring_size=RX_RING_SIZE, echo_timeout=0.5):
+        threading.Thread.__init__(self)
+        if ring_size < 2 * FeedbackParser.SIZE:
+            raise ValueError(f"ring of {ring_size} bytes cannot hold two feedback frames")
+        self.daemon = True
+        self.ums_ser = ums_ser
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.parser = FeedbackParser()
+        self.echo = AliveEcho(echo_timeout)
+        self.state = None
+        self._ring = bytearray(ring_size)
+        self._view = memoryview(self._ring)
+        self._start = 0
+        self._end = 0
+        self._stamp = 0
+        self._last = None
+        self._running = True
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        poller = None
+        fd = None
+        while self._running:
+            if not self.ums_ser.isOpen():
+                # The transmit side owns connect and reconnect.
+                poller = fd = None
+                self._start = self._end = 0
+                self._link_check()
+                time.sleep(self.POLL_MS / 1e3)
+                continue
+            try:
+                if fd != self.ums_ser.fileno():
+                    fd = self.ums_ser.fileno()
+                    poller = select.poll()
+                    poller.register(fd, select.POLLIN)
+                if poller.poll(self.POLL_MS):
+                    self.read(fd)
+            except (OSError, ValueError, TypeError):
+                # closed or hung up under us, wait for the reconnect
+                poller = fd = None
+                time.sleep(self.POLL_MS / 1e3)
+            self._link_check()
+
+    def read(self, fd: int) -> int:
+        """Read what is queued on fd and parse every complete frame, returns the bytes read."""
+        try:
+            size = os.readv(fd, [self._view[self._end:]])
+        except BlockingIOError:
+            return 0
+        if not size:
+            # The ring always has room for a frame: readable and empty is a hangup, as in pyserial.
+            raise SerialException('device reports readiness to read but returned no data')
+        self._stamp = time.monotonic_ns()
+        self.feed_size(size)
+        return size
+
+    def feed(self, data) -> int:
+        """Parse data as if it had been read from the port, for tests and captures."""
+        view = memoryview(data)
+        while view:
+            size = min(len(view), len(self._ring) - self._end)
+            self._view[self._end:self._end + size] = view[:size]
+            self._stamp = time.monotonic_ns()
+            self.feed_size(size)
+            view = view[size:]
+        return self.parser.frames
+
+    def feed_size(self, size: int):
+        parser = self.parser
+        errors = parser.checksum_errors
+        self._end += size
+        self._start = parser.scan(self._ring, self._on_frame, self._start, self._end)
+        self.metrics.counters['feedback_errors'] += parser.checksum_errors - errors
+        frame = self._last
+        if frame is not None:
+            self._last = None
+            self.state = VehicleState(*frame[1:10], parser.frames, self._stamp)
+
+        left = self._end - self._start
+        if not left:
+            self._start = self._end = 0
+        elif self._end + FeedbackParser.SIZE > len(self._ring):
+            # Less than a frame is left, move it to the front.
+            self._ring[:left] = self._ring[self._start:self._end]
+            self._start, self._end = 0, left
+
+    def _on_frame(self, frame):
+        self._last = frame
+        metrics = self.metrics
+        metrics.counters['feedback_frames'] += 1
+        rtt = self.echo.echoed(frame[FeedbackParser.ALIVE_FIELD], self._stamp)
+        if rtt is not None:
+            metrics.round_trip.add(rtt, self._stamp)
+
+    def _link_check(self):
+        if self.echo.is_alive():
+            self.metrics.link_up('vehicle')
+        else:
+            self.metrics.link_down('vehicle')
+
+    def describe(self) -> dict:
+        state = self.state
+        if state is None:
+            return {'frames': 0, 'echo': False}
+        desc = FeedbackParser.describe((None, state.mode, state.estop, state.gear, state.speed,
+                                        state.steer, state.brake, state.fault, state.encoder, state.alive))
+        desc.update(frames=self.parser.frames, echo=self.echo.is_alive(),
+                    age_ms=(time.monotonic_ns() - state.stamp) / 1e6)
+        return desc
@@ -7,19 +7,44 @@
 @ Description: Serial Communication
 '''
 
-import time
 import sys, os
+import select
+import time
 import serial, serial.tools.list_ports
 from serial.serialutil import SerialException
 
 dir_path = os.path.abspath(os.path.dirname(__file__))
 sys.path.append(os.path.dirname(dir_path))
+from exception.exception import PortNotOpenError
+from ums_runtime.hotplug import DeviceWatcher
+from ums_xbox.protocol import Packet
+
+# start bit + 8 data bits + stop bit
+BITS_PER_BYTE = 10
 
 class UmsSerial:
-    def __init__(self, port: str, baudrate: int, timeout: float):
+    STALE_REPLACE = 'replace'
+    STALE_QUEUE = 'queue'
+
+    def __init__(self, port: str, baudrate: int, timeout: float, stale_policy=STALE_REPLACE,
+                 write_timeout=None):
+        if baudrate not in serial.Serial.BAUDRATES:
+            raise ValueError(f"unsupported baudrate: {baudrate}")
+        if stale_policy not in (self.STALE_REPLACE, self.STALE_QUEUE):
+            raise ValueError(f"unknown stale frame policy: {stale_policy}")
         self.port = port
         self.device = None
-        self._serial = serial.Serial(baudrate=baudrate, timeout=timeout)
+        self.stale_policy = stale_policy
+        # Longest time write() waits for the port to take a frame, None waits for good.
+        self.write_timeout = write_timeout
+        self._serial = serial.Serial(baudrate=baudrate, timeout=timeout, write_timeout=write_timeout)
+        # Binary file that gets a copy of every byte sent, for frame_decode.
+        self.tee = None
+        self._watcher = None
+
+        self.frames_written = 0
+        self.frames_replaced = 0
+        self.frames_cut = 0
 
     def __repr__(self) -> str:
         return "<{cls}>".format(cls=self.__class__.__name__)
@@ -34,21 +59,63 @@ class UmsSerial:
         if test_mode:
             return True
             
+        watcher = self._port_watcher()
+        name = os.path.basename(self.port)
         while not self._serial.isOpen():
-            ports = self.find_comports()
-            for port in ports:
-                if self.port == port.device:
-                    self._serial.port = self.port
-            try:
-                self._serial.open()
-            except SerialException as e:
-                print(e)
-                time.sleep(1)
+            if not self.try_open():
+                watcher.wait(name, watcher.retry_after(name))
 
         if self._serial.isOpen():
             return True
         return False
 
+    @property
+    def baudrate(self) -> int:
+        return self._serial.baudrate
+
+    def frame_time(self, size: int) -> float:
+        """Seconds the UART needs to put size bytes on the wire."""
+        return size * BITS_PER_BYTE / self._serial.baudrate
+
+    def link_load(self, size: int, period: float) -> float:
+        """Fraction of the link used by one size byte frame every period."""
+        return self.frame_time(size) / period
+
+    def link_budget(self, size: int, period: float) -> str:
+        frame_ms = self.frame_time(size) * 1e3
+        load = self.link_load(size, period) * 100
+        return (f"link budget: {size} bytes @ {self._serial.baudrate} baud = "
+                f"{frame_ms:.2f} ms per frame, {load:.1f}% of {period * 1e3:.1f} ms")
+
+    @staticmethod
+    def choose_baudrate(candidates, size: int, period: float, max_load=0.5) -> int:
+        """Return the lowest candidate baudrate that keeps the link under max_load."""
+        supported = sorted(b for b in candidates if b in serial.Serial.BAUDRATES)
+        if not supported:
+            raise ValueError(f"no supported baudrate in {list(candidates)}")
+        for baudrate in supported:
+            if size * BITS_PER_BYTE / baudrate <= max_load * period:
+                return baudrate
+        return supported[-1]
+
+    def _port_watcher(self) -> DeviceWatcher:
+        # Created before the first try_open so a plug in between is seen.
+        if self._watcher is None:
+            self._watcher = DeviceWatcher(os.path.dirname(self.port), poll_interval=1.0)
+        return self._watcher
+
+    def try_open(self) -> bool:
+        if not os.path.exists(self.port):
+            print(f"{self.port} not found, waiting for it")
+            return False
+        self._serial.port = self.port
+        try:
+            self._serial.open()
+        except SerialException as e:
+            print(e)
+            return False
+        return True
+
     def disconnect(self) -> bool:
         try:
             self._serial.close()
@@ -69,16 +136,75 @@ class UmsSerial:
     def isOpen(self):
         return self._serial.isOpen()
 
-    def write(self, data):
+    def write(self, data, replace=None):
         if not self.isOpen():
             raise PortNotOpenError()
 
-        self._serial.write(serial.to_bytes(data))
+        if isinstance(data, list):
+            data = serial.to_bytes(data)
+            self._serial.write(data)
+            if self.tee is not None:
+                self.tee.write(data)
+            return
 
-    @property
-    def read(self, length):
+        sent = self.write_nowait(data, replace)
+        if sent < len(data):
+            self._write_until(data, sent)
+
+    def _write_until(self, data, sent: int):
+        """Write the rest of data as the port drains, for at most write_timeout.
+
+        A port that stops draining must not hold the caller's tick: the
+        rest is dropped and counted in frames_cut, the receiver resyncs on
+        the next STX.
+        """
+        view = memoryview(data)
+        deadline = None if self.write_timeout is None else time.monotonic() + self.write_timeout
+        poller = select.poll()
+        poller.register(self._serial.fileno(), select.POLLOUT)
+        while sent < len(view):
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    self.frames_cut += 1
+                    return
+                timeout = max(int(timeout * 1000), 1)
+            if poller.poll(timeout):
+                sent += self.write_rest(view[sent:])
+
+    def write_nowait(self, data, replace=None) -> int:
+        """Write what the port accepts right now and return the bytes sent.
+
+        The caller's buffer goes straight to the fd, pyserial would copy it.
+        replace overrides the stale frame policy for this frame.
+        """
+        # Older frames still queued would reach the vehicle late. Less than
+        # a frame is the tail of one on the wire, flushing it would cut it,
+        # the new frame queues behind it instead.
+        if replace is None:
+            replace = self.stale_policy == self.STALE_REPLACE
+        if replace and self._serial.out_waiting >= Packet.SIZE:
+            self._serial.reset_output_buffer()
+            self.frames_replaced += 1
+        self.frames_written += 1
+        return self.write_rest(data)
+
+    def write_rest(self, data) -> int:
+        """Write more of a frame write_nowait only partly sent, return the bytes sent."""
+        try:
+            sent = os.write(self._serial.fileno(), data)
+        except BlockingIOError:
+            return 0
+        if self.tee is not None:
+            self.tee.write(data[:sent])
+        return sent
+
+    def fileno(self) -> int:
+        return self._serial.fileno()
+
+    def read(self, length=1) -> bytes:
         return self._serial.read(length)
 
-    @property
-    def readline(self):
-        return self._serial.readline()
\ No newline at end of file
+    def readline(self) -> bytes:
+        return self._serial.readline()
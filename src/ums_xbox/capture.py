@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Decode serial capture files into columns and a summary
+'''
+import sys, os
+import array
+import mmap
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.protocol import FrameParser
+
+COLUMNS = ('estop', 'gear', 'wheel', 'accel', 'brake', 'steer_raw', 'steer_modified', 'alive')
+TYPECODES = ('B', 'B', 'B', 'H', 'H', 'h', 'h', 'B')
+
+def decode_file(path: str, columns=True) -> tuple:
+    """Decode a capture file through mmap.
+
+    Returns the parser (for its counters) and a dict of column arrays, or
+    None for the columns when they were not asked for.
+    """
+    parser = FrameParser()
+    frames = []
+    on_frame = frames.append if columns else (lambda frame: None)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parser, to_columns(frames) if columns else None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            consumed = parser.scan(buf, on_frame)
+            parser.skipped_bytes += len(buf) - consumed
+    return parser, to_columns(frames) if columns else None
+
+def to_columns(frames: list) -> dict:
+    fields = list(zip(*frames))[1:9] if frames else [()] * len(COLUMNS)
+    return {name: array.array(code, values)
+            for name, code, values in zip(COLUMNS, TYPECODES, fields)}
+
+def summary(parser: FrameParser) -> dict:
+    return {
+        'frames': parser.frames,
+        'heartbeats': parser.heartbeats,
+        'skipped_bytes': parser.skipped_bytes,
+        'checksum_errors': parser.checksum_errors,
+        'alive_gaps': parser.alive_gaps,
+        'alive_missing': parser.alive_missing,
+    }
+
+def write_csv(path: str, columns: dict):
+    with open(path, 'w') as f:
+        f.write(','.join(COLUMNS) + '\n')
+        for row in zip(*(columns[name] for name in COLUMNS)):
+            f.write(','.join(map(str, row)) + '\n')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Test mode status line rendered off the transmit thread
+'''
+import sys, os
+import queue
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.protocol import FrameParser
+
+class FrameDisplay(threading.Thread):
+    """Show the frames test mode would have sent, at most rate times a second.
+
+    put() never blocks: frames go through a bounded queue and the ones that
+    do not fit are counted as dropped. The thread decodes every queued frame
+    and redraws one status line with the latest of them.
+    """
+    def __init__(self, rate=10.0, maxsize=256, out=sys.stdout):
+        threading.Thread.__init__(self)
+        if rate <= 0:
+            raise ValueError(f"display rate must be positive, got {rate}")
+        self.daemon = True
+        self.period = 1.0 / rate
+        self.out = out
+        self.parser = FrameParser()
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._in_place = out.isatty()
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def put(self, frame):
+        # frame is Packet's reused buffer, keep a copy
+        try:
+            self._queue.put_nowait(bytes(frame))
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        while True:
+            time.sleep(self.period)
+            self.refresh()
+
+    def refresh(self):
+        chunks = []
+        while True:
+            try:
+                chunks.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not chunks:
+            return
+        frames = self.parser.feed(b''.join(chunks))
+        if frames:
+            self.out.write(self.status_line(frames[-1]))
+            self.out.flush()
+
+    def status_line(self, frame) -> str:
+        fields = FrameParser.describe(frame)
+        parser = self.parser
+        line = ("{estop} {gear} {wheel} accel {accel:5d} brake {brake:5d} "
+                "steer {steer_raw:6d}/{steer_modified:6d} alive {alive:3d}".format(**fields))
+        line += (f" | frames {parser.frames} dropped {self.dropped}"
+                 f" bad {parser.checksum_errors} gaps {parser.alive_gaps}")
+        if self._in_place:
+            return '\r' + line + '\x1b[K'
+        return line + '\n'
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Xbox on the evdev interface (/dev/input/event*)
+'''
+import sys, os
+import array
+import struct
+import time
+
+from fcntl import ioctl
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.names import *
+from ums_xbox.xbox import Xbox
+
+# struct input_event: struct timeval, type, code, value (native longs)
+INPUT_EVENT = struct.Struct("llHHi")
+INPUT_EVENT_BATCH = 64
+# struct input_absinfo: value, minimum, maximum, fuzz, flat, resolution
+INPUT_ABSINFO = struct.Struct("6i")
+
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+EV_FF  = 0x15
+SYN_REPORT  = 0
+SYN_DROPPED = 3
+KEY_CNT = 0x300
+ABS_CNT = 0x40
+FF_RUMBLE = 0x50
+CLOCK_MONOTONIC = 1
+
+EVIOCGNAME    = 0x80004506                  # + (len << 16)
+EVIOCGBIT_ABS = 0x80004520 + EV_ABS         # + (len << 16)
+EVIOCGKEY     = 0x80004518 + (KEY_CNT // 8 << 16)
+EVIOCGABS     = 0x80184540                  # + abs code
+EVIOCSCLOCKID = 0x400445a0
+
+# struct ff_effect with a ff_rumble_effect in the union. The union holds a
+# pointer, so its size and alignment follow the ABI.
+_FF_UNION = 32 if struct.calcsize('P') == 8 else 28
+FF_EFFECT = struct.Struct("<HhHHHHHxxHH{}x".format(_FF_UNION - 4))
+EVIOCSFF = 0x40004580 + (FF_EFFECT.size << 16)
+
+class EvdevXbox(Xbox):
+    """Xbox fed by input_event instead of js_event.
+
+    Events are applied a SYN_REPORT frame at a time, so every state holds a
+    whole report of the pad. The state stamp is the kernel timestamp of the
+    report, switched to CLOCK_MONOTONIC to compare with time.monotonic_ns().
+    Axis codes and key codes are the ones joydev maps, so the Axis and
+    Button name tables and the handlers are shared with the js backend;
+    values are scaled to the joydev range with the device's absinfo.
+    """
+    GET_NAME = EVIOCGNAME
+
+    def __init__(self, index=0, deadzone=0.05, device=None, profile=None):
+        Xbox.__init__(self, index=index, deadzone=deadzone, profile=profile)
+        self.device = device
+        self._buf = bytearray(INPUT_EVENT.size * INPUT_EVENT_BATCH)
+        self._view = memoryview(self._buf)
+        self._frame_axes = {}
+        self._frame_buttons = []
+        self._frame_abs_events = 0
+        self._dropping = False
+        self._abs_scale = [None] * ABS_CNT
+        # key bitmap as last applied, what a resync compares with
+        self._keys = bytearray(KEY_CNT // 8)
+        self._kernel_clock = False
+        self._ff_id = None
+
+    @property
+    def _get_dev_file(self) -> str:
+        if self.device is not None:
+            return self.device
+        return "/dev/input/event{idx}".format(idx=self.index)
+
+    def _open_device(self) -> int:
+        # Writing is only needed for force feedback.
+        try:
+            return os.open(self._get_dev_file, os.O_RDWR | os.O_NONBLOCK)
+        except PermissionError:
+            return os.open(self._get_dev_file, os.O_RDONLY | os.O_NONBLOCK)
+
+    def _setup(self):
+        Xbox._setup(self)
+        self._frame_axes.clear()
+        self._frame_buttons.clear()
+        self._frame_abs_events = 0
+        self._dropping = False
+        self._abs_scale = [None] * ABS_CNT
+        for code in self._abs_codes():
+            absinfo = self._get_absinfo(code)
+            if absinfo is not None and absinfo[2] > absinfo[1]:
+                self._abs_scale[code] = (absinfo[1], absinfo[2] - absinfo[1])
+        # Keys held at open are not events, only their later changes are.
+        self._keys = self._get_keys() or bytearray(KEY_CNT // 8)
+        try:
+            ioctl(self._dev_fd, EVIOCSCLOCKID, struct.pack('i', CLOCK_MONOTONIC))
+            self._kernel_clock = True
+        except OSError:
+            self._kernel_clock = False
+        self._ff_id = self._upload_rumble()
+
+    def _get_axis(self) -> list:
+        # Indexed by ABS code, unlike JSIOCGAXMAP which lists the present ones.
+        return [Axis.axis_names.get(code, 'unknown(0x%02x)' % code) for code in range(ABS_CNT)]
+
+    def _get_buttons(self) -> list:
+        return [Button.button_names.get(code, 'unknown(0x%03x)' % code) for code in range(KEY_CNT)]
+
+    def _abs_codes(self) -> list:
+        buf = array.array('B', [0] * (ABS_CNT // 8))
+        try:
+            ioctl(self._dev_fd, EVIOCGBIT_ABS + (0x10000 * len(buf)), buf)
+        except OSError:
+            return []
+        return [code for code in range(ABS_CNT) if buf[code // 8] & (1 << (code % 8))]
+
+    def _get_absinfo(self, code: int):
+        """(value, minimum, maximum, fuzz, flat, resolution) of an axis."""
+        buf = bytearray(INPUT_ABSINFO.size)
+        try:
+            ioctl(self._dev_fd, EVIOCGABS + code, buf)
+        except OSError:
+            return None
+        return INPUT_ABSINFO.unpack(buf)
+
+    def _get_keys(self):
+        """Bitmap of the keys held down now, None if the device cannot tell."""
+        buf = bytearray(KEY_CNT // 8)
+        try:
+            ioctl(self._dev_fd, EVIOCGKEY, buf)
+        except OSError:
+            return None
+        return buf
+
+    def _resync_keys(self, buttons: list):
+        """Queue the key changes lost in an overflow, from the kernel's bitmap."""
+        keys = self._get_keys()
+        if keys is None:
+            return
+        for byte, (old, new) in enumerate(zip(self._keys, keys)):
+            changed = old ^ new
+            for bit in range(8):
+                if changed & (1 << bit):
+                    buttons.append((byte * 8 + bit, (new >> bit) & 1))
+
+    def _scale(self, code: int, value: int) -> int:
+        """Map the device range onto joydev's -32767..32767."""
+        scale = self._abs_scale[code]
+        if scale is None:
+            # Unknown range: keep it inside the shaping tables at least.
+            return -32768 if value < -32768 else 32767 if value > 32767 else value
+        value -= scale[0]
+        # Some pads report a little past their absinfo range.
+        if value < 0: value = 0
+        if value > scale[1]: value = scale[1]
+        return value * 65534 // scale[1] - 32767
+
+    def _drain_events(self) -> bool:
+        try:
+            size = os.readv(self._dev_fd, [self._buf])
+        except BlockingIOError:
+            return True
+        except (ValueError, OSError) as e:
+            print(e)
+            self._close()
+            return False
+        if not size:
+            self._close()
+            return False
+
+        axes = self._frame_axes
+        buttons = self._frame_buttons
+        abs_events = self._frame_abs_events
+        self.metrics.counters['events_read'] += size // INPUT_EVENT.size
+        for sec, usec, type_, code, value in INPUT_EVENT.iter_unpack(self._view[:size]):
+            if type_ == EV_ABS:
+                axes[code] = value
+                abs_events += 1
+            elif type_ == EV_KEY:
+                if value != 2:  # autorepeat
+                    buttons.append((code, value))
+            elif type_ == EV_SYN:
+                if code == SYN_REPORT:
+                    self._apply_frame(sec * 1000000000 + usec * 1000, abs_events)
+                    abs_events = 0
+                elif code == SYN_DROPPED:
+                    self._dropping = True
+        # A frame can straddle two reads.
+        self._frame_abs_events = abs_events
+        return True
+
+    def _apply_frame(self, stamp: int, abs_events: int):
+        axes = self._frame_axes
+        buttons = self._frame_buttons
+        counters = self.metrics.counters
+        if self._dropping:
+            # The kernel queue overflowed: what came before the next report
+            # is incomplete, read the keys and axes back instead.
+            self._dropping = False
+            counters['events_dropped'] += len(axes) + len(buttons)
+            buttons.clear()
+            axes.clear()
+            self._resync_keys(buttons)
+            for code, scale in enumerate(self._abs_scale):
+                if scale is not None:
+                    absinfo = self._get_absinfo(code)
+                    if absinfo is not None:
+                        axes[code] = absinfo[0]
+        else:
+            counters['events_coalesced'] += abs_events - len(axes)
+            if not axes and not buttons:
+                return
+        if not self._kernel_clock:
+            stamp = time.monotonic_ns()
+
+        estop = self.state.estop
+        keys = self._keys
+        with self._state_lock:
+            for code, value in buttons:
+                if value:
+                    keys[code >> 3] |= 1 << (code & 7)
+                else:
+                    keys[code >> 3] &= ~(1 << (code & 7))
+                self._process_event(Joy.JS_EVENT_BUTTON, code, value)
+            for code, value in axes.items():
+                self._process_event(Joy.JS_EVENT_AXIS, code, self._scale(code, value))
+            self._publish(stamp)
+        buttons.clear()
+        axes.clear()
+        if self.state.estop == 'ESTOP_ON' and estop != 'ESTOP_ON':
+            self.rumble()
+
+    def _upload_rumble(self, strong=0xc000, weak=0xc000, length_ms=300):
+        """Upload one rumble effect and return its id, None without FF."""
+        buf = bytearray(FF_EFFECT.pack(FF_RUMBLE, -1, 0, 0, 0, length_ms, 0, strong, weak))
+        try:
+            ioctl(self._dev_fd, EVIOCSFF, buf)
+        except OSError:
+            return None
+        return FF_EFFECT.unpack(buf)[1]
+
+    def rumble(self) -> bool:
+        """Play the uploaded effect, e.g. to confirm ESTOP_ON in hand."""
+        if self._ff_id is None or self._dev_fd is None:
+            return False
+        try:
+            os.write(self._dev_fd, INPUT_EVENT.pack(0, 0, EV_FF, self._ff_id, 1))
+        except OSError:
+            return False
+        return True
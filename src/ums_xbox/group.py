@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Several Xbox pads on one reader thread, merged by priority
+'''
+import sys, os
+import select
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.state import ControlState
+from ums_xbox.xbox import Xbox
+from ums_runtime.hotplug import DeviceWatcher
+from ums_runtime.metrics import Metrics
+
+class Arbiter:
+    """Merge the states of pads listed in priority order.
+
+    Any connected pad can set ESTOP_ON. Everything else comes from the
+    driver, the first connected pad. When the driver changes (the primary
+    drops out or comes back) the new driver is held in GEAR_N with no
+    accel until its own gear reads GEAR_N.
+    """
+    def __init__(self, pads: list):
+        self.pads = pads
+        self.driver = None
+        self.holding = False
+        self.handovers = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def merge(self) -> ControlState:
+        driver = None
+        estop = False
+        seq = self.handovers
+        stamp = 0
+        for pad in self.pads:
+            state = pad.state
+            seq += state.seq
+            if stamp < state.stamp: stamp = state.stamp
+            if not pad.is_connect:
+                continue
+            if driver is None:
+                driver, driving = pad, state
+            if state.estop == 'ESTOP_ON':
+                estop = True
+
+        if driver is not self.driver:
+            if self.driver is not None and driver is not None:
+                print(f"handover to controller {driver.index}")
+                self.handovers += 1
+                self.holding = True
+            self.driver = driver
+        if driver is None:
+            return self.pads[0].state
+
+        gear, accel = driving.gear, driving.accel
+        if self.holding:
+            if gear == 'GEAR_N':
+                self.holding = False
+            else:
+                gear, accel = 'GEAR_N', 0
+        return ControlState(
+            'ESTOP_ON' if estop else driving.estop,
+            gear,
+            driving.wheel,
+            accel,
+            driving.brake,
+            driving.steer_raw,
+            driving.steer_modified,
+            seq,
+            stamp)
+
+class ControllerGroup(threading.Thread):
+    """Drive several Xbox pads from one epoll instead of a thread each.
+
+    Stands in for a single Xbox towards XboxControl: is_connect,
+    wait_connect() and state, which is the Arbiter's merge. Only the ramp
+    threads stay per pad, they sleep unless that pad's accel moves.
+    """
+    def __init__(self, pads: list):
+        threading.Thread.__init__(self)
+        if not pads:
+            raise ValueError("a controller group needs at least one pad")
+        self.daemon = True
+        self.pads = pads
+        self.arbiter = Arbiter(pads)
+        self._connect_cond = threading.Condition()
+        self._epoll = select.epoll()
+        self._by_fd = {}
+        self._watchers = {}
+        # pad -> monotonic time of the next open attempt without an event
+        self._retry = {}
+        for pad in pads:
+            pad.link = f"xbox{pad.index}"
+        self.metrics = Metrics()
+        self.input_ns = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: Metrics):
+        self._metrics = metrics
+        for pad in self.pads:
+            pad.metrics = metrics
+
+    @property
+    def recorder(self):
+        return self.pads[0].recorder
+
+    @recorder.setter
+    def recorder(self, recorder):
+        # A log replays into one pad, record the primary.
+        self.pads[0].recorder = recorder
+
+    @property
+    def profile(self):
+        return self.pads[0].profile
+
+    def set_profile(self, profile):
+        for pad in self.pads:
+            pad.set_profile(profile)
+
+    @property
+    def is_connect(self) -> bool:
+        return any(pad.is_connect for pad in self.pads)
+
+    @property
+    def ramp_ns(self) -> int:
+        """Oldest progress stamp of a ramp with work to do, 0 if none has."""
+        return min((pad._ramp.stamp_ns for pad in self.pads if pad._ramp.stamp_ns), default=0)
+
+    @property
+    def state(self) -> ControlState:
+        return self.arbiter.merge()
+
+    def wait_connect(self, timeout=None) -> bool:
+        with self._connect_cond:
+            self._connect_cond.wait_for(lambda: self.is_connect, timeout)
+            return self.is_connect
+
+    def run(self):
+        for pad in self.pads:
+            pad._ramp.start()
+            directory = os.path.dirname(pad._get_dev_file)
+            if directory not in self._watchers:
+                watcher = DeviceWatcher(directory)
+                self._watchers[directory] = watcher
+                if watcher.available:
+                    self._epoll.register(watcher.fileno(), select.EPOLLIN)
+        for pad in self.pads:
+            self._try_connect(pad)
+
+        while True:
+            ready = self._epoll.poll(self._retry_timeout())
+            self.input_ns = time.monotonic_ns()
+            for fd, events in ready:
+                pad = self._by_fd.get(fd)
+                if pad is None:
+                    self._on_hotplug(fd)
+                elif not (events & select.EPOLLIN and pad._drain_events()):
+                    self._disconnect(fd, pad)
+            now = time.monotonic()
+            for pad, when in list(self._retry.items()):
+                if when <= now:
+                    self._try_connect(pad)
+
+    def _try_connect(self, pad) -> bool:
+        self._retry.pop(pad, None)
+        if pad._try_open():
+            if pad._is_xbox():
+                pad._setup()
+                self._by_fd[pad._dev_fd] = pad
+                self._epoll.register(pad._dev_fd, select.EPOLLIN)
+                self.input_ns = time.monotonic_ns()
+                self._changed()
+                return True
+            pad._close()
+        watcher = self._watchers[os.path.dirname(pad._get_dev_file)]
+        retry = watcher.retry_after(os.path.basename(pad._get_dev_file))
+        if retry is not None or not watcher.available:
+            self._retry[pad] = time.monotonic() + (watcher.poll_interval if retry is None else retry)
+        return False
+
+    def _disconnect(self, fd: int, pad):
+        del self._by_fd[fd]
+        if pad._dev_fd is not None:
+            self._epoll.unregister(fd)
+            print("controller device with index %d was removed" % pad.index)
+            pad._close()
+        with pad._state_lock:
+            pad._reset_data()
+            pad._publish()
+        # The node may stay in place (EIO, a USB glitch), no event would come.
+        watcher = self._watchers[os.path.dirname(pad._get_dev_file)]
+        retry = watcher.retry_after(os.path.basename(pad._get_dev_file))
+        self._retry[pad] = time.monotonic() + (watcher.poll_interval if retry is None else retry)
+        self._changed()
+
+    def _on_hotplug(self, fd: int):
+        for directory, watcher in self._watchers.items():
+            if watcher.fileno() != fd:
+                continue
+            names = watcher.read()
+            for pad in self.pads:
+                if (not pad.is_connect and os.path.dirname(pad._get_dev_file) == directory
+                        and os.path.basename(pad._get_dev_file) in names):
+                    self._try_connect(pad)
+
+    def _retry_timeout(self) -> float:
+        # wake at least every INPUT_POLL, so input_ns proves the loop is not stuck
+        if not self._retry:
+            return Xbox.INPUT_POLL
+        return min(max(min(self._retry.values()) - time.monotonic(), 0), Xbox.INPUT_POLL)
+
+    def _changed(self):
+        if self.is_connect:
+            self._metrics.link_up('xbox')
+        else:
+            self._metrics.link_down('xbox')
+        with self._connect_cond:
+            self._connect_cond.notify_all()
@@ -7,6 +7,8 @@
 @ Description: Xbox axises and buttons name, Parameters
 '''
 
+from enum import IntEnum
+
 class Joy:
     def __repr__(self):
         return "<{cls}>".format(cls=self.__class__.__name__)
@@ -15,6 +17,21 @@ class Joy:
     JS_EVENT_AXIS = 0x02
     JS_EVENT_INIT = 0x80
 
+class Control(IntEnum):
+    NONE        = 0
+    ACCEL       = 1
+    STEER       = 2
+    BRAKE       = 3
+    GEAR_N      = 4
+    GEAR_D_R    = 5
+    WHEEL_REAR  = 6
+    WHEEL_ALL   = 7
+    WHEEL_FRONT = 8
+    ESTOP_OFF   = 9
+    ESTOP_ON    = 10
+    CRUISE_DOWN = 11
+    CRUISE_UP   = 12
+
 class Param(Joy):
     def __init__(self) -> None:
         super().__init__()
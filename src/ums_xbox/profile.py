@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Vehicle parameter profiles, loaded from an INI file and reloaded on SIGHUP
+'''
+import sys, os
+import configparser
+import signal
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.names import Param
+from ums_xbox.shaping import Shaping
+
+def _baudrate(value) -> tuple:
+    if isinstance(value, str):
+        value = value.split(',')
+    return tuple(int(baudrate) for baudrate in value)
+
+def _rate(value):
+    if value is None or value == '' or value == 'none':
+        return None
+    return int(value)
+
+class Profile:
+    """Parameters of one vehicle, validated and compiled once.
+
+    Replaces the Param constants and the port settings of joystick_control.
+    Derived values (ramp steps, cruise step, the shaping tables) are
+    computed here, so a reload costs the hot path one reference swap and a
+    handler reads plain slots. load_profiles compiles the tables with the
+    profile, one built in code (DEFAULT_PROFILE) on its first use. port,
+    baudrate and timeout are only used when the serial port is opened.
+    """
+    # name -> (parser, default)
+    FIELDS = {
+        'port'         : (str, '/dev/ttyAMA0'),
+        'baudrate'     : (_baudrate, (9600,)),
+        'timeout'      : (float, 0.1),
+        'deadzone'     : (float, 0.05),
+        'steer_expo'   : (float, 0.0),
+        'steer_rate'   : (_rate, None),
+        'max_accel'    : (int, Param.MAX_ACCEL_VAL),
+        'thresh_accel' : (int, Param.THRESH_ACCEL_VAL),
+        'increase'     : (int, Param.INCREASE_VAL),
+        'decrease'     : (int, Param.DECREASE_VAL),
+        'aps_init'     : (int, Param.APS_INIT_VAL),
+        'cruise'       : (int, Param.CRUISE_VAL),
+        'limit_steer'  : (int, Param.LIMIT_STEER_VAL),
+    }
+    RESTART = ('port', 'baudrate', 'timeout')
+    __slots__ = ('name',) + tuple(FIELDS) + (
+        'increase_fine', 'increase_reverse', 'decrease_reverse', 'cruise_down', 'shaping')
+
+    def __init__(self, name='default', **values):
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"[{name}] unknown parameters: {', '.join(sorted(unknown))}")
+        setattr_ = object.__setattr__
+        setattr_(self, 'name', name)
+        for field, (parse, default) in self.FIELDS.items():
+            value = values.get(field, default)
+            try:
+                value = parse(value) if value is not None else None
+            except ValueError as e:
+                raise ValueError(f"[{name}] {field}: {e}") from None
+            setattr_(self, field, value)
+        self._validate()
+
+        # The ramp and cruise steps as ramp_step and Xbox used to compute them per tick.
+        setattr_(self, 'increase_fine', int(self.increase / 4))
+        setattr_(self, 'increase_reverse', self.increase * 2)
+        setattr_(self, 'decrease_reverse', self.decrease * 3)
+        setattr_(self, 'cruise_down', int(self.cruise / 2))
+        setattr_(self, 'shaping', Shaping.default(self.deadzone, self.limit_steer,
+                                                  self.steer_expo, self.steer_rate))
+
+    def _validate(self):
+        def check(ok: bool, message: str):
+            if not ok:
+                raise ValueError(f"[{self.name}] {message}")
+        check(self.baudrate and all(baudrate > 0 for baudrate in self.baudrate),
+              f"baudrate must be positive, got {self.baudrate}")
+        check(self.timeout > 0, f"timeout must be positive, got {self.timeout}")
+        check(0.0 <= self.deadzone < 1.0, f"deadzone must be in [0, 1), got {self.deadzone}")
+        check(0.0 <= self.steer_expo <= 1.0, f"steer_expo must be in [0, 1], got {self.steer_expo}")
+        check(self.steer_rate is None or self.steer_rate > 0,
+              f"steer_rate must be positive, got {self.steer_rate}")
+        # accel goes out as an unsigned 16 bit field, steer as a signed one
+        check(0 <= self.aps_init <= self.thresh_accel <= self.max_accel <= 0xFFFF,
+              "need 0 <= aps_init <= thresh_accel <= max_accel <= 65535, got "
+              f"{self.aps_init}, {self.thresh_accel}, {self.max_accel}")
+        check(self.increase > 0 and self.decrease > 0,
+              f"increase and decrease must be positive, got {self.increase}, {self.decrease}")
+        check(0 < self.cruise <= self.max_accel, f"cruise must be in (0, max_accel], got {self.cruise}")
+        check(0 < self.limit_steer <= 32767, f"limit_steer must be in (0, 32767], got {self.limit_steer}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return "<{cls} {name}>".format(cls=self.__class__.__name__, name=self.name)
+
+    def __reduce__(self):
+        # Rebuilt from its fields, the slots cannot be set on an instance.
+        return (_from_values, (self.name, self.values()))
+
+    def values(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def restart_needed(self, other: 'Profile') -> list:
+        """Fields that differ from other but only apply when the port is reopened."""
+        return [field for field in self.RESTART if getattr(self, field) != getattr(other, field)]
+
+def _from_values(name: str, values: dict) -> Profile:
+    return Profile(name, **values)
+
+DEFAULT_PROFILE = Profile()
+
+def load_profiles(path: str) -> dict:
+    """Every section of the INI file as a Profile, [DEFAULT] is shared by all."""
+    parser = configparser.ConfigParser()
+    with open(path) as f:
+        try:
+            parser.read_file(f)
+        except configparser.Error as e:
+            raise ValueError(f"{path}: {e}") from None
+    profiles = {name: Profile(name, **parser[name]) for name in parser.sections()}
+    for profile in profiles.values():
+        profile.shaping.compile()
+    return profiles
+
+def load_profile(path: str, name: str) -> Profile:
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise ValueError(f"no profile [{name}] in {path}, found: {', '.join(profiles) or 'none'}")
+    return profiles[name]
+
+class ProfileReloader(threading.Thread):
+    """Reload a profile on SIGHUP and hand it to apply.
+
+    The signal handler only sets an event: parsing and compiling the tables
+    happen on this thread, and a file that fails to load or validate keeps
+    the running profile.
+    """
+    def __init__(self, path: str, name: str, apply, current: Profile):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.path = path
+        self.profile_name = name
+        self.apply = apply
+        self.current = current
+        self.reloads = 0
+        self._event = threading.Event()
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def install(self, signum=signal.SIGHUP):
+        """Route signum to this reloader, from the main thread."""
+        signal.signal(signum, lambda signum, frame: self._event.set())
+        self.start()
+
+    def request(self):
+        self._event.set()
+
+    def run(self):
+        while True:
+            self._event.wait()
+            self._event.clear()
+            self.reload()
+
+    def reload(self) -> bool:
+        try:
+            profile = load_profile(self.path, self.profile_name)
+        except (OSError, ValueError) as e:
+            print(f"Profile reload failed, keeping [{self.current.name}]: {e}")
+            return False
+        restart = profile.restart_needed(self.current)
+        if restart:
+            print(f"Profile [{profile.name}]: {', '.join(restart)} apply after a restart")
+        self.apply(profile)
+        self.current = profile
+        self.reloads += 1
+        print(f"Profile [{profile.name}] loaded from {self.path}")
+        return True
@@ -2,52 +2,318 @@
 # -*- coding: utf-8 -*-
 '''
 @ Created Date: May 15. 2020
-@ Updated Date: May  4. 2021
-@ Author: Dae Jong Jin 
+@ Updated Date: Oct 18. 2026
+@ Author: Dae Jong Jin
 @ Description: Packet Protocol Definition
 '''
 
+import struct
+
 class Packet:
     ESTOP   = {'ESTOP_OFF' : 0x00 , 'ESTOP_ON' : 0x01}
     GEAR    = {'GEAR_D' : 0x00, 'GEAR_N' : 0x01, 'GEAR_R' : 0x02}
     WHEEL   = {'WHEEL_FRONT' : 0x00, 'WHEEL_ALL'  : 0x01, 'WHEEL_REAR' : 0x02}
 
+    # S T X | estop gear wheel | accel brake | steer raw, modified | alive checksum | CR LF
+    # Only the high byte of accel is sent, the low byte stays 0x00.
+    SIZE    = 18
+    FIELDS  = struct.Struct("<BBBxBHhhB")
+    FIELDS_OFFSET = 3
+    CHECKSUM_OFFSET = 15
+    # payload bytes compared by DeltaGate, everything between STX and alive
+    PAYLOAD = slice(3, 14)
+
+    # S T X | 0xFF | alive checksum | CR LF, the checksum is (0xFF + alive) & 0xFF.
+    # 0xFF is never a valid estop, so a parser tells the two apart by byte 3.
+    HEARTBEAT = 0xFF
+    HEARTBEAT_SIZE = 8
+
+    # ADD8[a][b] == (a + b) & 0xFF, so the checksum never leaves the small int cache.
+    ADD8 = tuple(bytes((a + b) & 0xFF for b in range(256)) for a in range(256))
+
     def __init__(self):
-        self.packet      = [0 for _ in range(18)]
         self.s           = 0x53
         self.t           = 0x54
         self.x           = 0x58
-        self.accel_data  = [0x00, 0x00]
-        self.brake_data  = [0x00, 0x00]
-        self.steer_data  = [0x00, 0x00, 0x00, 0x00]
         self.alive       = 0x00
         self.checksum    = 0x00
         self.etx0        = 0x0D
         self.etx1        = 0x0A
 
-    def makepacket(self, estop='ESTOP_OFF', gear='GEAR_N', wheel='WHEEL_FRONT') -> list:
-        self.packet[0]   = self.s
-        self.packet[1]   = self.t 
-        self.packet[2]   = self.x       
-        self.packet[3]   = self.ESTOP.get(estop)
-        self.packet[4]   = self.GEAR.get(gear)
-        self.packet[5]   = self.WHEEL.get(wheel)
-        self.packet[6]   = self.accel_data[0]
-        self.packet[7]   = self.accel_data[1]
-        self.packet[8]   = self.brake_data[0]
-        self.packet[9]   = self.brake_data[1]
-        self.packet[10]  = self.steer_data[0]
-        self.packet[11]  = self.steer_data[1]
-        self.packet[12]  = self.steer_data[2]
-        self.packet[13]  = self.steer_data[3]
-        self.packet[14]  = self.alive
-        self.packet[15]  = self.calc_checksum(self.packet[3:14])
-        self.packet[16]  = self.etx0
-        self.packet[17]  = self.etx1
-
-        return self.packet
+        self.packet = bytearray(self.SIZE)
+        self.packet[0:3] = bytes((self.s, self.t, self.x))
+        self.packet[16:18] = bytes((self.etx0, self.etx1))
+        self.view = memoryview(self.packet)
+        self.beat = bytearray(b'STX' + bytes((self.HEARTBEAT, 0, 0)) + b'\r\n')
+        self.beat_view = memoryview(self.beat)
+
+    def encode(self, estop, gear, wheel, accel, brake, steer_raw, steer_modified) -> memoryview:
+        """Write one frame into the reused buffer and return a view of it.
+
+        The checksum is the 8-bit sum of bytes 3..13, accumulated byte by
+        byte through ADD8 so that no int is allocated per frame.
+        """
+        p = self.packet
+        self.FIELDS.pack_into(p, self.FIELDS_OFFSET,
+            self.ESTOP[estop], self.GEAR[gear], self.WHEEL[wheel],
+            accel >> 8, brake, steer_raw, steer_modified, self.alive)
+
+        add = self.ADD8
+        c = add[p[3]][p[4]]
+        c = add[c][p[5]]
+        c = add[c][p[6]]
+        c = add[c][p[7]]
+        c = add[c][p[8]]
+        c = add[c][p[9]]
+        c = add[c][p[10]]
+        c = add[c][p[11]]
+        c = add[c][p[12]]
+        c = add[c][p[13]]
+        p[self.CHECKSUM_OFFSET] = self.checksum = c
+        return self.view
+
+    def heartbeat(self) -> memoryview:
+        """A heartbeat frame with the current alive, in its own reused buffer."""
+        beat = self.beat
+        beat[4] = self.alive
+        beat[5] = self.ADD8[self.HEARTBEAT][self.alive]
+        return self.beat_view
 
     @staticmethod
-    def calc_checksum(datas: list) -> int:
+    def calc_checksum(datas) -> int:
         checksum = sum(datas) & 0xFF
         return checksum
+
+class DeltaGate:
+    """Hold back frames whose payload did not change since the last full one.
+
+    A full frame goes out when the payload changed or keepalive seconds
+    passed since the last full frame, a heartbeat when nothing went out for
+    heartbeat seconds, and nothing otherwise. keepalive bounds how stale the
+    vehicle's copy of an unchanged state gets, heartbeat how long the line
+    stays silent; heartbeat=0 fills every held back tick with one.
+    """
+    def __init__(self, packet: Packet, keepalive=0.5, heartbeat=0.1):
+        if keepalive <= 0:
+            raise ValueError(f"keepalive must be positive, got {keepalive}")
+        if not 0 <= heartbeat <= keepalive:
+            raise ValueError(f"heartbeat must be between 0 and keepalive, got {heartbeat}")
+        self.packet = packet
+        self.keepalive_ns = int(keepalive * 1e9)
+        self.heartbeat_ns = int(heartbeat * 1e9)
+        self.full = 0
+        self.heartbeats = 0
+        self.suppressed = 0
+        # The payload as last sent in full, compared in place with the one
+        # encode wrote: no copy is made on a tick that changes nothing.
+        self._current = packet.view[Packet.PAYLOAD]
+        self._payload = bytearray(len(self._current))
+        self.reset()
+        self._full_ns = 0
+        self._sent_ns = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def reset(self):
+        """Send the next frame in full, after a failsafe or a dropped frame."""
+        # never a valid estop, so it differs from any payload
+        self._payload[0] = Packet.HEARTBEAT
+
+    def gate(self, frame, now: int):
+        """frame, a heartbeat or None for the frame Packet.encode just wrote."""
+        packet = self.packet
+        payload = self._payload
+        if payload != self._current or now - self._full_ns >= self.keepalive_ns:
+            payload[:] = self._current
+            self._full_ns = self._sent_ns = now
+            self.full += 1
+            return frame
+        if now - self._sent_ns >= self.heartbeat_ns:
+            self._sent_ns = now
+            self.heartbeats += 1
+            return packet.heartbeat()
+        # alive counts frames on the wire, give this one back
+        packet.alive = (packet.alive - 1) & 0xFF
+        self.suppressed += 1
+        return None
+
+class FrameParser:
+    """Streaming decoder for the frames written by Packet.
+
+    Resynchronizes on 'STX', checks the CR LF trailer, the checksum and the
+    alive sequence. Decoded frames are FRAME tuples:
+    (stx, estop, gear, wheel, accel, brake, steer_raw, steer_modified,
+    alive, checksum, etx). Heartbeats advance the alive sequence and are
+    counted, but are not passed on.
+    """
+    FRAME   = struct.Struct("<3sBBBHHhhBB2s")
+    SIZE    = Packet.SIZE
+    STX     = b'STX'
+    ETX     = b'\r\n'
+    # the checksum covers buf[3:CHECKSUM_END]; field indices in FRAME
+    CHECKSUM_END   = 14
+    ALIVE_FIELD    = 8
+    CHECKSUM_FIELD = 9
+    ETX_FIELD      = 10
+    # byte 3 of a heartbeat, None when the stream has none
+    HEARTBEAT      = Packet.HEARTBEAT
+
+    ESTOP_NAMES = {v: k for k, v in Packet.ESTOP.items()}
+    GEAR_NAMES  = {v: k for k, v in Packet.GEAR.items()}
+    WHEEL_NAMES = {v: k for k, v in Packet.WHEEL.items()}
+
+    def __init__(self):
+        self._pending = b''
+        self._alive = None
+        self.frames = 0
+        self.heartbeats = 0
+        self.skipped_bytes = 0
+        self.checksum_errors = 0
+        self.alive_gaps = 0
+        self.alive_missing = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def feed(self, data) -> list:
+        """Decode every complete frame in data plus what was left last time."""
+        buf = self._pending + bytes(data) if self._pending else bytes(data)
+        frames = []
+        consumed = self.scan(buf, frames.append)
+        self._pending = buf[consumed:]
+        return frames
+
+    def scan(self, buf, on_frame, pos=0, end=None) -> int:
+        """Call on_frame for each valid frame in buf[pos:end].
+
+        Returns the offset up to which buf was consumed, a partial frame at
+        the end is left for the next call.
+        """
+        if end is None:
+            end = len(buf)
+        size = self.SIZE
+        find = buf.find
+        unpack_from = self.FRAME.unpack_from
+        stx, etx = self.STX, self.ETX
+        checksum_end = self.CHECKSUM_END
+        alive_field = self.ALIVE_FIELD
+        checksum_field = self.CHECKSUM_FIELD
+        etx_field = self.ETX_FIELD
+        heartbeat = self.HEARTBEAT
+        beat_size = Packet.HEARTBEAT_SIZE
+        alive = self._alive
+
+        while True:
+            start = find(stx, pos, end)
+            if start < 0:
+                # Keep a possible 'S' or 'ST' at the end for the next call.
+                keep = max(pos, end - 2)
+                self.skipped_bytes += keep - pos
+                pos = keep
+                break
+            if heartbeat is not None and start + 3 < end and buf[start + 3] == heartbeat:
+                if start + beat_size > end:
+                    self.skipped_bytes += start - pos
+                    pos = start
+                    break
+                self.skipped_bytes += start - pos
+                beat_alive = buf[start + 4]
+                if (buf[start + 6:start + 8] != etx
+                        or buf[start + 5] != (heartbeat + beat_alive) & 0xFF):
+                    self.checksum_errors += 1
+                    self.skipped_bytes += 1
+                    pos = start + 1
+                    continue
+                if alive is not None:
+                    gap = (beat_alive - alive - 1) & 0xFF
+                    if gap:
+                        self.alive_gaps += 1
+                        self.alive_missing += gap
+                alive = beat_alive
+                self.heartbeats += 1
+                pos = start + beat_size
+                continue
+            if start + size > end:
+                self.skipped_bytes += start - pos
+                pos = start
+                break
+            self.skipped_bytes += start - pos
+
+            frame = unpack_from(buf, start)
+            if frame[etx_field] != etx or frame[checksum_field] != sum(buf[start + 3:start + checksum_end]) & 0xFF:
+                self.checksum_errors += 1
+                self.skipped_bytes += 1
+                pos = start + 1
+                continue
+
+            if alive is not None:
+                gap = (frame[alive_field] - alive - 1) & 0xFF
+                if gap:
+                    self.alive_gaps += 1
+                    self.alive_missing += gap
+            alive = frame[alive_field]
+            self.frames += 1
+            on_frame(frame)
+            pos = start + size
+
+        self._alive = alive
+        return pos
+
+    @classmethod
+    def describe(cls, frame) -> dict:
+        return {
+            'estop': cls.ESTOP_NAMES.get(frame[1], frame[1]),
+            'gear': cls.GEAR_NAMES.get(frame[2], frame[2]),
+            'wheel': cls.WHEEL_NAMES.get(frame[3], frame[3]),
+            'accel': frame[4],
+            'brake': frame[5],
+            'steer_raw': frame[6],
+            'steer_modified': frame[7],
+            'alive': frame[8],
+        }
+
+class FeedbackParser(FrameParser):
+    """Streaming decoder for the frames the vehicle sends back.
+
+    The layout is assumed to mirror Packet until the vehicle side is
+    specified: 'STX', mode, estop, gear, speed (0.1 km/h), actual steer,
+    brake, fault bits, encoder, alive, checksum over the bytes between STX
+    and alive, CR LF. alive echoes the last alive the vehicle received.
+    """
+    FRAME   = struct.Struct("<3sBBBHhBBiBB2s")
+    SIZE    = 20
+    CHECKSUM_END   = 16
+    ALIVE_FIELD    = 9
+    CHECKSUM_FIELD = 10
+    ETX_FIELD      = 11
+    HEARTBEAT      = None
+
+    # fault bits
+    FAULT_ESTOP    = 0x01
+    FAULT_STEER    = 0x02
+    FAULT_BRAKE    = 0x04
+    FAULT_MOTOR    = 0x08
+    FAULT_COMM     = 0x10
+    FAULT_NAMES = {FAULT_ESTOP: 'estop', FAULT_STEER: 'steer', FAULT_BRAKE: 'brake',
+                   FAULT_MOTOR: 'motor', FAULT_COMM: 'comm'}
+
+    @classmethod
+    def encode(cls, mode, estop, gear, speed, steer, brake, fault, encoder, alive) -> bytes:
+        """A feedback frame, as a vehicle or a test double would send it."""
+        body = struct.pack("<BBBHhBBi", mode, estop, gear, speed, steer, brake, fault, encoder)
+        return (cls.STX + body + bytes((alive, sum(body) & 0xFF)) + cls.ETX)
+
+    @classmethod
+    def describe(cls, frame) -> dict:
+        return {
+            'mode': frame[1],
+            'estop': cls.ESTOP_NAMES.get(frame[2], frame[2]),
+            'gear': cls.GEAR_NAMES.get(frame[3], frame[3]),
+            'speed': frame[4],
+            'steer': frame[5],
+            'brake': frame[6],
+            'faults': [name for bit, name in cls.FAULT_NAMES.items() if frame[7] & bit],
+            'encoder': frame[8],
+            'alive': frame[9],
+        }
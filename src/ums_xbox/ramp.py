@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Event driven accel ramp engine
+'''
+import sys, os
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.names import *
+from ums_xbox.profile import DEFAULT_PROFILE
+
+RAMP_PERIOD = 0.02
+
+def ramp_step(current: int, target: int, gear: str, profile=DEFAULT_PROFILE,
+              brake=0, estop='ESTOP_OFF') -> int:
+    """Return the next current accel value for one ramp tick.
+
+    The target is clamped to [aps_init, max_accel] so the ramp settles
+    exactly on it instead of hunting around it. In neutral, on the brake or
+    with ESTOP on Xbox._publish holds the accel at 0, so the ramp settles
+    there too.
+    """
+    if gear == 'GEAR_N' or brake != 0 or estop == 'ESTOP_ON':
+        return 0
+
+    if target < profile.aps_init: target = profile.aps_init
+    if target > profile.max_accel: target = profile.max_accel
+
+    if current < target:
+        if gear == 'GEAR_D':
+            if current <= profile.thresh_accel:
+                current += profile.increase
+            else:
+                current += profile.increase_fine
+        else:
+            current += profile.increase_reverse
+        return target if current > target else current
+
+    if current > target:
+        if gear == 'GEAR_D':
+            current -= profile.decrease
+        else:
+            current -= profile.decrease_reverse
+        return target if current < target else current
+
+    return current
+
+class AccelRamp(threading.Thread):
+    """Move xbox.current_accel_data toward xbox.accel_data.
+
+    The thread sleeps on a condition until notify() is called and then
+    steps once per period until the ramp settles. stamp_ns is when it last
+    made progress, 0 while it has nothing to do.
+    """
+    def __init__(self, xbox, period=RAMP_PERIOD):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.period = period
+        self._xbox = xbox
+        self._cond = threading.Condition()
+        self._pending = False
+        self._running = True
+        self.stamp_ns = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def notify(self):
+        # The target is written before this check and read after _pending
+        # is cleared, so a pending wakeup already covers the new target.
+        if self._pending:
+            return
+        with self._cond:
+            self._pending = True
+            if not self.stamp_ns:
+                self.stamp_ns = time.monotonic_ns()
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                self._pending = False
+            self._ramp()
+
+    def _ramp(self):
+        xbox = self._xbox
+        deadline = time.monotonic()
+        while self._running:
+            with xbox._state_lock:
+                current = xbox.current_accel_data
+                next_data = ramp_step(current, xbox.accel_data, xbox.gear_data, xbox.profile,
+                                      xbox.brake_data, xbox.pushed_estop)
+                if next_data == current:
+                    self.stamp_ns = 0
+                    return
+                xbox.current_accel_data = next_data
+                xbox.is_thread = True
+                xbox._publish()
+                self.stamp_ns = time.monotonic_ns()
+
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Record and replay raw joystick event streams
+'''
+import sys, os
+import struct
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.xbox import Xbox, JS_EVENT
+
+# File header, then one RECORD per js_event: ns since the first event + raw event.
+LOG_MAGIC = b'JSLOG\x01\x00\x00'
+RECORD = struct.Struct("<Q8s")
+
+# Maps reported by JSIOCGAXMAP/JSIOCGBTNMAP for the xpad driver.
+XBOX_AXIS_MAP = ['unknown(0x00)', 'unknown(0x01)', 'z', 'rx', 'ry', 'rz', 'hat0x', 'hat0y']
+XBOX_BUTTON_MAP = ['a', 'b', 'x', 'y', 'tl', 'tr', 'select', 'start', 'mode',
+                   'unknown(0x13d)', 'unknown(0x13e)']
+
+class EventRecorder:
+    """Append raw js_event bytes with a monotonic timestamp to a log file."""
+    def __init__(self, path: str, clock=time.monotonic_ns):
+        self._file = open(path, 'wb')
+        self._file.write(LOG_MAGIC)
+        self._clock = clock
+        self._start = None
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def write(self, events):
+        """Record a buffer of whole js_events read at the same time."""
+        now = self._clock()
+        if self._start is None:
+            self._start = now
+        offset = now - self._start
+        for start in range(0, len(events), JS_EVENT.size):
+            self._file.write(RECORD.pack(offset, bytes(events[start:start + JS_EVENT.size])))
+
+    def close(self):
+        self._file.close()
+
+def read_log(path: str) -> list:
+    """Return the recorded (ns, raw_event) pairs."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(LOG_MAGIC):
+        raise ValueError(f"{path} is not a joystick event log")
+    body = memoryview(data)[len(LOG_MAGIC):]
+    body = body[:len(body) - len(body) % RECORD.size]
+    return list(RECORD.iter_unpack(body))
+
+def write_log(path: str, records: list):
+    with open(path, 'wb') as f:
+        f.write(LOG_MAGIC)
+        for offset, raw in records:
+            f.write(RECORD.pack(offset, raw))
+
+class EventPlayer(threading.Thread):
+    """Write recorded events into a pipe, in real time or as fast as possible.
+
+    The write end is closed at the end, which looks like an unplug to Xbox.
+    """
+    def __init__(self, records: list, realtime=True, on_event=None):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.records = records
+        self.realtime = realtime
+        self.on_event = on_event
+        self.read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def run(self):
+        start = time.monotonic_ns()
+        try:
+            for offset, raw in self.records:
+                if self.realtime:
+                    delay = (start + offset - time.monotonic_ns()) / 1e9
+                    if delay > 0:
+                        time.sleep(delay)
+                if self.on_event is not None:
+                    self.on_event(raw)
+                os.write(self._write_fd, raw)
+        finally:
+            os.close(self._write_fd)
+
+class ReplayXbox(Xbox):
+    """Xbox that reads from an EventPlayer instead of /dev/input/js*."""
+    def __init__(self, player: EventPlayer, deadzone=0.05,
+                 axis_map=XBOX_AXIS_MAP, button_map=XBOX_BUTTON_MAP):
+        Xbox.__init__(self, index=0, deadzone=deadzone)
+        self.player = player
+        self.axis_map = axis_map
+        self.button_map = button_map
+        self._replayed = False
+
+    def _try_open(self) -> bool:
+        if self._replayed:
+            return False
+        self._replayed = True
+        return self._open_fd(self.player.read_fd)
+
+    def _is_xbox(self) -> bool:
+        return True
+
+    def _get_axis(self) -> list:
+        return list(self.axis_map)
+
+    def _get_buttons(self) -> list:
+        return list(self.button_map)
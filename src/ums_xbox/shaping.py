@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Axis shaping compiled into 65536 entry lookup tables
+'''
+import sys, os
+import array
+import functools
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.names import Param
+
+# Tables are indexed by value + OFFSET for every value a js_event can hold.
+OFFSET = 32768
+DOMAIN = range(-32768, 32768)
+
+class AxisShape:
+    """How one axis turns a joydev value into a control value.
+
+    Stages, in order: add offset, round down to a multiple of step, cut a
+    deadzone (a fraction of 32767, the output restarts from 0 at its edge),
+    expo curve, clamp to limit. rate is the largest change per event; it
+    depends on the previous value, so it is applied after the lookup.
+    """
+    __slots__ = ('offset', 'step', 'deadzone', 'expo', 'limit', 'rate')
+
+    def __init__(self, offset=0, step=1, deadzone=0.0, expo=0.0, limit=None, rate=None):
+        if step < 1:
+            raise ValueError(f"step must be at least 1, got {step}")
+        if not 0.0 <= deadzone < 1.0:
+            raise ValueError(f"deadzone must be in [0, 1), got {deadzone}")
+        if not 0.0 <= expo <= 1.0:
+            raise ValueError(f"expo must be in [0, 1], got {expo}")
+        setattr_ = object.__setattr__
+        setattr_(self, 'offset', offset)
+        setattr_(self, 'step', step)
+        setattr_(self, 'deadzone', deadzone)
+        setattr_(self, 'expo', expo)
+        setattr_(self, 'limit', tuple(limit) if limit is not None else None)
+        setattr_(self, 'rate', rate)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return "<{cls} {fields}>".format(cls=self.__class__.__name__, fields=' '.join(
+            f"{name}={getattr(self, name)}" for name in self.__slots__))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, AxisShape) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def replace(self, **changes) -> 'AxisShape':
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return AxisShape(**fields)
+
+    def shape(self, value: int) -> int:
+        """Reference implementation of one lookup."""
+        value = self._linear(value)
+        if self.expo:
+            full = self._full()
+            t = abs(value) / full
+            curve = int(full * ((1.0 - self.expo) * t + self.expo * t * t * t))
+            value = curve if value >= 0 else -curve
+        if self.limit is not None:
+            if value < self.limit[0]: value = self.limit[0]
+            if value > self.limit[1]: value = self.limit[1]
+        return value
+
+    def _linear(self, value: int) -> int:
+        value += self.offset
+        if self.step != 1:
+            value = (value // self.step) * self.step
+        if self.deadzone:
+            unscaled_deadzone = int(32767 * self.deadzone)
+            if value > unscaled_deadzone:
+                value -= unscaled_deadzone
+            elif value < -unscaled_deadzone:
+                value += unscaled_deadzone
+            else:
+                value = 0
+        return value
+
+    def _full(self) -> int:
+        # largest magnitude before the curve, the curve keeps the end points
+        return max(abs(self._linear(DOMAIN[0])), abs(self._linear(DOMAIN[-1]))) or 1
+
+    def compile(self) -> array.array:
+        return _compile(self)
+
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """numpy if installed, imported by the first compile and not at startup."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+@functools.lru_cache(maxsize=32)
+def _compile(shape: AxisShape) -> array.array:
+    np = _numpy()
+    if np is not None:
+        values = _compile_numpy(shape, np)
+    else:
+        values = [shape.shape(value) for value in DOMAIN]
+    low, high = min(values), max(values)
+    typecode = 'h' if -32768 <= low and high <= 32767 else 'i'
+    return array.array(typecode, values)
+
+def _compile_numpy(shape: AxisShape, np) -> list:
+    """The same stages as AxisShape.shape, on the whole domain at once."""
+    value = np.arange(DOMAIN[0], DOMAIN[-1] + 1, dtype=np.int64) + shape.offset
+    if shape.step != 1:
+        value = (value // shape.step) * shape.step
+    if shape.deadzone:
+        unscaled_deadzone = int(32767 * shape.deadzone)
+        value = np.where(value > unscaled_deadzone, value - unscaled_deadzone,
+                         np.where(value < -unscaled_deadzone, value + unscaled_deadzone, 0))
+    if shape.expo:
+        full = shape._full()
+        t = np.abs(value) / full
+        curve = np.trunc(full * ((1.0 - shape.expo) * t + shape.expo * t * t * t)).astype(np.int64)
+        value = np.where(value >= 0, curve, -curve)
+    if shape.limit is not None:
+        value = np.clip(value, shape.limit[0], shape.limit[1])
+    return value.tolist()
+
+class Shaping:
+    """Compiled tables for every shaped axis, swapped as a whole.
+
+    steer_raw is what goes out as the raw steer field, steer the deadzoned
+    one. Xbox indexes them with value + OFFSET. A table is compiled on its
+    first read unless compile() ran before.
+    """
+    AXES = ('steer_raw', 'steer', 'accel', 'brake')
+
+    def __init__(self, shapes: dict):
+        missing = set(self.AXES) - set(shapes)
+        if missing:
+            raise ValueError(f"no shape for {sorted(missing)}")
+        self.shapes = {name: shapes[name] for name in self.AXES}
+        self.rates = {name: shape.rate for name, shape in self.shapes.items() if shape.rate}
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def __getattr__(self, name):
+        # Only reached while a table is not compiled yet, later reads find it in __dict__.
+        if name in self.AXES and 'shapes' in self.__dict__:
+            self.compile()
+            return self.__dict__[name]
+        raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {name!r}")
+
+    def compile(self) -> 'Shaping':
+        """Compile every table now, off the hot path."""
+        for name in self.AXES:
+            if name not in self.__dict__:
+                setattr(self, name, self.shapes[name].compile())
+        return self
+
+    @classmethod
+    def default(cls, deadzone: float, limit_steer=Param.LIMIT_STEER_VAL,
+                steer_expo=0.0, steer_rate=None) -> 'Shaping':
+        """Exactly what Xbox computed per event before the tables, with the
+        default limit_steer and no expo or rate."""
+        return cls({
+            'steer_raw': AxisShape(limit=(-limit_steer, limit_steer)),
+            'steer': AxisShape(step=10, deadzone=deadzone, expo=steer_expo, rate=steer_rate),
+            'accel': AxisShape(offset=32767),
+            'brake': AxisShape(offset=32767),
+        })
+
+    def replace(self, **shapes) -> 'Shaping':
+        return Shaping(dict(self.shapes, **shapes)).compile()
+
+def rate_limit(previous: int, value: int, rate: int) -> int:
+    if value > previous + rate:
+        return previous + rate
+    if value < previous - rate:
+        return previous - rate
+    return value
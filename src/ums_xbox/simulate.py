@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Offline, time stepped simulation of the accel ramp and cruise logic
+'''
+import sys, os
+import random
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+from ums_xbox.names import *
+from ums_xbox.xbox import Xbox, JS_EVENT
+from ums_xbox.ramp import ramp_step, RAMP_PERIOD
+from ums_xbox.replay import XBOX_AXIS_MAP, XBOX_BUTTON_MAP
+from ums_xbox.profile import DEFAULT_PROFILE
+from ums_xbox.protocol import Packet
+from ums_xbox.shaping import OFFSET
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Input of one tick: the Control pressed and the raw value of every axis
+# that moved, NO_EVENT otherwise. Within a tick the press comes first and
+# the axes follow in AXES order, like a batch read by Xbox._drain_events.
+NO_EVENT = 0x10000
+AXES = ('accel', 'brake', 'steer', 'gear_n', 'gear_d_r')
+INPUTS = ('button',) + AXES
+AXIS_CHANNEL = {
+    Control.ACCEL    : 'accel',
+    Control.BRAKE    : 'brake',
+    Control.STEER    : 'steer',
+    Control.GEAR_N   : 'gear_n',
+    Control.GEAR_D_R : 'gear_d_r',
+}
+# gear and estop are traced as their Packet codes
+TRACES = ('accel', 'brake', 'steer_raw', 'steer_modified', 'gear', 'estop', 'cruise')
+
+def empty_inputs(ticks: int) -> dict:
+    return {channel: [NO_EVENT] * ticks for channel in INPUTS}
+
+def inputs_from_records(records: list, period=RAMP_PERIOD,
+                        axis_map=XBOX_AXIS_MAP, button_map=XBOX_BUTTON_MAP) -> dict:
+    """Bin a recorded (ns, js_event) log into ticks of period seconds.
+
+    Axes keep their last value in a tick. Presses keep their order, one per
+    tick, a second press in the same tick moves to the next one. Releases
+    change nothing in Xbox and are left out.
+    """
+    period_ns = int(period * 1e9)
+    axes = [AXIS_CHANNEL.get(Control[Axis.axis_redefine.get(name, 'NONE')]) for name in axis_map]
+    buttons = [Control[Button.button_redefine.get(name, 'NONE')] for name in button_map]
+    ticks = records[-1][0] // period_ns + 1 if records else 0
+    inputs = empty_inputs(ticks)
+    presses = []
+    for offset, raw in records:
+        _, value, type_, number = JS_EVENT.unpack(raw)
+        tick = offset // period_ns
+        if type_ == Joy.JS_EVENT_AXIS and number < len(axes) and axes[number] is not None:
+            inputs[axes[number]][tick] = value
+        elif type_ == Joy.JS_EVENT_BUTTON and value and number < len(buttons):
+            presses.append((tick, int(buttons[number])))
+    free = 0
+    for tick, control in presses:
+        tick = max(tick, free)
+        if tick >= len(inputs['button']):
+            for channel in INPUTS:
+                inputs[channel].append(NO_EVENT)
+        inputs['button'][tick] = control
+        free = tick + 1
+    return inputs
+
+class TickRamp:
+    """Stands in for AccelRamp: notify() only marks the ramp as running."""
+    def __init__(self):
+        self.pending = False
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def notify(self):
+        self.pending = True
+
+    def stop(self):
+        self.pending = False
+
+class SimXbox(Xbox):
+    """The real Xbox logic without a device or threads.
+
+    step() applies one tick of input through the same handlers and
+    _publish() as a live pad, then takes one AccelRamp step.
+    """
+    def __init__(self, profile=DEFAULT_PROFILE, period=RAMP_PERIOD):
+        Xbox.__init__(self, profile=profile)
+        self._ramp = TickRamp()
+        self.period_ns = int(period * 1e9)
+        self.tick = 0
+        self.axis = XBOX_AXIS_MAP
+        self.buttons = XBOX_BUTTON_MAP
+        self._axis_table = self._build_axis_table(self.axis)
+        self._button_table = self._build_button_table(self.buttons)
+        self._axis_numbers = [self._number(self.axis, Axis.axis_redefine, Control[channel.upper()])
+                              for channel in AXES]
+        self._button_numbers = {int(control): self._number(self.buttons, Button.button_redefine, control)
+                                for control in Control}
+
+    @staticmethod
+    def _number(names: list, redefine: dict, control: Control):
+        for number, name in enumerate(names):
+            if redefine.get(name, 'NONE') == control.name:
+                return number
+        return None
+
+    def start(self):
+        raise RuntimeError("SimXbox is stepped with step(), it has no device to read")
+
+    def step(self, button=NO_EVENT, *axes):
+        stamp = self.tick * self.period_ns
+        self.tick += 1
+        event = False
+        if button != NO_EVENT:
+            self._process_event(Joy.JS_EVENT_BUTTON, self._button_numbers[button], 1)
+            event = True
+        for number, value in zip(self._axis_numbers, axes):
+            if value != NO_EVENT:
+                self._process_event(Joy.JS_EVENT_AXIS, number, value)
+                event = True
+        if event:
+            self._publish(stamp)
+        # AccelRamp._ramp, one period
+        if self._ramp.pending:
+            current = self.current_accel_data
+            next_data = ramp_step(current, self.accel_data, self.gear_data, self.profile,
+                                  self.brake_data, self.pushed_estop)
+            if next_data == current:
+                self._ramp.pending = False
+            else:
+                self.current_accel_data = next_data
+                self.is_thread = True
+                self._publish(stamp)
+        return self.state
+
+def simulate(inputs: dict, profile=DEFAULT_PROFILE, period=RAMP_PERIOD) -> dict:
+    """Run one scenario through SimXbox and return a list per trace."""
+    xbox = SimXbox(profile, period)
+    traces = {name: [] for name in TRACES}
+    accel, brake, steer_raw, steer_modified, gear, estop, cruise = (traces[name] for name in TRACES)
+    for tick_inputs in zip(*(inputs[channel] for channel in INPUTS)):
+        state = xbox.step(*tick_inputs)
+        accel.append(state.accel)
+        brake.append(state.brake)
+        steer_raw.append(state.steer_raw)
+        steer_modified.append(state.steer_modified)
+        gear.append(Packet.GEAR[state.gear])
+        estop.append(Packet.ESTOP[state.estop])
+        cruise.append(int(xbox.is_cruise))
+    return traces
+
+GEAR_D, GEAR_N, GEAR_R = Packet.GEAR['GEAR_D'], Packet.GEAR['GEAR_N'], Packet.GEAR['GEAR_R']
+PUSHED_NONE, PUSHED_GEAR_N, PUSHED_GEAR_D_R = 0, 1, 2
+PUSHED_CRUISE_DOWN, PUSHED_CRUISE_UP = 1, 2
+
+class _BatchProfile:
+    """Profile values as one array entry per scenario, tables stacked per shape."""
+    SCALARS = ('aps_init', 'max_accel', 'thresh_accel', 'increase', 'increase_fine',
+               'increase_reverse', 'decrease', 'decrease_reverse', 'cruise', 'cruise_down',
+               'limit_steer')
+    NO_RATE = 1 << 20
+
+    def __init__(self, profiles: list):
+        for name in self.SCALARS:
+            setattr(self, name, np.array([getattr(profile, name) for profile in profiles], dtype=np.int64))
+        self.tables = {}
+        self.index = {}
+        self.rates = {}
+        for axis in ('steer_raw', 'steer', 'accel', 'brake'):
+            # Compiled tables are shared between equal shapes, stack each once.
+            unique = {}
+            index = [unique.setdefault(id(getattr(profile.shaping, axis)), len(unique)) for profile in profiles]
+            tables = {id(getattr(profile.shaping, axis)): getattr(profile.shaping, axis) for profile in profiles}
+            self.tables[axis] = np.array([tables[key] for key in unique], dtype=np.int64)
+            self.index[axis] = np.array(index, dtype=np.int64)
+            self.rates[axis] = np.array([profile.shaping.rates.get(axis) or self.NO_RATE
+                                         for profile in profiles], dtype=np.int64)
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def lookup(self, axis: str, value, moved, previous):
+        value = self.tables[axis][self.index[axis], np.where(moved, value, 0) + OFFSET]
+        rate = self.rates[axis]
+        return np.where(moved, np.clip(value, previous - rate, previous + rate), previous)
+
+class _BatchXbox:
+    """Xbox's event handlers, _publish and the ramp step on arrays of scenarios."""
+    def __init__(self, p: _BatchProfile, scenarios: int):
+        zeros = lambda: np.zeros(scenarios, dtype=np.int64)
+        self.p = p
+        self.accel_data = zeros()
+        self.current = p.aps_init.copy()
+        self.result = self.current.copy()
+        self.cruise = zeros()
+        self.brake = zeros()
+        self.steer_raw = zeros()
+        self.steer_modified = zeros()
+        self.gear = np.full(scenarios, GEAR_N, dtype=np.int64)
+        self.estop = zeros()
+        self.pushed_gear = zeros()
+        self.pushed_cruise = zeros()
+        self.is_cruise = np.zeros(scenarios, dtype=bool)
+        self.is_thread = np.ones(scenarios, dtype=bool)
+        self.ramping = np.zeros(scenarios, dtype=bool)
+        self.publish(np.ones(scenarios, dtype=bool))
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def change_cruise_mode(self, m):
+        self.is_cruise |= m & (self.pushed_cruise != PUSHED_NONE)
+        clear = m & ((self.accel_data != 0) | (self.pushed_gear == PUSHED_GEAR_N))
+        self.is_cruise &= ~clear
+        self.pushed_cruise = np.where(clear, PUSHED_NONE, self.pushed_cruise)
+
+    def press(self, control):
+        p = self.p
+        m = control != NO_EVENT
+        self.estop = np.where(m & (control == Control.ESTOP_ON), 1,
+                              np.where(m & (control == Control.ESTOP_OFF), 0, self.estop))
+        self.pushed_cruise = np.where(m & (control == Control.CRUISE_DOWN), PUSHED_CRUISE_DOWN,
+                                      np.where(m & (control == Control.CRUISE_UP), PUSHED_CRUISE_UP,
+                                               self.pushed_cruise))
+        # _set_cruise_accel_data runs for every press
+        copy = m & self.is_thread
+        step = m & ~self.is_thread
+        cruise = np.where(copy, self.result, self.cruise)
+        cruise = np.where(step & (self.pushed_cruise == PUSHED_CRUISE_DOWN), cruise - p.cruise_down, cruise)
+        cruise = np.where(step & (self.pushed_cruise == PUSHED_CRUISE_UP), cruise + p.cruise, cruise)
+        self.is_thread &= ~copy
+        limited = np.minimum(np.maximum(cruise, p.aps_init), p.max_accel)
+        self.cruise = np.where(m, limited, cruise)
+        self.change_cruise_mode(m)
+
+    def axis(self, channel: str, value):
+        p = self.p
+        m = value != NO_EVENT
+        if channel == 'accel':
+            self.accel_data = p.lookup('accel', value, m, self.accel_data)
+            self.ramping |= m
+        elif channel == 'brake':
+            self.brake = p.lookup('brake', value, m, self.brake)
+            self.ramping |= m
+        elif channel == 'steer':
+            self.steer_raw = p.lookup('steer_raw', value, m, self.steer_raw)
+            self.steer_modified = p.lookup('steer', value, m, self.steer_modified)
+        elif channel == 'gear_n':
+            self.pushed_gear = np.where(m, PUSHED_GEAR_N, self.pushed_gear)
+            self.gear = np.where(m, GEAR_N, self.gear)
+            self.ramping |= m
+        elif channel == 'gear_d_r':
+            self.pushed_gear = np.where(m, PUSHED_GEAR_D_R, self.pushed_gear)
+            self.gear = np.where(m & (value == 32767), GEAR_R,
+                                 np.where(m & (value == -32767), GEAR_D, self.gear))
+            self.ramping |= m
+        self.change_cruise_mode(m)
+        return m
+
+    def publish(self, m):
+        """Xbox._control_accel for the scenarios in m."""
+        p = self.p
+        self.accel_data = np.where(m & (self.accel_data < 0), 0, self.accel_data)
+        self.current = np.where(m & (self.current < p.aps_init), p.aps_init, self.current)
+        self.steer_raw = np.where(m, np.clip(self.steer_raw, -p.limit_steer, p.limit_steer), self.steer_raw)
+        init = m & ((self.brake != 0) | (self.estop == 1) | (self.gear == GEAR_N))
+        self.current = np.where(init, 0, self.current)
+        self.result = np.where(init, 0, self.result)
+        self.cruise = np.where(init, p.aps_init, self.cruise)
+        release = m & (self.accel_data != 0)
+        self.is_cruise &= ~release
+        self.cruise = np.where(release, p.aps_init, self.cruise)
+        choose = m & (self.brake == 0)
+        cruising = choose & self.is_cruise
+        self.current = np.where(cruising, self.cruise, self.current)
+        self.result = np.where(cruising, self.cruise, np.where(choose, self.current, self.result))
+
+    def ramp(self):
+        """One AccelRamp period, ramp_step on every running scenario."""
+        p = self.p
+        current = self.current
+        target = np.clip(self.accel_data, p.aps_init, p.max_accel)
+        drive = self.gear == GEAR_D
+        increase = np.where(drive, np.where(current <= p.thresh_accel, p.increase, p.increase_fine),
+                            p.increase_reverse)
+        decrease = np.where(drive, p.decrease, p.decrease_reverse)
+        next_data = np.where(current < target, np.minimum(current + increase, target),
+                             np.where(current > target, np.maximum(current - decrease, target), current))
+        next_data = np.where((self.gear == GEAR_N) | (self.brake != 0) | (self.estop == 1), 0, next_data)
+        moved = self.ramping & (next_data != current)
+        self.ramping = moved
+        self.current = np.where(moved, next_data, current)
+        self.is_thread |= moved
+        self.publish(moved)
+
+def simulate_batch(inputs: dict, profile=DEFAULT_PROFILE, traces=TRACES) -> dict:
+    """Run many scenarios at once, one NumPy operation per step for all.
+
+    inputs holds a (scenarios, ticks) array per channel, profile is one
+    Profile or one per scenario for parameter sweeps. Returns a
+    (scenarios, ticks) int32 array for each of the requested traces, the
+    same values simulate() gives scenario by scenario.
+    """
+    if np is None:
+        raise RuntimeError("simulate_batch needs numpy, use simulate() per scenario")
+    button = np.atleast_2d(np.asarray(inputs['button'], dtype=np.int64))
+    scenarios, ticks = button.shape
+    axes = [(channel, np.asarray(inputs[channel], dtype=np.int64).reshape(scenarios, ticks))
+            for channel in AXES]
+    profiles = list(profile) if isinstance(profile, (list, tuple)) else [profile] * scenarios
+    if len(profiles) != scenarios:
+        raise ValueError(f"{len(profiles)} profiles for {scenarios} scenarios")
+
+    xbox = _BatchXbox(_BatchProfile(profiles), scenarios)
+    out = {name: np.empty((scenarios, ticks), dtype=np.int32) for name in traces}
+    sources = {
+        'accel'          : lambda: xbox.current,
+        'brake'          : lambda: xbox.brake,
+        'steer_raw'      : lambda: xbox.steer_raw,
+        'steer_modified' : lambda: xbox.steer_modified,
+        'gear'           : lambda: xbox.gear,
+        'estop'          : lambda: xbox.estop,
+        'cruise'         : lambda: xbox.is_cruise,
+    }
+    record = [(out[name], sources[name]) for name in traces]
+    for tick in range(ticks):
+        column = button[:, tick]
+        event = column != NO_EVENT
+        if event.any():
+            xbox.press(column)
+        for channel, values in axes:
+            column = values[:, tick]
+            if (column != NO_EVENT).any():
+                event |= xbox.axis(channel, column)
+        if event.any():
+            xbox.publish(event)
+        if xbox.ramping.any():
+            xbox.ramp()
+        for trace, source in record:
+            trace[:, tick] = source()
+    return out
+
+def synthetic_inputs(ticks: int, seed=0) -> dict:
+    """A drive with gear changes, pedal pulls, steering and cruise presses."""
+    rnd = random.Random(seed)
+    inputs = empty_inputs(ticks)
+    buttons = [int(control) for control in Control if control >= Control.WHEEL_REAR] + [int(Control.NONE)]
+    inputs['gear_d_r'][0] = -32767
+    for tick in range(1, ticks):
+        r = rnd.random()
+        if r < 0.30:
+            inputs['steer'][tick] = rnd.randint(-32768, 32767)
+        if r < 0.15:
+            inputs['accel'][tick] = rnd.choice((-32767, -32767, rnd.randint(-32768, 32767)))
+        elif r < 0.20:
+            inputs['brake'][tick] = rnd.choice((-32767, rnd.randint(-32768, 32767)))
+        elif r < 0.21:
+            inputs['gear_d_r'][tick] = rnd.choice((-32767, 32767, 0))
+        elif r < 0.212:
+            inputs['gear_n'][tick] = rnd.choice((-32767, 0))
+        elif r < 0.25:
+            inputs['button'][tick] = rnd.choice(buttons)
+    return inputs
+
+def summary(traces: dict, period=RAMP_PERIOD) -> dict:
+    """A few numbers to compare profiles by, for one scenario."""
+    accel = list(traces['accel'])
+    peak = max(accel) if accel else 0
+    return {
+        'seconds'      : len(accel) * period,
+        'peak_accel'   : peak,
+        'mean_accel'   : sum(accel) / len(accel) if accel else 0.0,
+        'to_peak_s'    : accel.index(peak) * period if accel else 0.0,
+        'cruise_s'     : sum(traces['cruise']) * period,
+        'estop_s'      : sum(traces['estop']) * period,
+    }
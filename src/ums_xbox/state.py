@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Immutable control state shared between Xbox and XboxControl
+'''
+
+class ControlState:
+    """One consistent view of everything a frame is built from.
+
+    Xbox builds a new instance and swaps the reference, so a reader that
+    holds one never sees it change.
+    """
+    __slots__ = ('estop', 'gear', 'wheel', 'accel', 'brake',
+                 'steer_raw', 'steer_modified', 'seq', 'stamp')
+
+    def __init__(self, estop, gear, wheel, accel, brake, steer_raw, steer_modified, seq, stamp=0):
+        setattr_ = object.__setattr__
+        setattr_(self, 'estop', estop)
+        setattr_(self, 'gear', gear)
+        setattr_(self, 'wheel', wheel)
+        setattr_(self, 'accel', accel)
+        setattr_(self, 'brake', brake)
+        setattr_(self, 'steer_raw', steer_raw)
+        setattr_(self, 'steer_modified', steer_modified)
+        setattr_(self, 'seq', seq)
+        # monotonic ns of the input that produced this state
+        setattr_(self, 'stamp', stamp)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return "<{cls} seq={seq} {estop} {gear} {wheel} accel={accel} brake={brake} steer={raw}/{mod}>".format(
+            cls=self.__class__.__name__, seq=self.seq, estop=self.estop, gear=self.gear,
+            wheel=self.wheel, accel=self.accel, brake=self.brake,
+            raw=self.steer_raw, mod=self.steer_modified)
+
+class VehicleState:
+    """The last feedback frame of the vehicle, swapped like ControlState."""
+    __slots__ = ('mode', 'estop', 'gear', 'speed', 'steer', 'brake', 'fault',
+                 'encoder', 'alive', 'seq', 'stamp')
+
+    def __init__(self, mode, estop, gear, speed, steer, brake, fault, encoder, alive, seq, stamp=0):
+        setattr_ = object.__setattr__
+        setattr_(self, 'mode', mode)
+        setattr_(self, 'estop', estop)
+        setattr_(self, 'gear', gear)
+        setattr_(self, 'speed', speed)
+        setattr_(self, 'steer', steer)
+        setattr_(self, 'brake', brake)
+        setattr_(self, 'fault', fault)
+        setattr_(self, 'encoder', encoder)
+        setattr_(self, 'alive', alive)
+        setattr_(self, 'seq', seq)
+        # monotonic ns when the frame was read
+        setattr_(self, 'stamp', stamp)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return "<{cls} seq={seq} speed={speed} steer={steer} fault=0x{fault:02x} alive={alive}>".format(
+            cls=self.__class__.__name__, seq=self.seq, speed=self.speed, steer=self.steer,
+            fault=self.fault, alive=self.alive)
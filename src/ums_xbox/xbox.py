@@ -9,28 +9,51 @@
 import sys, os
 import struct
 import array
+import select
 import threading
 import time
 
-from threading import Thread
 from fcntl import ioctl
-from collections import namedtuple
 
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 from ums_xbox.names import *
+from ums_xbox.ramp import AccelRamp
+from ums_xbox.state import ControlState
+from ums_xbox.shaping import OFFSET, rate_limit
+from ums_xbox.profile import Profile, DEFAULT_PROFILE
+from ums_runtime.metrics import Metrics
+from ums_runtime.hotplug import DeviceWatcher
 
-ControllerEvent = namedtuple("Event", ["time", "value", "type", "number", "is_init"])
+JS_EVENT = struct.Struct("IhBB")
+JS_EVENT_BATCH = 64
 
 class Xbox(threading.Thread):
-    def __init__(self, index=0, deadzone=0.05):
+    GET_NAME = 0x80006a13   # JSIOCGNAME(0)
+    # The reader wakes at least this often, so input_ns proves it is not stuck.
+    INPUT_POLL = 0.1
+
+    def __init__(self, index=0, deadzone=0.05, profile=None):
         threading.Thread.__init__(self)
         self.index = index
-        self.deadzone = deadzone
+        if profile is None:
+            profile = DEFAULT_PROFILE if deadzone == DEFAULT_PROFILE.deadzone else Profile(deadzone=deadzone)
+        self.profile = profile
+        self.shaping = profile.shaping
         
         self.is_connect = False
+        self._connect_cond = threading.Condition()
+        # monotonic ns of the last time the reader woke up, for the Watchdog
+        self.input_ns = 0
         self.is_cruise = False
         self.is_thread = True
-        self._dev_file = None
+        self._dev_fd = None
+        self._epoll = None
+        self._watcher = None
+        self._buf = bytearray(JS_EVENT.size * JS_EVENT_BATCH)
+        self._view = memoryview(self._buf)
+        self.recorder = None
+        self.metrics = Metrics()
+        self.link = 'xbox'
         self.daemon = True
 
         self.pushed_wheel = 'WHEEL_ALL'
@@ -42,135 +65,165 @@ class Xbox(threading.Thread):
         self.pushed_brake = None
 
         self.accel_data = 0
-        self.pre_accel_data = 0
-        self.current_accel_data = self.accel_data + Param.APS_INIT_VAL
+        self.current_accel_data = self.accel_data + profile.aps_init
         self.result_accel_data = self.current_accel_data
         self.cruise_accel_data = 0
-        self.aps_accel_data = Param.APS_INIT_VAL
+        self.aps_accel_data = profile.aps_init
 
         self.brake_data = 0
         self.steer_raw_data = 0
         self.steer_modified_data = 0
         self.gear_data = 'GEAR_N'
 
+        # Writers (event and ramp threads) serialize on this lock, readers
+        # only ever load self.state.
+        self._state_lock = threading.Lock()
+        self._seq = 0
+        self._publish()
+
+        self._ramp = AccelRamp(self)
+
     def __repr__(self) -> str:
         return "<{cls}>".format(cls=self.__class__.__name__)
 
+    @property
+    def deadzone(self) -> float:
+        return self.shaping.shapes['steer'].deadzone
+
+    @deadzone.setter
+    def deadzone(self, deadzone: float):
+        self.set_shaping(steer=self.shaping.shapes['steer'].replace(deadzone=deadzone))
+
+    def set_shaping(self, **shapes):
+        """Recompile the lookup tables with some AxisShapes replaced.
+
+        Handlers load self.shaping once per event, so the swap is atomic.
+        """
+        self.shaping = self.shaping.replace(**shapes)
+
+    @property
+    def ramp_ns(self) -> int:
+        return self._ramp.stamp_ns
+
+    def set_profile(self, profile: Profile):
+        """Swap in a whole profile, its limits apply from the next state on."""
+        profile.shaping.compile()
+        with self._state_lock:
+            self.profile = profile
+            self.shaping = profile.shaping
+            self._publish()
+
     def run(self):
-        accel_thread = Thread(target=self._control_accel_thread)
-        accel_thread.daemon = True
-        accel_thread.start()
+        self._ramp.start()
 
         while True:
             if self._connect():
                 self._event_loop()
 
-    def _control_accel_thread(self):
-        while True:
-            if self.pre_accel_data < self.accel_data:
-                self._control_increase_accel()
-            elif self.pre_accel_data > self.accel_data:
-                self._control_decrease_accel()
-            else:
-                self._correct_current_accel()
-
     def _connect(self) -> bool:
         while True:
             if not self._open(): continue
             if self._is_xbox(): break
+            # Another kind of joystick, hand it back until the node changes.
+            self._close()
+            self._wait_device()
+        self._setup()
+        return True
+
+    def _setup(self):
+        # the default tables are compiled on first use, not at import: before the first event
+        self.shaping.compile()
         self.axis = self._get_axis()
         self.buttons = self._get_buttons()
-        return True
+        self._axis_table = self._build_axis_table(self.axis)
+        self._button_table = self._build_button_table(self.buttons)
 
     def _event_loop(self):
         while True:
-            event = self._get_event()
-            if event is None: break
-            if event is not None and not event.is_init:
-                self._process_event(event)
+            if not self._read_events(): break
                 
     def _open(self) -> bool:
+        if self._watcher is None:
+            # Watch before the first try so a plug in between is not missed.
+            self._watcher = DeviceWatcher(os.path.dirname(self._get_dev_file))
+        if self._try_open():
+            return True
+        self._wait_device()
+        return False
+
+    def _wait_device(self):
+        name = os.path.basename(self._get_dev_file)
+        self._watcher.wait(name, self._watcher.retry_after(name))
+
+    def _try_open(self) -> bool:
         try:
             print('Opening %s...' % self._get_dev_file)
-            self._dev_file = open(self._get_dev_file, 'rb')
-            self.is_connect = True
-            return True
+            return self._open_fd(self._open_device())
         except (FileNotFoundError, PermissionError) as e:
-            self.is_connect = False
+            self._set_connect(False)
             print(f"Exception : {e}, controller device with index {self.index} was not found!")
-            self._reset_data()
-            time.sleep(2)
+            with self._state_lock:
+                self._reset_data()
+                self._publish()
+            return False
+
+    def _open_device(self) -> int:
+        return os.open(self._get_dev_file, os.O_RDONLY | os.O_NONBLOCK)
+
+    def _open_fd(self, fd: int) -> bool:
+        self._dev_fd = fd
+        self._epoll = select.epoll(1)
+        self._epoll.register(self._dev_fd, select.EPOLLIN)
+        self._set_connect(True)
+        return True
 
-    def _control_increase_accel(self):
-        self.is_thread = True
-        while self.current_accel_data <= self.accel_data:
-            if self.gear_data == 'GEAR_D':
-                self._increase_based_on_threshold()
-            elif self.gear_data =='GEAR_R':
-                self.current_accel_data += Param.INCREASE_VAL * 2
-            else:
-                self.current_accel_data = 0
-            self._limit_max_current_accel()
-            time.sleep(0.02)
-
-    def _control_decrease_accel(self):
-        self.is_thread = True
-        while self.current_accel_data >= self.accel_data:
-            if self.gear_data == 'GEAR_D':
-                self.current_accel_data -= Param.DECREASE_VAL
-            elif self.gear_data =='GEAR_R':
-                self.current_accel_data -= Param.DECREASE_VAL * 3
-            else:
-                self.current_accel_data = 0
-            self._limit_min_current_accel()
-            time.sleep(0.02)
-
-    def _correct_current_accel(self):
-        if self.accel_data > self.current_accel_data:
-            self.accel_data += 1
+    def _set_connect(self, state: bool):
+        if state:
+            self.input_ns = time.monotonic_ns()
+            self.metrics.link_up(self.link)
         else:
-            self.accel_data -= 1
-    
-    def _increase_based_on_threshold(self):
-        if self.current_accel_data <= Param.THRESH_ACCEL_VAL:
-            self.current_accel_data += Param.INCREASE_VAL
-        else:
-            self.current_accel_data += (int)(Param.INCREASE_VAL / 4)
+            self.metrics.link_down(self.link)
+        with self._connect_cond:
+            self.is_connect = state
+            self._connect_cond.notify_all()
 
-    def _limit_max_current_accel(self):
-        if self.current_accel_data > Param.MAX_ACCEL_VAL:
-            self.current_accel_data = Param.MAX_ACCEL_VAL
-    
-    def _limit_min_current_accel(self):
-        if self.current_accel_data < 0:
-            self.current_accel_data = self.accel_data + Param.APS_INIT_VAL
+    def wait_connect(self, timeout=None) -> bool:
+        """Block until the controller is connected or timeout expires."""
+        with self._connect_cond:
+            self._connect_cond.wait_for(lambda: self.is_connect, timeout)
+            return self.is_connect
 
     def _limit_cruise_data(self):
         if self.cruise_accel_data < self.aps_accel_data:
             self.cruise_accel_data = self.aps_accel_data
-        if self.cruise_accel_data > Param.MAX_ACCEL_VAL:
-            self.cruise_accel_data = Param.MAX_ACCEL_VAL
+        max_accel = self.profile.max_accel
+        if self.cruise_accel_data > max_accel:
+            self.cruise_accel_data = max_accel
 
     def limit_aps_data(self):
-        if self.aps_accel_data < Param.APS_INIT_VAL:
-            self.aps_accel_data = Param.APS_INIT_VAL
-        if self.aps_accel_data > Param.MAX_ACCEL_VAL:
-            self.aps_accel_data = Param.MAX_ACCEL_VAL
+        profile = self.profile
+        if self.aps_accel_data < profile.aps_init:
+            self.aps_accel_data = profile.aps_init
+        if self.aps_accel_data > profile.max_accel:
+            self.aps_accel_data = profile.max_accel
 
     def limit_accel_data(self):
         if self.accel_data < 0 : self.accel_data = 0
-        if self.current_accel_data < Param.APS_INIT_VAL:
-            self.current_accel_data = Param.APS_INIT_VAL
+        aps_init = self.profile.aps_init
+        if self.current_accel_data < aps_init:
+            self.current_accel_data = aps_init
 
     def limit_steer_data(self):
-        if self.steer_raw_data > Param.LIMIT_STEER_VAL:
-            self.steer_raw_data = Param.LIMIT_STEER_VAL
-        if self.steer_raw_data < -Param.LIMIT_STEER_VAL:
-            self.steer_raw_data = -Param.LIMIT_STEER_VAL
+        # The steer table already clamps, this holds after a profile swap.
+        limit_steer = self.profile.limit_steer
+        if self.steer_raw_data > limit_steer:
+            self.steer_raw_data = limit_steer
+        if self.steer_raw_data < -limit_steer:
+            self.steer_raw_data = -limit_steer
 
     def release_cruise_mode(self):
         self.is_cruise = False
-        self.cruise_accel_data = Param.APS_INIT_VAL
+        self.cruise_accel_data = self.profile.aps_init
 
     def initialize_accel(self):
         if self.brake_data != 0 or \
@@ -178,7 +231,7 @@ class Xbox(threading.Thread):
             self.gear_data == 'GEAR_N': 
             self.current_accel_data = 0
             self.result_accel_data = 0
-            self.cruise_accel_data = Param.APS_INIT_VAL
+            self.cruise_accel_data = self.profile.aps_init
 
     def choose_cruise_mode(self):
         if self.is_cruise:
@@ -193,7 +246,7 @@ class Xbox(threading.Thread):
 
     def _is_xbox(self) -> bool:
         buf = array.array('B', [0] * 64)
-        ioctl(self._dev_file, 0x80006a13 + (0x10000 * len(buf)), buf) 
+        ioctl(self._dev_fd, self.GET_NAME + (0x10000 * len(buf)), buf) 
         xbox_name = buf.tobytes().rstrip(b'\x00').decode('utf-8') 
         print('Device name: %s' % xbox_name)
         if "Generic" in xbox_name or "Microsoft" in xbox_name:
@@ -202,10 +255,10 @@ class Xbox(threading.Thread):
 
     def _get_axis(self) -> list:
         buf = array.array('B', [0])
-        ioctl(self._dev_file, 0x80016a11, buf)  # JSIOCGaxis
+        ioctl(self._dev_fd, 0x80016a11, buf)  # JSIOCGaxis
         num_axis = buf[0]
         buf = array.array('B', [0] * 0x40)
-        ioctl(self._dev_file, 0x80406a32, buf)  # JSIOCGAXMAP
+        ioctl(self._dev_fd, 0x80406a32, buf)  # JSIOCGAXMAP
         axis_map = []
         for axis in buf[:num_axis]:
             axis_name = Axis.axis_names.get(axis, 'unknown(0x%02x)' % axis)
@@ -215,10 +268,10 @@ class Xbox(threading.Thread):
 
     def _get_buttons(self) -> list:
         buf = array.array('B', [0])
-        ioctl(self._dev_file, 0x80016a12, buf)  # JSIOCGBUTTONS
+        ioctl(self._dev_fd, 0x80016a12, buf)  # JSIOCGBUTTONS
         num_buttons = buf[0]
         buf = array.array('H', [0] * 200)
-        ioctl(self._dev_file, 0x80406a34, buf)  # JSIOCGBTNMAP
+        ioctl(self._dev_fd, 0x80406a34, buf)  # JSIOCGBTNMAP
         buttons_map = []
         for btn in buf[:num_buttons]:
             btn_name = Button.button_names.get(btn, 'unknown(0x%03x)' % btn)
@@ -226,55 +279,165 @@ class Xbox(threading.Thread):
                 buttons_map.append(btn_name)
         return buttons_map
 
-    def _get_event(self) -> ControllerEvent:
+    def _close(self):
+        if self._epoll is not None:
+            self._epoll.close()
+            self._epoll = None
+        if self._dev_fd is not None:
+            os.close(self._dev_fd)
+            self._dev_fd = None
+        self._set_connect(False)
+
+    def _read_events(self) -> bool:
+        """Wait up to INPUT_POLL for the device and apply every queued event.
+
+        Stick and trigger events are coalesced so that only the latest value
+        of each in a batch is applied, hats and buttons keep their order.
+        Returns False once the device is gone.
+        """
         try:
-            buf = self._dev_file.read(8)
-        except ValueError as e:
+            ready = self._epoll.poll(self.INPUT_POLL)
+        except (ValueError, OSError) as e:
             print(e)
-            self._dev_file.close()
-            return
-        except OSError as e:
+            self._close()
+            return False
+        self.input_ns = time.monotonic_ns()
+        if not ready:
+            return True
+        # Drain what is queued even on a hang up, the read reports the end.
+        if ready[0][1] & select.EPOLLIN:
+            return self._drain_events()
+        print("controller device with index %d was removed" % self.index)
+        self._close()
+        return False
+
+    def _drain_events(self) -> bool:
+        """Read and apply every queued event without waiting."""
+        try:
+            size = os.readv(self._dev_fd, [self._buf])
+        except BlockingIOError:
+            return True
+        except (ValueError, OSError) as e:
             print(e)
-            self._dev_file.close()
-            return
-        else:
-            if buf:
-                time_, value_, type_, number_ = struct.unpack("IhBB", buf)
-                is_init = bool(type_ & Joy.JS_EVENT_INIT)
-                return ControllerEvent(
-                    time=time_, value=value_, type=type_, number=number_, is_init=is_init)
-
-    def _process_event(self, event: ControllerEvent):
-        button, axis = None, None
-        if event.type == Joy.JS_EVENT_BUTTON and event.value:
-            button = self._button_event(event)
-            self._convert_button(event, button)
-            self._set_cruise_accel_data()
-        if event.type == Joy.JS_EVENT_AXIS:
-            axis = self._axis_event(event)
-            self._convert_axis(axis)
-            self._get_axis_data(event)
+            self._close()
+            return False
+        if not size:
+            self._close()
+            return False
+        stamp = time.monotonic_ns()
+        if self.recorder is not None:
+            self.recorder.write(self._view[:size])
+
+        axes = {}
+        analog = self._analog_axes
+        applied = dropped = 0
+        with self._state_lock:
+            for time_, value_, type_, number_ in JS_EVENT.iter_unpack(self._view[:size]):
+                if type_ == Joy.JS_EVENT_AXIS and analog[number_]:
+                    axes[number_] = value_
+                    continue
+                if type_ != Joy.JS_EVENT_AXIS and type_ != Joy.JS_EVENT_BUTTON:
+                    # JS_EVENT_INIT replays, at open and after a driver queue overrun
+                    dropped += 1
+                    continue
+                # Hats and buttons are edges, a tap must not collapse, and
+                # the sticks queued before them go first.
+                if axes:
+                    for axis_, axis_value in axes.items():
+                        self._process_event(Joy.JS_EVENT_AXIS, axis_, axis_value)
+                    applied += len(axes)
+                    axes.clear()
+                self._process_event(type_, number_, value_)
+                applied += 1
+            for number_, value_ in axes.items():
+                self._process_event(Joy.JS_EVENT_AXIS, number_, value_)
+            applied += len(axes)
+            self._publish(stamp)
+        read = size // JS_EVENT.size
+        counters = self.metrics.counters
+        counters['events_read'] += read
+        counters['events_coalesced'] += read - applied - dropped
+        counters['events_dropped'] += dropped
+        return True
+
+    def _publish(self, stamp=None):
+        """Apply the accel limits and cruise choice, then swap in a new state.
+
+        The caller holds _state_lock. stamp is when the input was read, now
+        by default.
+        """
+        self._control_accel()
+        self._seq += 1
+        self.state = ControlState(
+            self.pushed_estop,
+            self.gear_data,
+            self.pushed_wheel,
+            self.current_accel_data,
+            self.brake_data,
+            self.steer_raw_data,
+            self.steer_modified_data,
+            self._seq,
+            time.monotonic_ns() if stamp is None else stamp)
+
+    def _control_accel(self):
+        self.limit_aps_data()
+        self.limit_accel_data()
+        self.limit_steer_data()
+        self.initialize_accel()
+
+        if self.accel_data != 0: 
+            self.release_cruise_mode()
+        if self.brake_data == 0: 
+            self.choose_cruise_mode()
+
+    def _process_event(self, type_: int, number: int, value: int):
+        if type_ == Joy.JS_EVENT_BUTTON:
+            self._button_table[number](value)
+        elif type_ == Joy.JS_EVENT_AXIS:
+            self._axis_table[number](value)
         self._change_cruise_mode()
 
-    def _button_event(self, event: ControllerEvent):
-        button = self.buttons[event.number]
-        button = Button.button_redefine.get(button, None)
-        return button
-
-    def _axis_event(self, event: ControllerEvent):
-        axis = self.axis[event.number]
-        axis = Axis.axis_redefine.get(axis, None)
-        return axis
-
-    def _convert_button(self, event, button):
-        if button == 'WHEEL_REAR':  self.pushed_wheel = button
-        if button == 'WHEEL_ALL':   self.pushed_wheel = button
-        if button == 'WHEEL_FRONT': self.pushed_wheel = button
-        if button == 'ESTOP_OFF':   self.pushed_estop = button
-        if button == 'ESTOP_ON':    self.pushed_estop = button
-        if button == 'CRUISE_DOWN': self.pushed_cruise = button
-        if button == 'CRUISE_UP':   self.pushed_cruise = button
-        # print(self.pushed_wheel, self.pushed_estop, self.pushed_cruise) 
+    def _build_axis_table(self, axis_map: list) -> list:
+        handlers = {
+            Control.ACCEL    : self._on_accel,
+            Control.STEER    : self._on_steer,
+            Control.BRAKE    : self._on_brake,
+            Control.GEAR_N   : self._on_gear_n,
+            Control.GEAR_D_R : self._on_gear_d_r,
+        }
+        table = []
+        # only the sticks and triggers may be coalesced within a batch
+        self._analog_axes = []
+        for axis in axis_map:
+            control = Control[Axis.axis_redefine.get(axis, 'NONE')]
+            table.append(handlers.get(control, self._on_none))
+            self._analog_axes.append(control in (Control.ACCEL, Control.STEER, Control.BRAKE))
+        return table
+
+    def _build_button_table(self, buttons_map: list) -> list:
+        table = []
+        for button in buttons_map:
+            control = Control[Button.button_redefine.get(button, 'NONE')]
+            table.append(self._make_button_handler(control))
+        return table
+
+    def _make_button_handler(self, control: Control):
+        name = control.name
+        if Control.WHEEL_REAR <= control <= Control.WHEEL_FRONT:
+            attr = 'pushed_wheel'
+        elif Control.ESTOP_OFF <= control <= Control.ESTOP_ON:
+            attr = 'pushed_estop'
+        elif Control.CRUISE_DOWN <= control <= Control.CRUISE_UP:
+            attr = 'pushed_cruise'
+        else:
+            attr = None
+
+        def handler(value):
+            if value:
+                if attr is not None:
+                    setattr(self, attr, name)
+                self._set_cruise_accel_data()
+        return handler
 
     def _change_cruise_mode(self):
         if self.pushed_cruise:  self.is_cruise = True
@@ -293,57 +456,61 @@ class Xbox(threading.Thread):
             self.is_thread = False 
         else:
             if self.pushed_cruise == 'CRUISE_DOWN':
-                self.cruise_accel_data -= int(Param.CRUISE_VAL / 2)
+                self.cruise_accel_data -= self.profile.cruise_down
             if self.pushed_cruise == 'CRUISE_UP':
-                self.cruise_accel_data += Param.CRUISE_VAL
+                self.cruise_accel_data += self.profile.cruise
         self._limit_cruise_data()
 
-    def _convert_axis(self, axis):
-        if axis == 'ACCEL':     self.pushed_accel = axis
-        if axis == 'STEER':     self.pushed_steer = axis
-        if axis == 'BRAKE':     self.pushed_brake = axis
-        if axis == 'GEAR_N':    self.pushed_gear = axis
-        if axis == 'GEAR_D_R':  self.pushed_gear = axis       
-        # print(self.pushed_accel, self.pushed_steer, self.pushed_brake, self.pushed_gear) 
-
-    def _get_axis_data(self, event):
-        self._get_accel_data(event)
-        self._get_brake_data(event)
-        self._get_steer_raw_data(event)
-        self._get_gear_data(event)
-
-    def _get_accel_data(self, event):
-        if event.number == 2 and self.pushed_accel:
-            self.accel_data = event.value + 32767
-
-    def _get_brake_data(self, event):
-        if event.number == 5 and self.pushed_brake:
-            self.brake_data = event.value + 32767
-
-    def _get_steer_raw_data(self, event):
-        if event.number == 3 and self.pushed_steer:
-            self.steer_raw_data = event.value
-            roun_down_steer_data = (self.steer_raw_data // 10 ) * 10
-            self.steer_modified_data = self._dz_steer_data(roun_down_steer_data)
-
-    def _dz_steer_data(self, data: int) -> int:
-        unscaled_deadzone = int(32767 * self.deadzone)
-        if data > unscaled_deadzone:
-            data -= unscaled_deadzone
-        elif data < -unscaled_deadzone:
-            data += unscaled_deadzone
-        else:
-            data = 0
-        return data
-
-    def _get_gear_data(self, event):
-        if event.number == 6:   self.gear_data = 'GEAR_N'
+    def _on_none(self, value):
+        pass
+
+    def _on_accel(self, value):
+        shaping = self.shaping
+        self.pushed_accel = 'ACCEL'
+        accel = shaping.accel[value + OFFSET]
+        if shaping.rates:
+            accel = self._rate_limit('accel', self.accel_data, accel)
+        self.accel_data = accel
+        self._ramp.notify()
+
+    def _on_brake(self, value):
+        shaping = self.shaping
+        self.pushed_brake = 'BRAKE'
+        brake = shaping.brake[value + OFFSET]
+        if shaping.rates:
+            brake = self._rate_limit('brake', self.brake_data, brake)
+        self.brake_data = brake
+        self._ramp.notify()
+
+    def _on_steer(self, value):
+        shaping = self.shaping
+        self.pushed_steer = 'STEER'
+        raw = shaping.steer_raw[value + OFFSET]
+        steer = shaping.steer[value + OFFSET]
+        if shaping.rates:
+            raw = self._rate_limit('steer_raw', self.steer_raw_data, raw)
+            steer = self._rate_limit('steer', self.steer_modified_data, steer)
+        self.steer_raw_data = raw
+        self.steer_modified_data = steer
+
+    def _rate_limit(self, axis: str, previous: int, value: int) -> int:
+        rate = self.shaping.rates.get(axis)
+        if rate is None:
+            return value
+        return rate_limit(previous, value, rate)
+
+    def _on_gear_n(self, value):
+        self.pushed_gear = 'GEAR_N'
+        self.gear_data = 'GEAR_N'
+        self._ramp.notify()
 
-        if event.number == 7 :
-            if event.value == 32767:    
-                self.gear_data = 'GEAR_R' 
-            if event.value == -32767:   
-                self.gear_data = 'GEAR_D'
+    def _on_gear_d_r(self, value):
+        self.pushed_gear = 'GEAR_D_R'
+        if value == 32767:
+            self.gear_data = 'GEAR_R'
+        if value == -32767:
+            self.gear_data = 'GEAR_D'
+        self._ramp.notify()
 
     def _reset_data(self):
         self.pushed_wheel = 'WHEEL_ALL'
@@ -360,3 +527,4 @@ class Xbox(threading.Thread):
         self.brake_data = 0
         self.steer_raw_data = 0
         self.gear_data = 'GEAR_N'
+        self._ramp.notify()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Resolve the package version without slowing down startup
+'''
+
+import sys, os
+from functools import lru_cache
+
+dir_path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(dir_path)
+
+UNKNOWN_VERSION = 'unknown'
+
+@lru_cache(maxsize=None)
+def get_version() -> str:
+    """Return the generated version, else the latest git tag, else 'unknown'.
+
+    src/_joystick_version.py is written at build time by setup.py.
+    GitPython is optional and only imported when that module is missing.
+    """
+    version = built_version()
+    if version is None:
+        version = git_tag_version(os.path.dirname(dir_path))
+    return version if version else UNKNOWN_VERSION
+
+def built_version() -> str:
+    """The version setup.py generated, None in a source checkout. Never runs git."""
+    try:
+        from _joystick_version import VERSION
+        return VERSION
+    except ImportError:
+        return None
+
+def git_tag_version(repo_path: str) -> str:
+    try:
+        import git
+    except ImportError:
+        return None
+    try:
+        repo = git.Repo(repo_path)
+        return repo.git.describe('--tags', '--abbrev=0')
+    except Exception:
+        # No .git on deployed images, no tags, or no git binary.
+        return None
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Single threaded asyncio engine for xbox input and serial output
+'''
+
+import asyncio
+import time
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+
+from ums_xbox.protocol import Packet
+from ums_xbox.ramp import ramp_step, RAMP_PERIOD
+from ums_runtime.hotplug import DeviceWatcher
+from xbox_control import XboxControl
+
+class AsyncAccelRamp:
+    """AccelRamp driven by call_at on the event loop instead of a thread."""
+    def __init__(self, xbox, loop, period=RAMP_PERIOD):
+        self.period = period
+        self._xbox = xbox
+        self._loop = loop
+        self._handle = None
+        self._deadline = 0.0
+        self.stamp_ns = 0
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    def notify(self):
+        if self._handle is None:
+            self._deadline = self._loop.time()
+            self._handle = self._loop.call_soon(self._tick)
+            self.stamp_ns = time.monotonic_ns()
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _tick(self):
+        xbox = self._xbox
+        current = xbox.current_accel_data
+        next_data = ramp_step(current, xbox.accel_data, xbox.gear_data, xbox.profile,
+                              xbox.brake_data, xbox.pushed_estop)
+        if next_data == current:
+            self._handle = None
+            self.stamp_ns = 0
+            return
+        xbox.current_accel_data = next_data
+        xbox.is_thread = True
+        xbox._publish()
+        self.stamp_ns = time.monotonic_ns()
+
+        self._deadline += self.period
+        self._handle = self._loop.call_at(self._deadline, self._tick)
+
+class AsyncXboxControl(XboxControl):
+    """XboxControl on one asyncio loop.
+
+    The joystick and serial fds are watched with add_reader/add_writer and
+    the ramp and transmit ticks are scheduled callbacks, so the xbox state
+    is only touched from the loop thread. The loop is the reader, a stuck
+    reader stops the ticks too, so the watchdog only has the ramp and the
+    writes to look at. It is not a latency fix: the 50 Hz tick decides the
+    input to wire latency, benchmark/bench_async.py measures both engines
+    within noise of each other.
+    """
+    WATCHDOG_SOURCES = ('ramp', 'write')
+
+    def apply_profile(self, profile):
+        # The state is only touched from the loop thread.
+        loop = getattr(self, '_loop', None)
+        if loop is None:
+            XboxControl.apply_profile(self, profile)
+        else:
+            loop.call_soon_threadsafe(XboxControl.apply_profile, self, profile)
+
+    def exec(self):
+        if self.display is not None:
+            self.display.start()
+        if self.receiver is not None:
+            self.receiver.start()
+        asyncio.run(self._run())
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self.xbox._ramp = AsyncAccelRamp(self.xbox, self._loop)
+        await asyncio.gather(self._input_loop(), self._output_loop())
+
+    async def _input_loop(self):
+        while True:
+            await self._connect_xbox()
+            gone = self._loop.create_future()
+            self._loop.add_reader(self.xbox._dev_fd, self._on_readable, gone)
+            await gone
+
+    async def _connect_xbox(self):
+        xbox = self.xbox
+        if xbox._watcher is None:
+            xbox._watcher = DeviceWatcher(os.path.dirname(xbox._get_dev_file))
+        while True:
+            if xbox._try_open():
+                if xbox._is_xbox(): break
+                xbox._close()
+            await self._wait_device(xbox._watcher, os.path.basename(xbox._get_dev_file))
+        xbox._setup()
+
+    async def _wait_device(self, watcher, name: str):
+        """DeviceWatcher.wait on the loop: the inotify fd is just another reader."""
+        timeout = watcher.retry_after(name)
+        if not watcher.available:
+            await asyncio.sleep(watcher.poll_interval)
+            return
+        changed = self._loop.create_future()
+        def on_readable():
+            if name in watcher.read() and not changed.done():
+                changed.set_result(None)
+        self._loop.add_reader(watcher.fileno(), on_readable)
+        try:
+            await asyncio.wait_for(changed, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._loop.remove_reader(watcher.fileno())
+
+    def _on_readable(self, gone):
+        fd = self.xbox._dev_fd
+        self._loop.remove_reader(fd)
+        if self.xbox._drain_events():
+            self._loop.add_reader(fd, self._on_readable, gone)
+        else:
+            gone.set_result(None)
+
+    async def _output_loop(self):
+        while True:
+            try:
+                await self._connect_serial()
+                self.metrics.link_up('serial')
+                await self._transmit()
+            except OSError as e:
+                print(e)
+                self.metrics.link_down('serial')
+                self.metrics.count('write_errors')
+                self._stop_transmit()
+                self.ums_ser.disconnect()
+            await asyncio.sleep(0.5)
+
+    async def _connect_serial(self):
+        if not self.is_testmode:
+            watcher = self.ums_ser._port_watcher()
+            while not self.ums_ser.isOpen():
+                if not self.ums_ser.try_open():
+                    await self._wait_device(watcher, os.path.basename(self.ums_ser.port))
+        print(self.ums_ser.link_budget(Packet.SIZE, self.scheduler.period))
+
+    def _transmit(self) -> asyncio.Future:
+        """Start the transmit tick, the future fails when the port does."""
+        self._tx_done = self._loop.create_future()
+        self._tx_pending = None
+        self._tx_next = None
+        self._tx_handle = None
+        self._next_failsafe = 0.0
+        self._last_tick_ns = None
+        self._written_ns = 0
+        self.scheduler.reset()
+        self._on_tick()
+        return self._tx_done
+
+    def _stop_transmit(self):
+        if self._tx_handle is not None:
+            self._tx_handle.cancel()
+            self._tx_handle = None
+        if self._tx_pending is not None and not self.is_testmode:
+            self._loop.remove_writer(self.ums_ser.fileno())
+        self._tx_pending = None
+
+    def _on_tick(self):
+        now = self._loop.time()
+        try:
+            if self.xbox.is_connect:
+                self._write(self._make_xbox_packet())
+            elif now >= self._next_failsafe:
+                self._write(self._make_failsafe_packet())
+                self._next_failsafe = now + self.failsafe_period
+                self._written_ns = 0
+        except OSError as e:
+            self._tx_handle = None
+            self._tx_done.set_exception(e)
+            return
+        self.scheduler.tick(now)
+        self._tx_handle = self._loop.call_at(self.scheduler.deadline, self._on_tick)
+
+    def _write(self, send_packet):
+        if send_packet is None:
+            return
+        self.metrics.counters['frames_sent'] += 1
+        if self.is_testmode:
+            self.display.put(send_packet)
+            self._written_ns = time.monotonic_ns()
+            return
+        if self._tx_pending is not None:
+            # A frame is half way out, send this one right after it.
+            if self._tx_next is not None:
+                self.ums_ser.frames_replaced += 1
+                if self.delta is not None:
+                    self.delta.reset()
+            self._tx_next = bytes(send_packet)
+            return
+        self._send(send_packet)
+
+    def _send(self, send_packet):
+        """Start a frame on the port, the writer callback sends what did not fit."""
+        replaced = self.ums_ser.frames_replaced
+        start = time.monotonic_ns()
+        sent = self.ums_ser.write_nowait(send_packet)
+        self.metrics.write_time.add(time.monotonic_ns() - start, start)
+        if self.delta is not None and self.ums_ser.frames_replaced != replaced:
+            self.delta.reset()
+        if self.receiver is not None:
+            self.receiver.echo.sent(self.packet.alive, start)
+        if sent < len(send_packet):
+            self._tx_pending = bytes(send_packet[sent:])
+            self._loop.add_writer(self.ums_ser.fileno(), self._on_writable)
+        elif self.ums_ser.frames_replaced == replaced:
+            self._written_ns = start
+
+    def _on_writable(self):
+        try:
+            sent = self.ums_ser.write_rest(self._tx_pending)
+        except OSError as e:
+            self._stop_transmit()
+            self._tx_done.set_exception(e)
+            return
+        if sent < len(self._tx_pending):
+            self._tx_pending = self._tx_pending[sent:]
+            return
+        self._written_ns = time.monotonic_ns()
+        self._tx_pending = None
+        self._loop.remove_writer(self.ums_ser.fileno())
+        send_packet, self._tx_next = self._tx_next, None
+        if send_packet is not None:
+            # Counted, teed and checked for stale bytes like any other frame.
+            try:
+                self._send(send_packet)
+            except OSError as e:
+                self._stop_transmit()
+                self._tx_done.set_exception(e)
+
+def main():
+    port_name = "/dev/ttyAMA0"
+    baudrate = 9600
+    timeout = 0.1
+    testmode = True
+    deadzone = 0.05
+    xc = AsyncXboxControl(port_name, baudrate, timeout, testmode, deadzone)
+    xc.exec()
+
+if __name__ == "__main__":
+    main()
@@ -12,15 +12,65 @@ import sys, os
 sys.path.append(os.path.dirname(__file__))
 
 from ums_xbox.xbox import Xbox 
-from ums_xbox.protocol import Packet
+from ums_xbox.group import ControllerGroup
+from ums_xbox.evdev import EvdevXbox
+from ums_xbox.protocol import Packet, DeltaGate
+from ums_xbox.display import FrameDisplay
 from ums_serial.ums_serial import UmsSerial
+from ums_serial.receiver import FeedbackReceiver
+from ums_runtime.scheduler import FixedRateScheduler
+from ums_runtime.metrics import Metrics
+from ums_runtime.watchdog import Watchdog
 
 class XboxControl:
-    def __init__(self, port_name, baudrate, timeout, testmode, deadzone):
+    FAILSAFE = {'ESTOP_ON' : 'ESTOP_ON', 'neutral' : 'ESTOP_OFF'}
+    BACKENDS = {'js' : Xbox, 'evdev' : EvdevXbox}
+    # what this engine can tell the watchdog about, see _watch_sources()
+    WATCHDOG_SOURCES = ('input', 'ramp', 'write')
+
+    def __init__(self, port_name, baudrate, timeout, testmode, deadzone,
+                 rate=50.0, missed_policy=FixedRateScheduler.SKIP,
+                 failsafe='ESTOP_ON', failsafe_rate=2.0,
+                 stale_policy=UmsSerial.STALE_REPLACE, xbox=None, display_rate=10.0,
+                 controllers=1, backend='js', profile=None, feedback=False,
+                 delta=False, keepalive=0.5, heartbeat=0.1, deadlines=None):
+        if failsafe not in self.FAILSAFE:
+            raise ValueError(f"unknown failsafe packet: {failsafe}")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"unknown joystick backend: {backend}")
         self.is_testmode = testmode
-        self.ums_ser = UmsSerial(port_name, baudrate, timeout)
-        self.xbox = Xbox(index=0, deadzone=deadzone)
+        self.failsafe = failsafe
+        self.failsafe_period = 1.0 / failsafe_rate
+        self.scheduler = FixedRateScheduler(rate, missed_policy)
+        if isinstance(baudrate, (list, tuple)):
+            baudrate = UmsSerial.choose_baudrate(baudrate, Packet.SIZE, self.scheduler.period)
+        # A port that stops draining gives the tick back by the write deadline.
+        write_timeout = None
+        if deadlines and 'write' in self.WATCHDOG_SOURCES:
+            write_timeout = deadlines.get('write') or None
+        self.ums_ser = UmsSerial(port_name, baudrate, timeout, stale_policy, write_timeout)
+        if xbox is None:
+            xbox = self.make_pads(backend, controllers, deadzone, profile)
+        elif profile is not None:
+            xbox.set_profile(profile)
+        self.xbox = xbox
         self.packet = Packet()
+        # Unchanged frames become heartbeats or nothing, see DeltaGate.
+        self.delta = DeltaGate(self.packet, keepalive, heartbeat) if delta else None
+        # Test mode draws frames from a thread instead of printing on this one.
+        self.display = FrameDisplay(display_rate) if testmode else None
+
+        self.metrics = Metrics()
+        self.xbox.metrics = self.metrics
+        # Vehicle feedback and the alive echo, there is no vehicle in test mode.
+        self.receiver = FeedbackReceiver(self.ums_ser, self.metrics) if feedback and not testmode else None
+        self._period_ns = int(self.scheduler.period * 1e9)
+        self._last_tick_ns = None
+        self._sent_seq = None
+        # start of the last write that left in full, 0 off the tick cadence
+        self._written_ns = 0
+        # deadlines in seconds per source, e.g. {'input': 0.5, 'ramp': 0.2, 'write': 0.2}
+        self.watchdog = self._watch(deadlines) if deadlines else None
 
     def __repr__(self) -> str:
         return "<{cls}>".format(cls=self.__class__.__name__)
@@ -28,7 +78,43 @@ class XboxControl:
     def __call__(self):
         return self.exec()
 
+    @staticmethod
+    def make_pads(backend: str, controllers: int, deadzone: float, profile=None):
+        pad = XboxControl.BACKENDS[backend]
+        if controllers > 1:
+            # pad 0 is the primary, the others can only ESTOP or take over
+            return ControllerGroup([pad(index=idx, deadzone=deadzone, profile=profile)
+                                    for idx in range(controllers)])
+        return pad(index=0, deadzone=deadzone, profile=profile)
+
+    def _watch_sources(self) -> dict:
+        xbox = self.xbox
+        return {
+            'input': lambda: xbox.input_ns,
+            'ramp': lambda: xbox.ramp_ns,
+            'write': lambda: self._written_ns,
+        }
+
+    def _watch(self, deadlines: dict) -> Watchdog:
+        """A Watchdog on the sources this engine has, others are left out."""
+        watchdog = Watchdog()
+        sources = self._watch_sources()
+        for name, deadline in deadlines.items():
+            if name not in Watchdog.SOURCES:
+                raise ValueError(f"unknown watchdog source: {name}")
+            if deadline and name in self.WATCHDOG_SOURCES:
+                watchdog.watch(name, sources[name], deadline)
+        return watchdog
+
+    def apply_profile(self, profile):
+        """Swap the vehicle profile while running, e.g. from a ProfileReloader."""
+        self.xbox.set_profile(profile)
+
     def exec(self):
+        if self.display is not None:
+            self.display.start()
+        if self.receiver is not None:
+            self.receiver.start()
         self.xbox.start()
         self._main_loop()
 
@@ -36,75 +122,134 @@ class XboxControl:
         while True:
             try:
                 if self.ums_ser.connect(self.is_testmode):
+                    self.metrics.link_up('serial')
+                    print(self.ums_ser.link_budget(Packet.SIZE, self.scheduler.period))
                     self._send_xbox_data()
             except OSError as e:
                 print(e)
+                self.metrics.link_down('serial')
+                self.metrics.count('write_errors')
                 self.ums_ser.disconnect()
             time.sleep(0.5)
 
     def _send_xbox_data(self):
+        self.scheduler.reset()
+        self._last_tick_ns = None
+        self._written_ns = 0
         while True:
-            if self.xbox.is_connect:
-                self.packet.alive = self._active_count(self.packet.alive)
-                self._control_accel()
-
-                accel_val, brake_val, steer_raw_val, steer_modified_val = self._convert_bytes(
-                        self.xbox.current_accel_data,
-                        self.xbox.brake_data,
-                        self.xbox.steer_raw_data,
-                        self.xbox.steer_modified_data)
-
-                self.packet.accel_data[1] = accel_val[1]
-                self.packet.brake_data[0] = brake_val[0]
-                self.packet.brake_data[1] = brake_val[1]
-                self.packet.steer_data[0] = steer_raw_val[0]
-                self.packet.steer_data[1] = steer_raw_val[1]
-                self.packet.steer_data[2] = steer_modified_val[0]
-                self.packet.steer_data[3] = steer_modified_val[1] 
-
-                send_packet = self.packet.makepacket(
-                            estop = self.xbox.pushed_estop, 
-                            gear = self.xbox.gear_data,
-                            wheel = self.xbox.pushed_wheel)
-
-                if self.is_testmode:
-                    print(f"{send_packet}")
-                else:
-                    self.ums_ser.write(send_packet)
-
-                self.xbox.pre_accel_data = self.xbox.accel_data
-                time.sleep(0.02)
+            if not self.xbox.is_connect:
+                self._write(self._make_failsafe_packet())
+                # Failsafe frames go at their own slow rate.
+                self._written_ns = 0
+                if self.xbox.wait_connect(self.failsafe_period):
+                    self.scheduler.reset()
             else:
-                pass
+                self._write(self._make_xbox_packet())
+                self.scheduler.wait()
 
-    def _control_accel(self):
-        self.xbox.limit_aps_data()
-        self.xbox.limit_accel_data()
-        self.xbox.limit_steer_data()
-        self.xbox.initialize_accel()
+    def _make_xbox_packet(self) -> memoryview:
+        if self.watchdog is not None and self.watchdog.check() is not None:
+            return self._make_watchdog_packet()
+        self.packet.alive = self._active_count(self.packet.alive)
+        state = self.xbox.state
+        now = self._record_tick(state)
+        frame = self.packet.encode(
+                    state.estop,
+                    state.gear,
+                    state.wheel,
+                    state.accel,
+                    state.brake,
+                    state.steer_raw,
+                    state.steer_modified)
+        if self.delta is not None:
+            frame = self.delta.gate(frame, now)
+            if frame is None:
+                # Held back on purpose: the write path is alive, not stuck.
+                self._written_ns = now
+                self.metrics.counters['frames_suppressed'] += 1
+            elif len(frame) == Packet.HEARTBEAT_SIZE:
+                self.metrics.counters['heartbeats_sent'] += 1
+        return frame
 
-        if self.xbox.accel_data != 0: 
-            self.xbox.release_cruise_mode()
-        if self.xbox.brake_data == 0: 
-            self.xbox.choose_cruise_mode()
+    def _record_tick(self, state) -> int:
+        """Tick jitter, and the input to frame latency of a state sent for the first time."""
+        metrics = self.metrics
+        now = time.monotonic_ns()
+        if self._last_tick_ns is not None:
+            metrics.tick_jitter.add(abs(now - self._last_tick_ns - self._period_ns), now)
+        self._last_tick_ns = now
+        if state.seq != self._sent_seq:
+            # The state seen first may be long stale, it is not a latency.
+            if self._sent_seq is not None:
+                metrics.event_to_frame.add(now - state.stamp, now)
+            self._sent_seq = state.seq
+        return now
+
+    def _write(self, send_packet):
+        if send_packet is None:
+            return
+        if self.is_testmode:
+            self.display.put(send_packet)
+            self._written_ns = time.monotonic_ns()
+        else:
+            ums_ser = self.ums_ser
+            start = time.monotonic_ns()
+            replaced, cut = ums_ser.frames_replaced, ums_ser.frames_cut
+            # A watchdog frame goes ahead of the driving frames still queued.
+            tripped = self.watchdog is not None and self.watchdog.tripped is not None
+            ums_ser.write(send_packet, True if tripped else None)
+            self.metrics.write_time.add(time.monotonic_ns() - start, start)
+            if ums_ser.frames_replaced != replaced or ums_ser.frames_cut != cut:
+                # The dropped or cut frame may have carried the last change.
+                if self.delta is not None:
+                    self.delta.reset()
+            else:
+                self._written_ns = start
+            if self.receiver is not None:
+                self.receiver.echo.sent(self.packet.alive, start)
+        self.metrics.counters['frames_sent'] += 1
+
+    def stats(self) -> dict:
+        """Metrics snapshot plus the scheduler and serial port counters."""
+        stats = self.metrics.snapshot()
+        stats['scheduler'] = dict(self.scheduler.jitter.summary(), missed=self.scheduler.missed)
+        stats['serial'] = {
+            'frames_written': self.ums_ser.frames_written,
+            'frames_replaced': self.ums_ser.frames_replaced,
+            'frames_cut': self.ums_ser.frames_cut,
+        }
+        if self.receiver is not None:
+            stats['vehicle'] = self.receiver.describe()
+        if self.watchdog is not None:
+            stats['watchdog'] = self.watchdog.describe()
+        return stats
+
+    def _make_failsafe_packet(self) -> memoryview:
+        self.metrics.counters['failsafe_frames'] += 1
+        self._last_tick_ns = None
+        if self.delta is not None:
+            self.delta.reset()
+        self.packet.alive = self._active_count(self.packet.alive)
+        return self.packet.encode(
+                    self._failsafe_estop(), 'GEAR_N', 'WHEEL_ALL', 0, 0, 0, 0)
+
+    def _make_watchdog_packet(self) -> memoryview:
+        """ESTOP_ON in neutral while a watched thread is stuck, whatever the pad says."""
+        self.metrics.counters['watchdog_frames'] += 1
+        if self.delta is not None:
+            self.delta.reset()
+        self.packet.alive = self._active_count(self.packet.alive)
+        return self.packet.encode(
+                    'ESTOP_ON', 'GEAR_N', 'WHEEL_ALL', 0, 0, 0, 0)
+
+    def _failsafe_estop(self) -> str:
+        return self.FAILSAFE[self.failsafe]
 
     def _active_count(self, data: int) -> int:
         data += 1
         if data >= 256: data = 0
         return data
 
-    def _convert_bytes(self, accel, brake, *args):
-        ret_accel = accel.to_bytes(
-            2, byteorder="little", signed=False)
-        ret_brake = brake.to_bytes(
-            2, byteorder="little", signed=False)
-        ret_raw_steer = args[0].to_bytes(
-            2, byteorder="little", signed=True)
-        ret_modified_steer = args[1].to_bytes(
-            2, byteorder="little", signed=True)
-
-        return ret_accel, ret_brake, ret_raw_steer, ret_modified_steer
-
 def main():
     port_name = "/dev/ttyAMA0"
     baudrate = 9600
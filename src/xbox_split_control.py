@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@ Created Date: Oct 18. 2026
+@ Author: Dae Jong Jin
+@ Description: Input and serial output in two processes, joined by a shared memory seqlock block
+'''
+
+import atexit
+import multiprocessing
+import multiprocessing.connection
+import threading
+import time
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+
+from ums_runtime.shared import SharedControl
+from ums_runtime.metrics import Metrics
+from xbox_control import XboxControl
+
+def input_main(block_name: str, factory, args: tuple, period: float, conn):
+    """Entry point of the input process: run the pads and publish their state.
+
+    Beats on every loop, and copies the reader and ramp stamps of the pads
+    next to the beat: the loop goes on while either thread hangs, the
+    transmitter's watchdog checks them. Its watchdog exits with the
+    transmitter, and says so once when the transmitter stops beating, the
+    vehicle then only sees the serial line go quiet.
+    """
+    block = SharedControl(block_name)
+    parent = multiprocessing.parent_process()
+    xbox = factory(*args)
+    xbox.start()
+    published = None
+    connected = None
+    warned = False
+    while True:
+        now = time.monotonic_ns()
+        block.beat(SharedControl.INPUT, now)
+        block.beat(SharedControl.READER, xbox.input_ns)
+        block.beat(SharedControl.RAMP, xbox.ramp_ns)
+        state = xbox.state
+        if state is not published or xbox.is_connect != connected:
+            connected = xbox.is_connect
+            block.write(state, connected)
+            published = state
+        while conn.poll():
+            xbox.set_profile(conn.recv())
+
+        if parent is not None and multiprocessing.connection.wait([parent.sentinel], 0):
+            return
+        stale = block.age(SharedControl.OUTPUT, now) > 1.0
+        if stale and not warned:
+            print("input: the transmitter stopped beating")
+        warned = stale
+        time.sleep(period)
+
+class InputProcess:
+    """The input process, seen from XboxControl like an Xbox.
+
+    is_connect is only true while the pad is connected and the input process
+    beat within timeout, so a crash or a hang there turns into failsafe frames
+    within timeout plus one tick. A dead process is started again after
+    restart_delay. period is how often the input process publishes.
+    """
+    def __init__(self, factory, args: tuple, profile=None, timeout=0.1, period=0.002, restart_delay=1.0):
+        self.factory = factory
+        self.args = args
+        self.profile = profile
+        self.timeout = timeout
+        self.period = period
+        self.restart_delay = restart_delay
+        self.block = SharedControl()
+        self.metrics = Metrics()
+        self.link = 'input'
+        self.process = None
+        self._stopping = False
+        self._context = multiprocessing.get_context('forkserver')
+        self._child_conn, self._conn = self._context.Pipe(duplex=False)
+
+    def __repr__(self) -> str:
+        return "<{cls}>".format(cls=self.__class__.__name__)
+
+    @property
+    def state(self):
+        return self.block.read()[0]
+
+    @property
+    def input_ns(self) -> int:
+        return self.block.stamp(SharedControl.READER)
+
+    @property
+    def ramp_ns(self) -> int:
+        return self.block.stamp(SharedControl.RAMP)
+
+    @property
+    def alive(self) -> bool:
+        return self.block.age(SharedControl.INPUT) <= self.timeout
+
+    @property
+    def is_connect(self) -> bool:
+        return self.block.read()[1] and self.alive
+
+    def wait_connect(self, timeout=None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_connect:
+            self.block.beat(SharedControl.OUTPUT)
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def set_profile(self, profile):
+        self.profile = profile
+        self._conn.send(profile)
+
+    def start(self):
+        self.block.beat(SharedControl.OUTPUT)
+        atexit.register(self.stop)
+        self._spawn()
+        threading.Thread(target=self._supervise, daemon=True).start()
+
+    def stop(self):
+        self._stopping = True
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+        self.block.unlink()
+
+    def _spawn(self):
+        self.process = self._context.Process(
+            target=input_main, name='input', daemon=True,
+            args=(self.block.name, self.factory, self.args, self.period, self._child_conn))
+        self.process.start()
+        self.metrics.link_up(self.link)
+
+    def _supervise(self):
+        while True:
+            multiprocessing.connection.wait([self.process.sentinel])
+            if self._stopping:
+                return
+            print(f"input process exited with {self.process.exitcode}, restarting")
+            self.metrics.link_down(self.link)
+            time.sleep(self.restart_delay)
+            self._spawn()
+
+class SplitXboxControl(XboxControl):
+    """XboxControl with the pads, the ramp and cruise in their own process.
+
+    A GC pause or a slow print on the input side no longer holds the GIL
+    the transmit tick needs. The transmitter reads the state from a
+    SharedControl block and sends ESTOP_ON, whatever the failsafe setting,
+    while the input process is down: the pad may still be held. The
+    watchdog reads the reader and ramp stamps the input process copies
+    into the block, a hung thread there does not stop its beat.
+    """
+
+    def __init__(self, port_name, baudrate, timeout, testmode, deadzone,
+                 controllers=1, backend='js', profile=None,
+                 input_factory=None, input_args=(), input_timeout=0.1, **kwargs):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"unknown joystick backend: {backend}")
+        if input_factory is None:
+            input_factory = XboxControl.make_pads
+            input_args = (backend, controllers, deadzone, profile)
+        xbox = InputProcess(input_factory, input_args, profile, input_timeout)
+        XboxControl.__init__(self, port_name, baudrate, timeout, testmode, deadzone,
+                             xbox=xbox, **kwargs)
+
+    def _write(self, send_packet):
+        self.xbox.block.beat(SharedControl.OUTPUT)
+        XboxControl._write(self, send_packet)
+
+    def _failsafe_estop(self) -> str:
+        if not self.xbox.alive:
+            return 'ESTOP_ON'
+        return XboxControl._failsafe_estop(self)
+
+    def stats(self) -> dict:
+        stats = XboxControl.stats(self)
+        stats['input'] = {
+            'alive': self.xbox.alive,
+            'pid': self.xbox.process.pid if self.xbox.process is not None else None,
+            'seqlock_retries': self.xbox.block.retries,
+        }
+        return stats
+
+def main():
+    port_name = "/dev/ttyAMA0"
+    baudrate = 9600
+    timeout = 0.1
+    testmode = True
+    deadzone = 0.05
+    xc = SplitXboxControl(port_name, baudrate, timeout, testmode, deadzone)
+    xc.exec()
+
+if __name__ == "__main__":
+    main()